@@ -0,0 +1,107 @@
+"""Compare directory listing with per-entry stat calls against FileMgr.list_dir.
+
+The benchmark fills a temporary directory with empty image files and a few
+subdirectories, then lists it with the old ``os.listdir`` + ``os.path.isdir`` +
+``os.path.isfile`` approach and with ``FileMgr.list_dir``. It reports the wall
+time and the number of ``stat`` calls each approach makes from Python.
+
+``os.DirEntry`` type checks stat internally only when the filesystem does not
+report entry types. To count every system call, run a single method under
+strace, for example::
+
+    strace -f -c -e trace=%stat,getdents64 python benchmark_list_dir.py --method scandir
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from file_mgr import DISCARD_DIRECTORY_NAME, FileMgr  # noqa: E402
+
+
+def legacy_list_dir(directory):
+    """List *directory* the way FileMgr did before it used os.scandir."""
+    files = []
+    subdirs = []
+    for entry in os.listdir(directory):
+        full_path = os.path.join(directory, entry)
+        if os.path.isdir(full_path) and entry != DISCARD_DIRECTORY_NAME:
+            subdirs.append(entry)
+        elif os.path.isfile(full_path) and FileMgr.is_supported_image(entry):
+            files.append(entry)
+
+    files.sort()
+    subdirs.sort()
+    return files, subdirs
+
+
+def populate(directory, file_count, subdir_count):
+    for index in range(file_count):
+        open(os.path.join(directory, f"IMG_{index:06d}.jpg"), "wb").close()
+    for index in range(subdir_count):
+        os.mkdir(os.path.join(directory, f"shoot-{index:03d}"))
+
+
+def measure(list_function, directory, repeat):
+    """Return the best wall time and the stat calls of one listing."""
+    real_stat = os.stat
+    stat_calls = 0
+
+    def counting_stat(*args, **kwargs):
+        nonlocal stat_calls
+        stat_calls += 1
+        return real_stat(*args, **kwargs)
+
+    best = None
+    os.stat = counting_stat
+    try:
+        for _ in range(repeat):
+            stat_calls = 0
+            start = time.perf_counter()
+            list_function(directory)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        os.stat = real_stat
+    return best, stat_calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--subdirs", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--directory",
+        help="List this existing directory instead of a generated one",
+    )
+    parser.add_argument(
+        "--method", choices=("both", "listdir", "scandir"), default="both"
+    )
+    args = parser.parse_args()
+
+    methods = {
+        "listdir": legacy_list_dir,
+        "scandir": FileMgr().list_dir,
+    }
+    if args.method != "both":
+        methods = {args.method: methods[args.method]}
+
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = args.directory
+        if directory is None:
+            directory = scratch
+            print(f"Creating {args.files} files and {args.subdirs} subdirectories")
+            populate(directory, args.files, args.subdirs)
+
+        for name, list_function in methods.items():
+            elapsed, stat_calls = measure(list_function, directory, args.repeat)
+            print(f"{name:>8}: {elapsed * 1000:8.1f} ms, {stat_calls} stat calls")
+
+
+if __name__ == "__main__":
+    main()
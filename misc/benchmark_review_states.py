@@ -0,0 +1,86 @@
+"""Compare the memory used by review states in a dictionary and in ReviewStates.
+
+The benchmark records a review state for every file of a generated session,
+first in a dictionary keyed by full path, the way FileMgr stored them before,
+and then in ``ReviewStates`` with every directory listing attached. It reports
+the memory allocated for each structure as measured by ``tracemalloc``.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from file_mgr import KEEP, REJECT  # noqa: E402
+from review_states import ReviewStates  # noqa: E402
+
+ROOT = os.path.join(os.sep, "home", "photographer", "Pictures", "2024")
+
+
+def session(directory_count, file_count):
+    """Yield each directory of the session with its sorted file names."""
+    for directory_index in range(directory_count):
+        directory = os.path.join(ROOT, f"{directory_index:04d} Holiday shoot")
+        yield directory, [f"IMG_{index:06d}.jpg" for index in range(file_count)]
+
+
+def state(index):
+    return KEEP if index % 3 else REJECT
+
+
+def fill_dictionary(directory_count, file_count):
+    states = {}
+    for directory, names in session(directory_count, file_count):
+        for index, name in enumerate(names):
+            states[os.path.join(directory, name)] = state(index)
+    return states
+
+
+def fill_review_states(directory_count, file_count):
+    states = ReviewStates((KEEP, REJECT))
+    for directory, names in session(directory_count, file_count):
+        states.attach_listing(directory, names)
+        for index, name in enumerate(names):
+            states[os.path.join(directory, name)] = state(index)
+    return states
+
+
+def measure(fill, directory_count, file_count):
+    """Return the memory held by the filled structure and the fill time."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    states = fill(directory_count, file_count)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(states) == directory_count * file_count
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--directories", type=int, default=1000)
+    parser.add_argument("--files", type=int, default=1000)
+    args = parser.parse_args()
+
+    total = args.directories * args.files
+    print(f"Storing {total} review states in {args.directories} directories")
+    for name, fill in (
+        ("dict", fill_dictionary),
+        ("compact", fill_review_states),
+    ):
+        size, elapsed = measure(fill, args.directories, args.files)
+        print(
+            f"{name:>8}: {size / 2**20:8.1f} MiB, {size / total:6.1f} bytes per file,"
+            f" filled in {elapsed:.1f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
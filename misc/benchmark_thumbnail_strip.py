@@ -0,0 +1,89 @@
+"""Measure how long the thumbnail strip takes to list and scroll a large folder.
+
+The benchmark writes a folder of small JPEG files, shows it in a
+``ThumbnailStrip`` and scrolls from the first slot to the last, half a
+viewport per 60 Hz frame. Each frame scrolls and repaints the strip and
+handles the finished thumbnails; the rest of the frame is left to the
+thumbnail workers. It reports the time taken to show the listing, the mean
+and worst time the GUI thread spent per frame, and how many thumbnails were
+made along the way.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PyQt5.QtCore import QEventLoop, Qt  # noqa: E402
+from PyQt5.QtGui import QImage  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from thumbnail_strip import ThumbnailStrip  # noqa: E402
+
+
+def write_images(directory, count):
+    image = QImage(320, 240, QImage.Format_RGB32)
+    image.fill(Qt.darkGreen)
+    names = [f"IMG_{index:06d}.jpg" for index in range(count)]
+    for name in names:
+        image.save(os.path.join(directory, name))
+    return names
+
+
+FRAME_SECONDS = 1 / 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--width", type=int, default=1280)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Writing {args.files} images")
+        names = write_images(directory, args.files)
+
+        strip = ThumbnailStrip()
+        made = []
+        strip.loader.thumbnail_ready_signal.connect(made.append)
+        strip.resize(args.width, strip.height())
+        strip.show()
+        app.processEvents()
+
+        start = time.perf_counter()
+        strip.show_listing(directory, names, 0)
+        app.processEvents()
+        listed = time.perf_counter() - start
+
+        scroll_bar = strip.horizontalScrollBar()
+        step = max(1, strip.viewport().width() // 2)
+        frames = []
+        for value in range(0, scroll_bar.maximum() + step, step):
+            start = time.perf_counter()
+            scroll_bar.setValue(value)
+            strip.viewport().repaint()
+            app.processEvents()
+            frames.append(time.perf_counter() - start)
+            idle = FRAME_SECONDS - (time.perf_counter() - start)
+            if idle > 0:
+                app.processEvents(QEventLoop.AllEvents, round(idle * 1000))
+                time.sleep(max(0, FRAME_SECONDS - (time.perf_counter() - start)))
+        strip.loader.wait_for_done()
+        app.processEvents()
+
+        mean = sum(frames) / len(frames)
+        print(f"Listed {args.files} files in {listed * 1000:.1f} ms")
+        print(
+            f"Scrolled {len(frames)} frames: mean {mean * 1000:.2f} ms,"
+            f" worst {max(frames) * 1000:.2f} ms"
+        )
+        print(f"Made {len(made)} thumbnails")
+        strip.shutdown()
+
+
+if __name__ == "__main__":
+    main()
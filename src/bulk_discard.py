@@ -0,0 +1,147 @@
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from file_mgr import DiscardResult, RestoreResult
+
+
+class DiscardTask(QRunnable):
+    """Run the filesystem part of a discard or restore on a worker thread."""
+
+    def __init__(self, discard, plan):
+        super().__init__()
+        self.discard = discard
+        self.plan = plan
+
+    def run(self):
+        discard = self.discard
+        try:
+            result = discard.execute(self.plan)
+        except Exception as error:
+            # Report the files not dealt with yet instead of letting the
+            # error end the worker, which would leave the GUI waiting.
+            result = discard.failed_result(self.plan, error)
+        discard.executed_signal.emit(result)
+
+
+class BulkDiscard(QObject):
+    """Move files into quarantine without blocking the GUI thread.
+
+    ``start`` snapshots the ``FileMgr`` state on the GUI thread, and every
+    ``realpath``, ``isdir``, ``isfile`` and ``rename`` then runs on a private
+    worker thread, reporting ``progress(done, total)`` after each move. Once
+    the worker is done, the manager's listing is updated on the GUI thread
+    and the ``DiscardResult`` is delivered with ``finished``. ``cancel`` skips
+    the moves that have not started yet.
+    """
+
+    progress_signal = pyqtSignal(int, int, name="progress")
+    finished_signal = pyqtSignal(object, name="finished")
+    executed_signal = pyqtSignal(object, name="executed")
+
+    result_class = DiscardResult
+
+    def __init__(self, mgr, parent=None):
+        super().__init__(parent)
+
+        self.mgr = mgr
+        self.plan = None
+        self.cancel_event = threading.Event()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.executed_signal.connect(self.executed)
+
+
+    def start(self, file_paths):
+        """Start moving *file_paths*; return whether any work was started.
+
+        When there is nothing to do, ``finished`` is not emitted.
+        """
+        self.plan = self.prepare(file_paths)
+        if self.plan is None:
+            return False
+
+        self.cancel_event.clear()
+        self.pool.start(DiscardTask(self, self.plan))
+        return True
+
+
+    def cancel(self):
+        """Skip the moves that have not been attempted yet."""
+        self.cancel_event.set()
+
+
+    def wait_for_done(self):
+        """Block until the worker has returned.
+
+        Call this before the object is deleted: the pool's destructor waits
+        for the worker without releasing the GIL the worker may still need.
+        """
+        self.pool.waitForDone()
+
+
+    def progress_label(self, file_paths):
+        return f"Moving {len(file_paths)} files into quarantine..."
+
+
+    def prepare(self, file_paths):
+        return self.mgr.prepare_discard(file_paths)
+
+
+    def execute(self, plan):
+        return self.mgr.execute_discard(
+            plan, self.progress_signal.emit, self.cancel_event.is_set
+        )
+
+
+    def failed_result(self, plan, error):
+        """Return *plan*'s result with the sources not dealt with failed by *error*."""
+        result = plan.result
+        reported = set(result.moved)
+        reported.update(source for source, _ in result.failed)
+        result.failed.extend(
+            (source, str(error)) for source in plan.sources if source not in reported
+        )
+        return result
+
+
+    def finish(self, plan, result):
+        self.mgr.finish_discard(plan, result)
+
+
+    def executed(self, result):
+        self.finish(self.plan, result)
+        self.plan = None
+        self.finished_signal.emit(result)
+
+
+class BulkRestore(BulkDiscard):
+    """Move the files of a quarantine session back without blocking the GUI.
+
+    ``start`` takes the session directory, and the ``RestoreResult`` is
+    delivered with ``finished``.
+    """
+
+    result_class = RestoreResult
+
+    def progress_label(self, session_directory):
+        return "Moving files back from quarantine..."
+
+
+    def prepare(self, session_directory):
+        return self.mgr.prepare_restore(session_directory)
+
+
+    def execute(self, plan):
+        return self.mgr.execute_restore(
+            plan, self.progress_signal.emit, self.cancel_event.is_set
+        )
+
+
+    def failed_result(self, plan, error):
+        plan.result.failed.append((plan.session_directory, str(error)))
+        return plan.result
+
+
+    def finish(self, plan, result):
+        self.mgr.finish_restore(plan, result)
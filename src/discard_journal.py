@@ -0,0 +1,94 @@
+import json
+import os
+
+JOURNAL_FILE_NAME = "journal.jsonl"
+
+
+class DiscardJournal:
+    """Append-only record of the files moved into one quarantine session.
+
+    The journal is a JSON Lines file of ``move``, ``restore`` and ``unmoved``
+    records. Move records are synced before the files move; other records are
+    appended in batches of ``BATCH_SIZE`` and synced on ``close``. A line cut
+    short by a crash is ignored when the journal is read.
+    """
+
+    BATCH_SIZE = 256
+
+    def __init__(self, session_directory):
+        self.path = os.path.join(session_directory, JOURNAL_FILE_NAME)
+        self.pending = []
+
+
+    def record_move(self, source, destination, stat, state):
+        self.append(
+            {
+                "op": "move",
+                "source": source,
+                "destination": destination,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "state": state,
+            }
+        )
+
+
+    def record_restore(self, source):
+        self.append({"op": "restore", "source": source})
+
+
+    def record_unmoved(self, source):
+        self.append({"op": "unmoved", "source": source})
+
+
+    def append(self, record):
+        self.pending.append(record)
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.flush()
+
+
+    def flush(self, sync=False):
+        """Append the buffered records, and sync the file when *sync* is set.
+
+        A failed write is reported and returned as the ``OSError``, or
+        ``None`` when the records were written. Callers decide whether the
+        file operations the journal describes may go on.
+        """
+        if not self.pending and not sync:
+            return None
+
+        failure = None
+        try:
+            with open(self.path, "a", encoding="utf-8") as journal:
+                journal.writelines(json.dumps(record) + "\n" for record in self.pending)
+                journal.flush()
+                if sync:
+                    os.fsync(journal.fileno())
+        except OSError as error:
+            print(f"Failed to write discard journal: {error}")
+            failure = error
+        self.pending = []
+        return failure
+
+
+    def close(self):
+        return self.flush(sync=True)
+
+
+    def pending_moves(self):
+        """Return the ``move`` records of files not restored yet, in order.
+
+        ``OSError`` is raised when the journal cannot be read.
+        """
+        moves = {}
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("op") == "move":
+                    moves[record["source"]] = record
+                elif record.get("op") in ("restore", "unmoved"):
+                    moves.pop(record["source"], None)
+        return list(moves.values())
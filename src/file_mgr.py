@@ -1,11 +1,35 @@
 import os
+from bisect import bisect_left, bisect_right, insort
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
+from heapq import merge
+
+from discard_journal import DiscardJournal
+from file_ops import move_file
+from review_states import ReviewStates
 
 UNDECIDED = "undecided"
 KEEP = "keep"
 REJECT = "reject"
 DISCARD_DIRECTORY_NAME = ".qviewer-discarded"
+RENAME_SKIPPED = object()
+
+
+def entry_is_dir(entry):
+    """Return whether the ``os.DirEntry`` *entry* is a directory; ``None`` is not."""
+    try:
+        return entry is not None and entry.is_dir()
+    except OSError:
+        return False
+
+
+def entry_is_file(entry):
+    """Return whether the ``os.DirEntry`` *entry* is a file; ``None`` is not."""
+    try:
+        return entry is not None and entry.is_file()
+    except OSError:
+        return False
 
 
 @dataclass
@@ -14,11 +38,61 @@ class DiscardResult:
 
     ``moved`` contains the original source paths that were moved. Their new
     locations are ``destination`` joined with each source basename.
+    ``cancelled`` is set when the operation was stopped before every file was
+    attempted; files that were not attempted are in neither list.
     """
 
     destination: str | None = None
     moved: list[str] = field(default_factory=list)
     failed: list[tuple[str, str]] = field(default_factory=list)
+    cancelled: bool = False
+
+
+@dataclass
+class RestoreResult:
+    """Result of moving the files of a quarantine session back.
+
+    ``restored`` contains the original paths the files were moved back to,
+    and ``states`` the review state journalled for each of them.
+    ``cancelled`` is set when the restore was stopped before every file was
+    attempted, and ``complete`` once every file is back and the session has
+    been removed.
+    """
+
+    restored: list[str] = field(default_factory=list)
+    failed: list[tuple[str, str]] = field(default_factory=list)
+    states: dict[str, str] = field(default_factory=dict)
+    cancelled: bool = False
+    complete: bool = False
+
+
+@dataclass
+class RestorePlan:
+    """Snapshot of the manager state a restore needs, taken before it runs."""
+
+    session_directory: str
+    directory: str | None
+    rescan: bool
+    result: RestoreResult = field(default_factory=RestoreResult)
+
+
+@dataclass
+class DiscardPlan:
+    """Snapshot of the manager state a discard needs, taken before it runs.
+
+    ``FileMgr.execute_discard`` reads only this snapshot, so it can run on a
+    worker thread while the manager itself is left alone.
+    """
+
+    directory: str
+    discard_root: str
+    managed_files: frozenset[str]
+    sources: list[str]
+    states: dict[str, str]
+    rescan: bool
+    old_index: int | None
+    current_path: str | None
+    result: DiscardResult = field(default_factory=DiscardResult)
 
 
 class FileMgr:
@@ -27,19 +101,33 @@ class FileMgr:
     This class provides the viewer's filesystem-navigation model. It loads a
     file or directory, maintains the current file position, and exposes ordered
     movement between files and adjacent directories without depending on Qt.
+    Files and review states are keyed by ``canonical_path``, which resolves
+    directories but not the file itself, so a symlink is handled as the link.
     """
 
     SUPPORTED_IMAGE_EXTENSIONS = frozenset((".png", ".jpg", ".jpeg"))
+    RENAME_WORKERS = 1
 
-    def __init__(self):
-        self.review_states = {}
+    def __init__(self, review_store=None, rename_workers=None, quarantine_root=None):
+        self.review_states = ReviewStates((KEEP, REJECT))
+        self.review_store = review_store
+        self.rename_workers = (
+            self.RENAME_WORKERS if rename_workers is None else rename_workers
+        )
+        self.quarantine_root = quarantine_root
+        self.last_discard_session = None
+        self.stored_directories = set()
+        self.sibling_cache = {}
+        self.canonical_directories = {}
         self.reset_current_dir()
 
     def reset_current_dir(self):
         self.file_index = None
         self.directory = None
-        self.directory_files = []
+        self.set_directory_files([])
         self.directory_subdirs = []
+        self.directory_entries = {}
+        self.directory_mtime = None
 
 
     def load_path(self, path):
@@ -54,13 +142,15 @@ class FileMgr:
             self.reset_current_dir()    
             return
         
-        base_dir = os.path.dirname(os.path.realpath(fname))
+        # Resolve only the directory: an opened symlink stays in its own
+        # directory, like the links found by directory listings.
+        base_dir, base_name = os.path.split(self.canonical_path(fname))
         self.load_directory(base_dir)
 
-        base_name = os.path.basename(os.path.realpath(fname))
-        if not base_name in self.directory_files:
+        index = self.file_position(base_name)
+        if index is None:
             raise RuntimeError(f"File {fname} not found")
-        self.file_index = self.directory_files.index(base_name)
+        self.file_index = index
 
 
     def load_directory(self, directory):
@@ -68,32 +158,182 @@ class FileMgr:
             self.reset_current_dir()
             return
 
-        directory = os.path.realpath(os.fspath(directory))
-        self.directory_files, self.directory_subdirs = self.list_dir(directory)
-        self.directory = directory
+        self.directory = os.path.realpath(os.fspath(directory))
+        self.canonical_directories[self.directory] = self.directory
+        self.load_stored_review_states()
+        self.rescan_directory()
         self.file_index = 0 if len(self.directory_files) else None
 
 
+    def load_stored_review_states(self):
+        """Read the saved states of the current directory once per session."""
+        if self.review_store is None or self.directory in self.stored_directories:
+            return
+
+        self.stored_directories.add(self.directory)
+        for name, state in self.review_store.load(self.directory).items():
+            if state in (KEEP, REJECT):
+                path = os.path.join(self.directory, name)
+                self.review_states.setdefault(path, state)
+
+
+    def close(self):
+        """Write the pending review states and close the store, if any."""
+        if self.review_store is not None:
+            self.review_store.close()
+
+
+    def rescan_directory(self):
+        """Re-list the current directory and remember its mtime."""
+        # Read the mtime first so a change during the scan is seen next time.
+        self.directory_mtime = self.read_directory_mtime()
+        files, self.directory_subdirs, self.directory_entries = self.scan_dir(
+            self.directory
+        )
+        self.set_directory_files(files)
+
+
+    def read_directory_mtime(self):
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except OSError:
+            return None
+
+
+    def directory_changed(self):
+        """Return whether the current directory changed since it was listed."""
+        mtime = self.read_directory_mtime()
+        return mtime is None or mtime != self.directory_mtime
+
+
+    def set_directory_files(self, files, states=None):
+        """Replace the sorted image names and rebuild the indexes built on them.
+
+        *states* holds the review state of each name in order. When omitted,
+        the states are looked up for every name.
+        """
+        self.directory_files = files
+        self.directory_positions = {name: index for index, name in enumerate(files)}
+        if states is None:
+            if self.directory is not None:
+                self.review_states.attach_listing(self.directory, files)
+            states = self.read_review_states()
+        self.directory_states = states
+        self.state_positions = {UNDECIDED: [], KEEP: [], REJECT: []}
+        for index, state in enumerate(self.directory_states):
+            self.state_positions[state].append(index)
+
+
+    def remove_directory_files(self, names):
+        """Drop *names* from the listing without re-reading the directory.
+
+        The selected index is not adjusted; callers remap it afterwards.
+        """
+        removed = {name for name in names if name in self.directory_positions}
+        if not removed:
+            return
+
+        for name in removed:
+            self.directory_entries.pop(name, None)
+        kept = [
+            (name, state)
+            for name, state in zip(self.directory_files, self.directory_states)
+            if name not in removed
+        ]
+        self.set_directory_files(
+            [name for name, _ in kept], [state for _, state in kept]
+        )
+
+
+    def add_directory_files(self, names):
+        """Merge *names* into the listing without re-reading the directory.
+
+        The selected index is not adjusted; callers remap it afterwards.
+        """
+        added = set(names).difference(self.directory_positions)
+        if added:
+            self.set_directory_files(sorted(self.directory_files + list(added)))
+
+
+    def file_position(self, name):
+        """Return the index of image *name* in the sorted listing, or ``None``."""
+        return self.directory_positions.get(name)
+
+
+    def canonical_path(self, path):
+        """Return *path* with its directory resolved and its file name kept.
+
+        Resolved directories are remembered for the session, so repeated
+        lookups in the same directory do not touch the filesystem.
+        """
+        directory, name = os.path.split(os.path.abspath(os.fspath(path)))
+        canonical_directory = self.canonical_directories.get(directory)
+        if canonical_directory is None:
+            canonical_directory = os.path.realpath(directory)
+            self.canonical_directories[directory] = canonical_directory
+        return os.path.join(canonical_directory, name)
+
+
     @classmethod
     def is_supported_image(cls, path):
         """Return whether *path* has an image extension managed by QViewer."""
         return os.path.splitext(os.fspath(path))[1].lower() in cls.SUPPORTED_IMAGE_EXTENSIONS
 
 
-    def list_dir(self, directory):
-        files = []
+    def scan_dir(self, directory):
+        """Return sorted image names, subdirectory names and image entries.
+
+        The directory is read once with ``os.scandir``. File types come from
+        the directory entries, so no per-entry ``stat`` is needed on platforms
+        that report them, and the returned ``os.DirEntry`` objects keep any
+        size and mtime information for ``file_stat``.
+        """
+        entries = {}
         subdirs = []
-        for entry in os.listdir(directory):
-            full_path = os.path.join(directory, entry)
-            if os.path.isdir(full_path) and entry != DISCARD_DIRECTORY_NAME:
-                subdirs.append(entry)
-            elif os.path.isfile(full_path) and self.is_supported_image(entry):
-                files.append(entry)
-
-        files.sort()
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                try:
+                    if entry.is_dir():
+                        if entry.name != DISCARD_DIRECTORY_NAME:
+                            subdirs.append(entry.name)
+                    elif entry.is_file() and self.is_supported_image(entry.name):
+                        entries[entry.name] = entry
+                except OSError:
+                    continue
+
         subdirs.sort()
+        return sorted(entries), subdirs, entries
+
+
+    def snapshot_dir(self, directory):
+        """Return the ``os.DirEntry`` of every name in *directory*, read once."""
+        with os.scandir(directory) as iterator:
+            return {entry.name: entry for entry in iterator}
+
+
+    def list_dir(self, directory):
+        files, subdirs, _ = self.scan_dir(directory)
         return files, subdirs
 
+
+    def file_stat(self, fname):
+        """Return the ``os.stat_result`` for a current-directory image name.
+
+        The result comes from the directory read where the platform provides
+        it, and is otherwise fetched once and cached on the entry. ``None`` is
+        returned for names that are not in the current listing or cannot be
+        inspected.
+        """
+        entry = self.directory_entries.get(fname)
+        try:
+            if entry is not None:
+                return entry.stat()
+            if fname in self.directory_positions:
+                return os.stat(os.path.join(self.directory, fname))
+        except OSError:
+            pass
+        return None
+
             
     def current_file(self):
         if self.file_index is not None:
@@ -109,6 +349,25 @@ class FileMgr:
         return self.file_index + 1, len(self.directory_files)
 
 
+    def neighbour_files(self, behind, ahead):
+        """Return paths around the selected file, nearest first.
+
+        Up to *ahead* following and *behind* preceding files are returned,
+        alternating between the two directions so the images most likely to be
+        opened next come first.
+        """
+        if self.file_index is None:
+            return []
+
+        paths = []
+        for distance in range(1, max(behind, ahead) + 1):
+            if distance <= ahead and self.file_index + distance < len(self.directory_files):
+                paths.append(self.directory_files[self.file_index + distance])
+            if distance <= behind and self.file_index - distance >= 0:
+                paths.append(self.directory_files[self.file_index - distance])
+        return [os.path.join(self.directory, fname) for fname in paths]
+
+
     def current_directory(self):
         return self.directory
 
@@ -118,12 +377,23 @@ class FileMgr:
         if not fname:
             return UNDECIDED
 
-        return self.review_states.get(os.path.realpath(fname), UNDECIDED)
+        path = self.canonical_path(fname)
+        directory, name = os.path.split(path)
+        if directory == self.directory:
+            # Listed files are answered from the listing-parallel states;
+            # only other directories need a search of the stored records.
+            index = self.directory_positions.get(name)
+            if index is not None:
+                return self.directory_states[index]
+        return self.review_states.get(path, UNDECIDED)
 
 
     def get_current_review_state(self):
         """Return the selected file's review state."""
-        return self.get_review_state(self.current_file())
+        if self.file_index is None:
+            return UNDECIDED
+
+        return self.directory_states[self.file_index]
 
 
     def current_files_with_states(self, states):
@@ -131,12 +401,11 @@ class FileMgr:
         if self.directory is None:
             return []
 
-        matching_files = []
-        for fname in self.directory_files:
-            path = os.path.realpath(os.path.join(self.directory, fname))
-            if self.get_review_state(path) in states:
-                matching_files.append(path)
-        return matching_files
+        indexes = merge(*(self.state_positions[state] for state in states))
+        return [
+            os.path.join(self.directory, self.directory_files[index])
+            for index in indexes
+        ]
 
 
     def current_rejected_files(self):
@@ -149,34 +418,59 @@ class FileMgr:
         return self.current_files_with_states({REJECT, UNDECIDED})
 
 
+    def read_review_states(self):
+        """Look up the review state of every listed file, in listing order."""
+        return [
+            state or UNDECIDED
+            for state in self.review_states.listing_values(self.directory)
+        ]
+
+
     def current_review_counts(self):
-        """Return review-state counts for files in the current directory."""
-        counts = {UNDECIDED: 0, KEEP: 0, REJECT: 0}
-        if self.directory is None:
-            return counts
+        """Return review-state counts for files in the current directory.
+
+        The counts come from the per-state position index, which is kept up
+        to date by every state change, discard and delete, so this does not
+        touch the file list.
+        """
+        return {
+            state: len(positions) for state, positions in self.state_positions.items()
+        }
+
 
-        for fname in self.directory_files:
-            path = os.path.realpath(os.path.join(self.directory, fname))
-            counts[self.get_review_state(path)] += 1
-        return counts
+    def discard_root(self):
+        """Return the directory that holds the current directory's sessions."""
+        if self.quarantine_root:
+            return os.fspath(self.quarantine_root)
+        return os.path.join(self.directory, DISCARD_DIRECTORY_NAME)
 
 
-    def create_discard_directory(self, target_files=None):
+    def create_discard_directory(
+        self, target_files=None, directory=None, discard_root=None
+    ):
         """Create and return a unique quarantine directory for *target_files*.
 
         When *target_files* is omitted, the currently loaded image list is used
         to decide whether there is any work to do. No directory is created for
-        an empty target list.
+        an empty target list. *directory* and *discard_root* default to the
+        current directory and its quarantine root.
         """
         if target_files is None:
             target_files = self.directory_files
-        if not target_files or self.directory is None:
+        if directory is None:
+            directory = self.directory
+        if not target_files or directory is None:
             return None
-
-        discard_root = os.path.join(self.directory, DISCARD_DIRECTORY_NAME)
+        if discard_root is None:
+            discard_root = self.discard_root()
+        discard_root = os.fspath(discard_root)
         os.makedirs(discard_root, exist_ok=True)
 
+        # Sessions of every folder share a central root, so name them after
+        # the folder they came from.
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        if discard_root != os.path.join(directory, DISCARD_DIRECTORY_NAME):
+            timestamp = f"{os.path.basename(directory)}-{timestamp}"
         suffix = 0
         while True:
             session_name = timestamp if suffix == 0 else f"{timestamp}-{suffix}"
@@ -192,34 +486,76 @@ class FileMgr:
         """Move managed current-directory images into a new quarantine session.
 
         Invalid paths and individual rename failures are reported in the
-        returned result. Processing continues after each failure, and the
-        manager's directory listing is refreshed only after every move has
-        been attempted.
+        returned result, and processing continues after each failure. This runs
+        ``prepare_discard``, ``execute_discard`` and ``finish_discard`` in turn;
+        callers that must not block can run the middle step on another thread.
+        """
+        plan = self.prepare_discard(file_paths)
+        if plan is None:
+            return DiscardResult()
+        return self.finish_discard(plan, self.execute_discard(plan))
+
+
+    def prepare_discard(self, file_paths):
+        """Return the ``DiscardPlan`` for moving *file_paths*, or ``None``.
+
+        ``None`` means there is no loaded directory or no work. Only the
+        manager's own state and a stat of the directory are read here.
         """
-        # Return an empty result when there is no loaded directory or no work.
-        result = DiscardResult()
         if not file_paths or self.directory is None:
-            return result
+            return None
 
-        # Resolve the current and quarantine directories, and snapshot the
-        # filenames that this manager is allowed to move.
-        directory = os.path.realpath(self.directory)
-        discard_root = os.path.realpath(
-            os.path.join(directory, DISCARD_DIRECTORY_NAME)
+        # Note whether anything else changed the directory since it was
+        # listed, before the discard changes it, because only then does the
+        # listing have to be read again afterwards.
+        plan = DiscardPlan(
+            directory=self.directory,
+            discard_root=self.discard_root(),
+            managed_files=frozenset(self.directory_positions),
+            sources=[],
+            states={},
+            rescan=self.directory_changed(),
+            old_index=self.file_index,
+            current_path=self.current_file(),
         )
-        managed_files = set(self.directory_files)
-        candidates = []
-
-        # Validate each supplied path independently so invalid inputs are
-        # reported without preventing valid files from being processed.
         for supplied_path in file_paths:
             try:
                 source = os.fspath(supplied_path)
             except TypeError as error:
-                result.failed.append((str(supplied_path), str(error)))
+                plan.result.failed.append((str(supplied_path), str(error)))
                 continue
+            source = self.canonical_path(source)
+            plan.sources.append(source)
+            plan.states[source] = self.review_states.get(source, UNDECIDED)
+        return plan
+
+
+    def execute_discard(self, plan, progress=None, cancelled=None):
+        """Validate and move the files of *plan*, returning its result.
+
+        Only the filesystem and *plan* are touched, so this may run on a worker
+        thread. *progress* is called with the number of files processed and
+        the total after each one. When *cancelled* returns true, the remaining
+        moves are skipped and the result is marked as cancelled. Every move is
+        journalled before the first rename, and nothing moves if that fails.
+        """
+        result = plan.result
+        directory = plan.directory
+        discard_root = os.path.realpath(plan.discard_root)
 
-            source = os.path.realpath(source)
+        # Read the current directory once and check every candidate against
+        # that snapshot instead of asking the filesystem about each file.
+        try:
+            snapshot = self.snapshot_dir(directory)
+        except OSError as error:
+            result.failed.extend((source, str(error)) for source in plan.sources)
+            return result
+
+        # Validate each supplied path independently so invalid inputs are
+        # reported without preventing valid files from being processed.
+        normalized_directory = os.path.normcase(directory)
+        candidates = {}
+        for source in plan.sources:
             try:
                 is_in_discard = (
                     os.path.commonpath((source, discard_root)) == discard_root
@@ -227,22 +563,25 @@ class FileMgr:
             except ValueError:
                 is_in_discard = False
 
+            name = os.path.basename(source)
+            inside = os.path.normcase(os.path.dirname(source)) == normalized_directory
+            entry = snapshot.get(name) if inside else None
             if is_in_discard:
                 result.failed.append(
                     (source, "Path is already inside the quarantine directory")
                 )
-            elif os.path.isdir(source):
+            elif (entry_is_dir(entry) if inside else os.path.isdir(source)):
                 result.failed.append((source, "Path is a directory, not an image file"))
-            elif os.path.normcase(os.path.dirname(source)) != os.path.normcase(directory):
+            elif not inside:
                 result.failed.append((source, "Path is outside the current directory"))
             elif (
-                os.path.basename(source) not in managed_files
-                or not self.is_supported_image(source)
-                or not os.path.isfile(source)
+                name not in plan.managed_files
+                or not self.is_supported_image(name)
+                or not entry_is_file(entry)
             ):
                 result.failed.append((source, "Path is not a managed current-directory image"))
             else:
-                candidates.append(source)
+                candidates[source] = entry
 
         # Avoid creating an empty quarantine session when every input failed
         # validation.
@@ -252,51 +591,141 @@ class FileMgr:
         # Create one quarantine session for all validated source files, or
         # report directory-creation failure against every candidate.
         try:
-            result.destination = self.create_discard_directory(candidates)
+            result.destination = self.create_discard_directory(
+                candidates, directory, plan.discard_root
+            )
+            taken = {
+                os.path.normcase(name)
+                for name in self.snapshot_dir(result.destination)
+            }
         except OSError as error:
             result.failed.extend((source, str(error)) for source in candidates)
             return result
 
-        # Build a collision-free move plan before changing the filesystem.
-        destinations = set()
+        # Build a collision-free move plan before changing the filesystem. The
+        # session directory is new, so its snapshot is normally empty. The
+        # size and mtime of each file are kept for the journal.
         moves = []
-        for source in candidates:
-            destination = os.path.join(result.destination, os.path.basename(source))
-            normalized_destination = os.path.normcase(os.path.realpath(destination))
-            if os.path.exists(destination) or normalized_destination in destinations:
+        stats = []
+        for source, entry in candidates.items():
+            name = os.path.basename(source)
+            if os.path.normcase(name) in taken:
                 result.failed.append((source, "Destination file already exists"))
+                continue
+            try:
+                stats.append(entry.stat(follow_symlinks=False))
+            except OSError as error:
+                result.failed.append((source, str(error)))
+                continue
+            taken.add(os.path.normcase(name))
+            moves.append((source, os.path.join(result.destination, name)))
+
+        # Journal every planned move before any file leaves its directory.
+        journal = DiscardJournal(result.destination)
+        for (source, destination), stat in zip(moves, stats):
+            journal.record_move(source, destination, stat, plan.states[source])
+        error = journal.flush(sync=True)
+        if error is not None:
+            result.failed.extend((source, str(error)) for source, _ in moves)
+            return result
+
+        # Attempt every planned move and retain per-file failures in the
+        # result instead of aborting the remaining moves. Outcomes arrive in
+        # plan order, however many renames run at once. Moves that did not
+        # happen are withdrawn from the journal.
+        done = 0
+        outcomes = self.rename_files(moves, cancelled)
+        for outcome, (source, _) in zip(outcomes, moves):
+            if outcome is RENAME_SKIPPED:
+                result.cancelled = True
+                journal.record_unmoved(source)
+                continue
+            if outcome is None:
+                result.moved.append(source)
             else:
-                destinations.add(normalized_destination)
-                moves.append((source, destination))
+                result.failed.append((source, outcome))
+                journal.record_unmoved(source)
+            done += 1
+            if progress is not None:
+                progress(done, len(moves))
+        journal.close()
 
-        # Capture the selection before moving files so it can be restored or
-        # replaced by the nearest survivor after the directory refresh.
-        old_index = self.file_index
-        current_path = self.current_file()
-        if current_path is not None:
-            current_path = os.path.realpath(current_path)
+        return result
 
-        # Attempt every planned move and retain per-file failures in the
-        # result instead of aborting the remaining moves.
-        for source, destination in moves:
+
+    def rename_files(self, moves, cancelled=None):
+        """Rename ``(source, destination)`` pairs and yield their outcomes in order.
+
+        Files are moved with ``move_file``, so a quarantine on another device
+        works too. An outcome is ``None`` on success, the error message on
+        failure, or ``RENAME_SKIPPED`` for a rename not started because
+        *cancelled* returned true. With ``rename_workers`` above one, renames are issued
+        from that many threads, which hides the round trip of each rename on
+        network filesystems.
+        """
+        def rename(move):
+            if cancelled is not None and cancelled():
+                return RENAME_SKIPPED
             try:
-                os.rename(source, destination)
-                result.moved.append(source)
+                move_file(*move)
             except OSError as error:
-                result.failed.append((source, str(error)))
+                return str(error)
+            return None
 
-        # Forget review states only for sources that actually moved.
+        if self.rename_workers <= 1 or len(moves) <= 1:
+            yield from map(rename, moves)
+            return
+
+        with ThreadPoolExecutor(
+            min(self.rename_workers, len(moves)), thread_name_prefix="rename"
+        ) as executor:
+            yield from executor.map(rename, moves)
+
+
+    def finish_discard(self, plan, result):
+        """Apply the *result* of an executed *plan* to the manager and return it."""
+        # Nothing was moved when no quarantine session had to be created.
+        if result.destination is None:
+            return result
+
+        # Forget review states only for sources that actually moved. Their
+        # states are kept in the session's journal.
         for source in result.moved:
-            self.review_states.pop(source, None)
+            self.remember_review_state(source, UNDECIDED)
+        if result.moved:
+            self.last_discard_session = result.destination
+
+        # The plan's listing positions only apply to its own directory. If
+        # another one was opened meanwhile, re-read that one instead and keep
+        # the image selected there.
+        if self.directory is None:
+            return result
+        if self.directory == plan.directory:
+            rescan = plan.rescan
+            current_path = plan.current_path
+            old_index = plan.old_index
+        else:
+            rescan = True
+            current_path = self.current_file()
+            old_index = self.file_index
 
-        # Refresh the directory and preserve the current image when possible;
+        # Update the listing and preserve the current image when possible;
         # otherwise select the old index clamped to the remaining files.
-        self.directory_files, self.directory_subdirs = self.list_dir(self.directory)
+        if rescan:
+            self.rescan_directory()
+        else:
+            self.remove_directory_files(
+                os.path.basename(source) for source in result.moved
+            )
+            self.directory_mtime = self.read_directory_mtime()
+
+        current_index = None
+        if current_path is not None and current_path not in result.moved:
+            current_index = self.file_position(os.path.basename(current_path))
         if not self.directory_files:
             self.file_index = None
-        elif current_path is not None and current_path not in result.moved:
-            current_basename = os.path.basename(current_path)
-            self.file_index = self.directory_files.index(current_basename)
+        elif current_index is not None:
+            self.file_index = current_index
         elif old_index is None:
             self.file_index = 0
         else:
@@ -305,10 +734,143 @@ class FileMgr:
         return result
 
 
+    def restore_discard(self, session_directory):
+        """Move the files of a quarantine session back, as its journal records.
+
+        Files return to their original paths with their review states, and
+        restored files of the current directory are merged into the listing
+        without reading the directory again. A file whose original path is
+        taken again stays in the session and is reported as failed.
+
+        This runs ``prepare_restore``, ``execute_restore`` and
+        ``finish_restore`` in turn, like a discard.
+        """
+        plan = self.prepare_restore(session_directory)
+        return self.finish_restore(plan, self.execute_restore(plan))
+
+
+    def prepare_restore(self, session_directory):
+        """Return the ``RestorePlan`` for moving *session_directory* back."""
+        return RestorePlan(
+            session_directory=os.fspath(session_directory),
+            directory=self.directory,
+            rescan=self.directory is not None and self.directory_changed(),
+        )
+
+
+    def execute_restore(self, plan, progress=None, cancelled=None):
+        """Move the files journalled in *plan*'s session back and return the result.
+
+        Only the filesystem and *plan* are touched, so this may run on a worker
+        thread. *progress* and *cancelled* work as for ``execute_discard``.
+        A file that never reached the session, because the discard was
+        interrupted, is dropped from the journal. Once every file is back, the
+        journal and the empty session are removed.
+        """
+        result = plan.result
+        session_directory = plan.session_directory
+        journal = DiscardJournal(session_directory)
+        try:
+            records = journal.pending_moves()
+            in_session = self.snapshot_dir(session_directory)
+        except OSError as error:
+            result.failed.append((session_directory, str(error)))
+            return result
+
+        # Check the original paths against one snapshot per directory.
+        occupied = {}
+        restoring = []
+        unmoved = 0
+        for record in records:
+            source = record["source"]
+            directory, name = os.path.split(source)
+            if directory not in occupied:
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    occupied[directory] = set(self.snapshot_dir(directory))
+                except OSError as error:
+                    occupied[directory] = error
+            taken = occupied[directory]
+            if isinstance(taken, OSError):
+                result.failed.append((source, str(taken)))
+            elif name in taken and (
+                os.path.basename(record["destination"]) not in in_session
+            ):
+                # The discard stopped after journalling this file but before
+                # moving it, so it is still in place.
+                journal.record_unmoved(source)
+                unmoved += 1
+            elif name in taken:
+                result.failed.append((source, "Original path already exists"))
+            else:
+                taken.add(name)
+                restoring.append(record)
+
+        moves = [(record["destination"], record["source"]) for record in restoring]
+        done = 0
+        for outcome, record in zip(self.rename_files(moves, cancelled), restoring):
+            source = record["source"]
+            if outcome is RENAME_SKIPPED:
+                result.cancelled = True
+                continue
+            if outcome is None:
+                result.restored.append(source)
+                result.states[source] = record.get("state")
+                journal.record_restore(source)
+            else:
+                result.failed.append((source, outcome))
+            done += 1
+            if progress is not None:
+                progress(done, len(moves))
+        journal.close()
+
+        if len(result.restored) + unmoved == len(records):
+            result.complete = True
+            try:
+                os.remove(journal.path)
+                os.rmdir(session_directory)
+            except OSError:
+                pass
+
+        return result
+
+
+    def finish_restore(self, plan, result):
+        """Apply the *result* of an executed *plan* to the manager and return it."""
+        if result.complete and self.last_discard_session == plan.session_directory:
+            self.last_discard_session = None
+
+        for source in result.restored:
+            state = result.states.get(source)
+            if state in (KEEP, REJECT):
+                self.remember_review_state(source, state)
+
+        # Put the restored names back into the listing and select the first.
+        # A directory opened since the plan was made is read again instead.
+        names = [
+            os.path.basename(source)
+            for source in result.restored
+            if os.path.dirname(source) == self.directory
+        ]
+        if names:
+            if plan.rescan or plan.directory != self.directory:
+                self.rescan_directory()
+            else:
+                self.add_directory_files(names)
+                self.directory_mtime = self.read_directory_mtime()
+            positions = [self.file_position(name) for name in names]
+            self.file_index = min(
+                position for position in positions if position is not None
+            )
+
+        return result
+
+
     def delete_current_file(self):
         """Permanently delete the selected image and select its successor.
 
-        The file list is changed only after the filesystem deletion succeeds.
+        The file list is changed only after the filesystem deletion succeeds,
+        and is re-read only when the directory changed outside the manager.
         ``OSError`` is deliberately allowed to propagate so the UI can report
         the operating-system error without losing the current selection.
         """
@@ -316,12 +878,17 @@ class FileMgr:
         if current_path is None:
             return None
 
-        current_path = os.path.realpath(current_path)
         old_index = self.file_index
+        rescan = self.directory_changed()
         os.remove(current_path)
-        self.review_states.pop(current_path, None)
+        self.remember_review_state(current_path, UNDECIDED)
+
+        if rescan:
+            self.rescan_directory()
+        else:
+            self.remove_directory_files([self.directory_files[old_index]])
+            self.directory_mtime = self.read_directory_mtime()
 
-        self.directory_files, self.directory_subdirs = self.list_dir(self.directory)
         if not self.directory_files:
             self.file_index = None
         else:
@@ -338,11 +905,19 @@ class FileMgr:
         if state not in (UNDECIDED, KEEP, REJECT):
             raise ValueError(f"Unknown review state: {state}")
 
-        fname = os.path.realpath(fname)
+        self.move_state_position(self.file_index, state)
+        self.remember_review_state(fname, state)
+
+
+    def remember_review_state(self, path, state):
+        """Record *state* for the canonical *path* and hand it to the store."""
         if state == UNDECIDED:
-            self.review_states.pop(fname, None)
+            self.review_states.pop(path, None)
         else:
-            self.review_states[fname] = state
+            self.review_states[path] = state
+
+        if self.review_store is not None:
+            self.review_store.save(path, None if state == UNDECIDED else state)
 
 
     def toggle_keep(self):
@@ -385,33 +960,51 @@ class FileMgr:
         return False
 
 
-    def prev_keep(self):
-        """Select the nearest earlier image marked Keep."""
+    def move_state_position(self, index, state):
+        """Record in the per-state index that file *index* now has *state*."""
+        positions = self.state_positions[self.directory_states[index]]
+        del positions[bisect_left(positions, index)]
+        insort(self.state_positions[state], index)
+        self.directory_states[index] = state
+
+
+    def prev_with_state(self, state):
+        """Select the nearest earlier image whose review state is *state*."""
         if self.file_index is None:
             return False
 
-        for index in range(self.file_index - 1, -1, -1):
-            path = os.path.join(self.directory, self.directory_files[index])
-            if self.get_review_state(path) == KEEP:
-                self.file_index = index
-                return True
+        positions = self.state_positions[state]
+        position = bisect_left(positions, self.file_index) - 1
+        if position < 0:
+            return False
 
-        return False
+        self.file_index = positions[position]
+        return True
 
 
-    def next_keep(self):
-        """Select the nearest later image marked Keep."""
+    def next_with_state(self, state):
+        """Select the nearest later image whose review state is *state*."""
         if self.file_index is None:
             return False
 
-        for index in range(self.file_index + 1, len(self.directory_files)):
-            path = os.path.join(self.directory, self.directory_files[index])
-            if self.get_review_state(path) == KEEP:
-                self.file_index = index
-                return True
+        positions = self.state_positions[state]
+        position = bisect_right(positions, self.file_index)
+        if position == len(positions):
+            return False
+
+        self.file_index = positions[position]
+        return True
+
+
+    def prev_keep(self):
+        """Select the nearest earlier image marked Keep."""
+        return self.prev_with_state(KEEP)
+
+
+    def next_keep(self):
+        """Select the nearest later image marked Keep."""
+        return self.next_with_state(KEEP)
 
-        return False
-    
 
     def first(self):
         """Select the first image, returning whether the selection changed."""
@@ -431,29 +1024,44 @@ class FileMgr:
         self.file_index = last_index
         return True
 
-    def next_dir(self):
-        if self.directory is None:
-            return False
 
-        parent, dirname = os.path.split(self.directory)
-        if not dirname:
+    def select(self, index):
+        """Select the image at *index*, returning whether the selection changed."""
+        if (
+            self.file_index is None
+            or index == self.file_index
+            or not 0 <= index < len(self.directory_files)
+        ):
             return False
 
-        files, subdirs = self.list_dir(parent)
+        self.file_index = index
+        return True
+
+
+    def sibling_dirs(self, parent):
+        """Return the sorted subdirectories of *parent* and their positions.
+
+        Listings are cached per parent and reused while the parent's mtime is
+        unchanged, which it is until an entry is added, removed or renamed.
+        """
         try:
-            index = subdirs.index(dirname)
-        except ValueError:
-            return False
+            mtime = os.stat(parent).st_mtime_ns
+        except OSError:
+            self.sibling_cache.pop(parent, None)
+            return [], {}
 
-        if index < len(subdirs) - 1:
-            index += 1
-            self.load_directory(os.path.join(parent, subdirs[index]))
-            return True
+        cached = self.sibling_cache.get(parent)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
 
-        return False
+        _, subdirs, _ = self.scan_dir(parent)
+        positions = {name: index for index, name in enumerate(subdirs)}
+        self.sibling_cache[parent] = (mtime, subdirs, positions)
+        return subdirs, positions
 
 
-    def prev_dir(self):
+    def step_dir(self, offset):
+        """Load the sibling directory *offset* places away from the current one."""
         if self.directory is None:
             return False
 
@@ -461,15 +1069,22 @@ class FileMgr:
         if not dirname:
             return False
 
-        files, subdirs = self.list_dir(parent)
-        try:
-            index = subdirs.index(dirname)
-        except ValueError:
+        subdirs, positions = self.sibling_dirs(parent)
+        index = positions.get(dirname)
+        if index is None:
             return False
 
-        if index > 0:
-            index -= 1
+        index += offset
+        if 0 <= index < len(subdirs):
             self.load_directory(os.path.join(parent, subdirs[index]))
             return True
 
         return False
+
+
+    def next_dir(self):
+        return self.step_dir(1)
+
+
+    def prev_dir(self):
+        return self.step_dir(-1)
@@ -0,0 +1,130 @@
+import errno
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# Linux ioctl that makes the destination share the source's extents.
+FICLONE = 0x40049409
+COPY_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Errors that mean a kernel copy method is not available for this pair of
+# files, so the next method should be tried.
+UNSUPPORTED_COPY_ERRORS = frozenset(
+    (
+        errno.EXDEV,
+        errno.EINVAL,
+        errno.ENOSYS,
+        errno.EOPNOTSUPP,
+        errno.ENOTTY,
+        errno.EBADF,
+    )
+)
+
+
+def move_file(source, destination):
+    """Move *source* to *destination*, copying when they are on different devices.
+
+    A same-device move is a plain ``os.rename``. Across devices the file is
+    copied with ``copy_across_devices``, flushed to disk and its size checked,
+    and the source is unlinked only after that succeeded. On failure the partial copy
+    is removed, the source is left in place and ``OSError`` is raised. A
+    symbolic link is recreated rather than copied, as a rename would move it.
+    """
+    try:
+        os.rename(source, destination)
+        return
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+
+    if os.path.islink(source):
+        os.symlink(os.readlink(source), destination)
+    else:
+        copy_across_devices(source, destination)
+    try:
+        os.unlink(source)
+    except OSError:
+        os.unlink(destination)
+        raise
+
+
+def copy_across_devices(source, destination):
+    """Copy *source* to a new *destination* file and verify the copy.
+
+    The kernel copies the data: a reflink where the filesystems allow it,
+    then ``copy_file_range`` or ``sendfile``, with a buffered copy only as
+    the last resort. The copy is synced and its size checked against the
+    source, and the source's timestamps and mode are copied. The data is not
+    read back: a byte-wise comparison would read both files again, doubling
+    the I/O the kernel copy saves, while the kernel already reports failed
+    writes.
+    """
+    with open(source, "rb") as source_file:
+        size = os.fstat(source_file.fileno()).st_size
+        with open(destination, "xb") as destination_file:
+            try:
+                copy_contents(source_file, destination_file, size)
+                destination_file.flush()
+                os.fsync(destination_file.fileno())
+                copied = os.fstat(destination_file.fileno()).st_size
+                if copied != size:
+                    raise OSError(
+                        errno.EIO,
+                        f"Copied {copied} of {size} bytes",
+                        destination,
+                    )
+                shutil.copystat(source, destination)
+            except BaseException:
+                destination_file.close()
+                os.unlink(destination)
+                raise
+
+
+def copy_contents(source_file, destination_file, size):
+    """Copy *size* bytes between open files with the fastest available method."""
+    source_fd = source_file.fileno()
+    destination_fd = destination_file.fileno()
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(destination_fd, FICLONE, source_fd)
+            return
+        except OSError as error:
+            if error.errno not in UNSUPPORTED_COPY_ERRORS:
+                raise
+
+    for kernel_copy in (
+        getattr(os, "copy_file_range", None),
+        getattr(os, "sendfile", None),
+    ):
+        if kernel_copy is None:
+            continue
+        try:
+            copy_with(kernel_copy, source_fd, destination_fd, size)
+            return
+        except OSError as error:
+            # A method that fails before copying anything can be replaced by
+            # the next one; a failure part way through is a real error.
+            if error.errno not in UNSUPPORTED_COPY_ERRORS or os.lseek(
+                destination_fd, 0, os.SEEK_CUR
+            ):
+                raise
+
+    shutil.copyfileobj(source_file, destination_file)
+
+
+def copy_with(kernel_copy, source_fd, destination_fd, size):
+    """Copy *size* bytes with ``os.copy_file_range`` or ``os.sendfile``."""
+    copied = 0
+    while copied < size:
+        count = min(COPY_CHUNK_BYTES, size - copied)
+        if kernel_copy is os.sendfile:
+            sent = os.sendfile(destination_fd, source_fd, copied, count)
+        else:
+            sent = os.copy_file_range(source_fd, destination_fd, count)
+        if sent == 0:
+            break
+        copied += sent
@@ -0,0 +1,100 @@
+import os
+from collections import OrderedDict
+
+
+def image_bytes(image):
+    """Return the memory used by *image*: width x height x bytes per pixel."""
+    if image is None or image.isNull():
+        return 0
+    return image.width() * image.height() * max(1, image.depth() // 8)
+
+
+def file_cache_key(path):
+    """Return a cache key that changes whenever the file at *path* changes.
+
+    The key is ``(realpath, mtime_ns, size)``, so an edited or replaced file is
+    never served from a stale cache entry. ``OSError`` propagates when the file
+    cannot be inspected.
+    """
+    stat = os.stat(path)
+    return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+
+class ImageCache:
+    """Least-recently-used cache bounded by the memory its entries occupy.
+
+    Entries are stored with their size in bytes. Whenever the total exceeds the
+    configured limit, the least recently used entries are evicted. The entry
+    marked current is evicted last, so the displayed image is never dropped to
+    make room for prefetched ones.
+    """
+
+    def __init__(self, limit_mb):
+        self.entries = OrderedDict()
+        self.bytes_used = 0
+        self.current_key = None
+        self.set_limit_mb(limit_mb)
+
+
+    def __contains__(self, key):
+        return key in self.entries
+
+
+    def __len__(self):
+        return len(self.entries)
+
+
+    def set_limit_mb(self, limit_mb):
+        """Change the memory limit and evict entries that no longer fit."""
+        self.limit_bytes = int(limit_mb * 1024 * 1024)
+        self.evict()
+
+
+    def set_current(self, key):
+        """Give *key* priority over every other entry during eviction."""
+        self.current_key = key
+        if key in self.entries:
+            self.entries.move_to_end(key)
+
+
+    def get(self, key):
+        """Return the value for *key* and mark it recently used, or ``None``."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        self.entries.move_to_end(key)
+        return entry[0]
+
+
+    def put(self, key, value, nbytes):
+        """Store *value* and return whether it was kept within the limit."""
+        self.discard(key)
+        if nbytes > self.limit_bytes and key != self.current_key:
+            return False
+
+        self.entries[key] = (value, nbytes)
+        self.bytes_used += nbytes
+        self.evict()
+        return key in self.entries
+
+
+    def discard(self, key):
+        """Remove *key* from the cache if it is present."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes_used -= entry[1]
+
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes_used = 0
+
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its limit."""
+        for key in list(self.entries):
+            if self.bytes_used <= self.limit_bytes:
+                break
+            if key != self.current_key:
+                self.discard(key)
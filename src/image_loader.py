@@ -0,0 +1,327 @@
+import threading
+from dataclasses import dataclass
+
+from PyQt5.QtCore import (
+    QObject,
+    QRunnable,
+    QSize,
+    QThreadPool,
+    Qt,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt5.QtGui import QImage, QImageReader
+
+from image_cache import ImageCache, file_cache_key, image_bytes
+
+# Formats whose decoders can skip work when asked for a smaller image. JPEG
+# scales by 1/2, 1/4 or 1/8 in the DCT domain; other formats would decode at
+# full resolution and then scale, which is slower than not reducing at all.
+REDUCED_DECODE_FORMATS = frozenset((b"jpeg", b"jpg"))
+REDUCED_DECODE_DENOMINATORS = (8, 4, 2)
+
+
+@dataclass
+class DecodedImage:
+    """A decoded image and the full resolution of the file it came from.
+
+    ``image`` may be smaller than ``original_size`` when it was decoded for a
+    bounded display size.
+    """
+
+    image: QImage
+    original_size: QSize
+
+    @property
+    def reduced(self):
+        return self.image.size() != self.original_size
+
+    def covers(self, bound):
+        """Return whether the image can be shown fitted into *bound* unscaled up.
+
+        ``None`` stands for full resolution, which only an unreduced image
+        covers.
+        """
+        if not self.reduced:
+            return True
+        if bound is None:
+            return False
+
+        fitted = self.original_size.scaled(bound, Qt.KeepAspectRatio)
+        return (
+            self.image.width() >= fitted.width()
+            and self.image.height() >= fitted.height()
+        )
+
+
+def reduced_decode_size(original_size, bound):
+    """Return the smallest DCT-scaled size that still covers *bound*.
+
+    ``None`` is returned when no 1/2, 1/4 or 1/8 reduction is large enough.
+    """
+    fitted = original_size.scaled(bound, Qt.KeepAspectRatio)
+    for denominator in REDUCED_DECODE_DENOMINATORS:
+        reduced = QSize(
+            -(-original_size.width() // denominator),
+            -(-original_size.height() // denominator),
+        )
+        if reduced.width() >= fitted.width() and reduced.height() >= fitted.height():
+            return reduced
+    return None
+
+
+def read_image(image_path, bound=None):
+    """Decode *image_path*, reduced to cover *bound* when the format allows.
+
+    A ``DecodedImage`` with a null image is returned on failure. When *bound*
+    is ``None`` the image is decoded at full resolution.
+    """
+    reader = QImageReader(image_path)
+    original_size = reader.size()
+    if (
+        bound is not None
+        and original_size.isValid()
+        and bytes(reader.format()).lower() in REDUCED_DECODE_FORMATS
+    ):
+        reduced_size = reduced_decode_size(original_size, bound)
+        if reduced_size is not None:
+            reader.setScaledSize(reduced_size)
+
+    image = reader.read()
+    if image.isNull():
+        return DecodedImage(QImage(), QSize())
+    if not original_size.isValid():
+        original_size = image.size()
+    return DecodedImage(image, original_size)
+
+
+def image_key(image_path):
+    """Return the decoded-image cache key for *image_path*, or ``None``."""
+    try:
+        return file_cache_key(image_path)
+    except OSError:
+        return None
+
+
+class DecodeTask(QRunnable):
+    """Decode one image on a worker thread and report it to its loader.
+
+    Subclasses change what is decoded by overriding ``decode``.
+    """
+
+    def __init__(self, loader, image_path, bound=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.image_path = image_path
+        self.bound = bound
+        self.key = None
+        self.decoded = None
+        self.done = threading.Event()
+
+    def decode(self):
+        return read_image(self.image_path, self.bound)
+
+    def run(self):
+        self.key = image_key(self.image_path)
+        self.decoded = self.decode()
+        self.done.set()
+        self.loader.task_finished_signal.emit(self)
+
+
+class DecodePool(QObject):
+    """Run ``DecodeTask`` objects on a private thread pool, one per path.
+
+    Started tasks are kept in ``pending`` by path until they finish, so
+    queued ones can be cancelled. ``decoded`` is called on the GUI thread
+    for each finished task that is still the pending one of its path.
+    """
+
+    task_finished_signal = pyqtSignal(object, name="task_finished")
+
+    def __init__(self, threads, parent=None):
+        super().__init__(parent)
+
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(threads)
+        self.task_finished_signal.connect(self.task_finished)
+        self.pending = {}
+
+
+    def start(self, task, priority=0):
+        self.pending[task.image_path] = task
+        self.pool.start(task, priority)
+
+
+    def cancel_unwanted(self, wanted_paths):
+        """Cancel the queued tasks of paths outside *wanted_paths*."""
+        for path, task in list(self.pending.items()):
+            if path not in wanted_paths and self.pool.tryTake(task):
+                del self.pending[path]
+
+
+    def wait_for_done(self):
+        """Block until every running task has finished."""
+        self.pool.waitForDone()
+
+
+    def shutdown(self):
+        """Cancel queued tasks and wait for running ones to finish."""
+        self.pool.clear()
+        self.pool.waitForDone()
+        self.pending.clear()
+
+
+    @pyqtSlot(object)
+    def task_finished(self, task):
+        if self.pending.get(task.image_path) is not task:
+            return
+
+        del self.pending[task.image_path]
+        self.decoded(task)
+
+
+    def decoded(self, task):
+        raise NotImplementedError
+
+
+class ImageLoader(DecodePool):
+    """Decode images for ``ImageView`` and prefetch neighbouring files.
+
+    Decoded images are kept in a memory-bounded ``ImageCache``. ``load``
+    returns a cached or in-flight image when one exists and otherwise decodes
+    synchronously. A display *bound* lets JPEG files be decoded at a reduced
+    resolution that still covers it.
+    """
+
+    PREFETCH_THREADS = 2
+    CACHE_LIMIT_MB = 512
+    BACKGROUND_LOAD_PRIORITY = 1000
+
+    image_ready_signal = pyqtSignal(str, name="image_ready")
+
+    def __init__(self, parent=None, cache_limit_mb=None):
+        super().__init__(self.PREFETCH_THREADS, parent)
+
+        self.cache = ImageCache(
+            self.CACHE_LIMIT_MB if cache_limit_mb is None else cache_limit_mb
+        )
+        self.wanted_paths = set()
+        self.hits = 0
+        self.misses = 0
+
+
+    def stats(self):
+        """Return cache hit and miss counts for ``load`` calls."""
+        return {"hits": self.hits, "misses": self.misses}
+
+
+    def cached(self, image_path, bound=None):
+        """Return the cached ``DecodedImage`` covering *bound*, or ``None``."""
+        return self.cached_by_key(image_key(image_path), bound)
+
+
+    def cached_by_key(self, key, bound=None):
+        decoded = self.cache.get(key) if key is not None else None
+        if decoded is not None and decoded.covers(bound):
+            return decoded
+        return None
+
+
+    def preview(self, image_path):
+        """Return any cached ``DecodedImage`` for *image_path* without decoding.
+
+        The entry is returned whatever its resolution and becomes the cache's
+        current entry. ``None`` is returned when nothing is cached.
+        """
+        key = image_key(image_path)
+        self.cache.set_current(key)
+        return self.cache.get(key) if key is not None else None
+
+
+    def store(self, key, decoded):
+        """Cache *decoded* unless a higher-resolution copy is already cached."""
+        if key is None or decoded.image.isNull():
+            return
+
+        cached = self.cache.get(key)
+        if cached is not None and cached.image.width() > decoded.image.width():
+            return
+        self.cache.put(key, decoded, image_bytes(decoded.image))
+
+
+    def is_cached(self, image_path, bound=None):
+        """Return whether the current version of *image_path* is cached."""
+        return self.cached(image_path, bound) is not None
+
+
+    def load(self, image_path, bound=None):
+        """Return a ``DecodedImage`` for *image_path*, decoding it if needed.
+
+        The result covers *bound*, or is at full resolution when *bound* is
+        ``None``. It becomes the cache's current entry, which is evicted only
+        after every other entry.
+        """
+        key = image_key(image_path)
+        self.cache.set_current(key)
+        decoded = self.cached_by_key(key, bound)
+        if decoded is not None:
+            self.hits += 1
+            return decoded
+
+        task = self.pending.pop(image_path, None)
+        if task is not None and not self.pool.tryTake(task):
+            # The worker has already started, so waiting is cheaper than
+            # decoding the same file a second time.
+            task.done.wait()
+            decoded = task.decoded
+        if decoded is not None and decoded.covers(bound):
+            self.hits += 1
+        else:
+            self.misses += 1
+            decoded = read_image(image_path, bound)
+
+        self.store(key, decoded)
+        return decoded
+
+
+    def prefetch(self, image_paths, current_path=None, bound=None):
+        """Decode *image_paths* in the background, in the given priority order.
+
+        Queued decodes for files outside *image_paths* and *current_path* are
+        cancelled. Files already cached at a resolution covering *bound* are
+        not decoded again.
+        """
+        image_paths = [path for path in image_paths if path]
+        self.wanted_paths = set(image_paths)
+        if current_path:
+            self.wanted_paths.add(current_path)
+
+        self.cancel_unwanted(self.wanted_paths)
+        for priority, path in enumerate(reversed(image_paths)):
+            if path in self.pending or self.is_cached(path, bound):
+                continue
+            self.start(DecodeTask(self, path, bound), priority)
+
+
+    def load_in_background(self, image_path, bound=None):
+        """Decode *image_path* covering *bound* before any queued prefetch.
+
+        A decode of the file that is already running is left to finish.
+        """
+        self.wanted_paths.add(image_path)
+        task = self.pending.get(image_path)
+        if task is not None:
+            if not self.pool.tryTake(task):
+                return
+            del self.pending[image_path]
+
+        self.start(
+            DecodeTask(self, image_path, bound), self.BACKGROUND_LOAD_PRIORITY
+        )
+
+
+    def decoded(self, task):
+        if task.image_path in self.wanted_paths:
+            self.store(task.key, task.decoded)
+            self.image_ready_signal.emit(task.image_path)
@@ -1,16 +1,22 @@
-from PyQt5.QtCore import QPoint, QRect, Qt, pyqtSignal
-from PyQt5.QtGui import QPainter, QPen
-from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import QPoint, QRect, QRectF, QSize, Qt, pyqtSignal
+from PyQt5.QtGui import QPainter, QPen, QPixmap, QTransform
+from PyQt5.QtWidgets import QWidget
 
+from image_cache import ImageCache, image_bytes
 
-class ImageSurface(QLabel):
+
+class ImageSurface(QWidget):
     """Paint the displayed image overlay and handle selection gestures.
 
     The surface is the low-level presentation widget used by ``ImageView``.
-    It draws the optional file-name overlay, tracks rectangular mouse
-    selections, and emits a zoom request when the user activates a selection.
+    It draws one source pixmap through a rotating and scaling transform, or
+    as cached tiles when deeply zoomed, shows the optional file-name overlay,
+    and emits a zoom request when the user activates a mouse selection.
     """
 
+    TILE_SIZE = 256
+    TILE_CACHE_LIMIT_MB = 64
+
     zoom_to_selection_signal = pyqtSignal(QRect, name="zoom_to_selection")
     reset_zoom_signal = pyqtSignal(name="reset_zoom")
     pan_signal = pyqtSignal(QPoint, name="pan")
@@ -22,10 +28,16 @@ class ImageSurface(QLabel):
         self.panning_enabled = False
         self.is_panning = False
         self.pan_position = QPoint()
+        self.source = None
+        self.smooth = True
+        self.tiled = False
+        self.tiled_image_key = None
+        self.display_size = QSize()
+        self.display_transform = QTransform()
+        self.tile_cache = ImageCache(self.TILE_CACHE_LIMIT_MB)
 
         # Adjust look
-        self.setStyleSheet("background-color: black")
-        self.setAlignment(Qt.AlignCenter)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
         self.setMouseTracking(True)
 
         self.reset_selection()
@@ -42,11 +54,142 @@ class ImageSurface(QLabel):
             self.is_panning = False
 
 
+    def set_image(self, source, display_size=None, rotation_degrees=0, smooth=True):
+        """Show *source* rotated and scaled to *display_size*.
+
+        The source is not copied; it is transformed while painting. Without a
+        *display_size* the source is shown at its own size.
+        """
+        self.source = source
+        self.smooth = smooth
+        self.tiled = False
+        self.tiled_image_key = None
+        if display_size is None:
+            display_size = source.size()
+        self.display_size = QSize(display_size)
+
+        # Map source pixels to display pixels: rotate, move the rotated image
+        # back to the origin, then scale it to the requested display size.
+        transform = QTransform().rotate(rotation_degrees)
+        rotated_rect = transform.mapRect(QRectF(source.rect()))
+        transform *= QTransform.fromTranslate(-rotated_rect.left(), -rotated_rect.top())
+        transform *= QTransform.fromScale(
+            self.display_size.width() / rotated_rect.width(),
+            self.display_size.height() / rotated_rect.height(),
+        )
+        self.display_transform = transform
+        self.updateGeometry()
+        self.update()
+
+
+    def set_tiled_image(
+        self, source, image_id, rotation_degrees, display_size, smooth=True
+    ):
+        """Show *source* like ``set_image`` does, painted from cached tiles."""
+        self.set_image(source, display_size, rotation_degrees, smooth)
+        self.tiled = True
+        self.tiled_image_key = (
+            image_id,
+            rotation_degrees,
+            (display_size.width(), display_size.height()),
+            smooth,
+        )
+
+
+    def clear(self):
+        self.source = None
+        self.tiled = False
+        self.tiled_image_key = None
+        self.display_size = QSize()
+        self.display_transform = QTransform()
+        self.updateGeometry()
+        self.update()
+
+
+    def has_image(self):
+        return self.source is not None and not self.source.isNull()
+
+
+    def is_tiled(self):
+        return self.tiled
+
+
+    def sizeHint(self):
+        return QSize(self.display_size)
+
+
+    def minimumSizeHint(self):
+        return QSize(self.display_size)
+
+
     def pixmap_rect(self):
-        rect = self.pixmap().rect()
+        rect = QRect(QPoint(), self.display_size)
         rect.moveCenter(self.rect().center())
         return rect
 
+
+    def tile(self, column, row):
+        """Return the rendered tile at *column* and *row*, using the cache."""
+        key = (self.tiled_image_key, column, row)
+        tile = self.tile_cache.get(key)
+        if tile is not None:
+            return tile
+
+        tile_rect = QRect(
+            column * self.TILE_SIZE, row * self.TILE_SIZE, self.TILE_SIZE, self.TILE_SIZE
+        ).intersected(QRect(QPoint(), self.display_size))
+        tile = QPixmap(tile_rect.size())
+        tile.fill(Qt.black)
+        painter = QPainter(tile)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+        painter.setTransform(
+            self.display_transform
+            * QTransform.fromTranslate(-tile_rect.left(), -tile_rect.top())
+        )
+        painter.drawPixmap(0, 0, self.source)
+        painter.end()
+
+        self.tile_cache.put(key, tile, image_bytes(tile))
+        return tile
+
+
+    def paint_tiles(self, painter, exposed_rect):
+        origin = self.pixmap_rect().topLeft()
+        visible = exposed_rect.translated(-origin).intersected(
+            QRect(QPoint(), self.display_size)
+        )
+        if visible.isEmpty():
+            return
+
+        first_column = visible.left() // self.TILE_SIZE
+        last_column = visible.right() // self.TILE_SIZE
+        first_row = visible.top() // self.TILE_SIZE
+        last_row = visible.bottom() // self.TILE_SIZE
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                painter.drawPixmap(
+                    origin + QPoint(column * self.TILE_SIZE, row * self.TILE_SIZE),
+                    self.tile(column, row),
+                )
+
+
+    def paint_image(self, painter, exposed_rect):
+        origin = self.pixmap_rect().topLeft()
+        if self.display_transform.isIdentity():
+            # Already at display size and orientation: a plain blit.
+            painter.drawPixmap(origin, self.source)
+            return
+
+        painter.save()
+        painter.setClipRect(exposed_rect)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, self.smooth)
+        painter.setTransform(
+            self.display_transform
+            * QTransform.fromTranslate(origin.x(), origin.y())
+        )
+        painter.drawPixmap(0, 0, self.source)
+        painter.restore()
+
     # Event handlers
 
     def mousePressEvent(self, event):
@@ -100,13 +243,13 @@ class ImageSurface(QLabel):
 
 
     def paintEvent(self, event):
-        # Draw image as usual
-        super().paintEvent(event)
-
-        if not self.is_selecting:
-            return
-
         painter = QPainter(self)
+        painter.fillRect(event.rect(), Qt.black)
+
+        if self.is_tiled():
+            self.paint_tiles(painter, event.rect())
+        elif self.has_image():
+            self.paint_image(painter, event.rect())
 
         # Draw zoom lasso
         if self.is_selecting:
@@ -1,7 +1,17 @@
-from PyQt5.QtCore import QPoint, QRect, Qt, pyqtSlot
-from PyQt5.QtGui import QFontDatabase, QPixmap, QTransform
+from PyQt5.QtCore import (
+    QElapsedTimer,
+    QPoint,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    pyqtSlot,
+)
+from PyQt5.QtGui import QFontDatabase, QPixmap
 from PyQt5.QtWidgets import QFrame, QLabel, QScrollArea
 
+from image_cache import ImageCache, image_bytes
+from image_loader import ImageLoader, image_key
 from image_surface import ImageSurface
 
 
@@ -10,18 +20,40 @@ class ImageView(QScrollArea):
 
     This widget owns the ``ImageSurface``, loads image pixmaps, scales them for
     fit-to-window or original-size viewing, and translates selection-based zoom
-    requests into updated scale and scroll positions.
+    requests into updated scale and scroll positions. Images are decoded by an
+    ``ImageLoader``, and ``scale_factor`` is always relative to the file's
+    original size, even when a reduced resolution is displayed.
     """
 
     ZOOM_UNSET = 0
     ZOOM_1_TO_1 = 1
     ZOOM_FIT_TO_WINDOW = 2
     WHEEL_ZOOM_FACTOR = 1.10
+    SCALED_CACHE_LIMIT_MB = 128
+    TILED_RENDER_SCREENS = 8
+    REFINE_DELAY_MS = 150
+    FRAME_INTERVAL_MS = 16
 
     def __init__(self):
         super().__init__()
 
         self.pixmap = None
+        self.previewing = False
+        self.loading_path = None
+        self.thumbnail_source = None
+        self.loader = ImageLoader(self)
+        self.loader.image_ready_signal.connect(self.image_ready)
+        self.scaled_cache = ImageCache(self.SCALED_CACHE_LIMIT_MB)
+        self.progressive_rendering = True
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(self.REFINE_DELAY_MS)
+        self.refine_timer.timeout.connect(self.refine_image)
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.timeout.connect(self.render_scheduled)
+        self.last_render = QElapsedTimer()
+        self.pending_anchor = None
         self.surface = ImageSurface()
         self.setFrameShape(QFrame.NoFrame)
         self.setWidgetResizable(True)
@@ -54,6 +86,40 @@ class ImageView(QScrollArea):
         self.rotation_degrees = 0
 
 
+    @property
+    def pixmap(self):
+        return self._pixmap
+
+
+    @pixmap.setter
+    def pixmap(self, pixmap):
+        # A pixmap assigned without a file identity is identified by its Qt
+        # cache key, which changes whenever the pixmap contents change. It is
+        # treated as a full-resolution image with no file to decode again.
+        self._pixmap = pixmap
+        self.image_id = pixmap.cacheKey() if pixmap is not None else None
+        self.original_size = pixmap.size() if pixmap is not None else None
+        self.image_path = None
+
+
+    def set_decoded_image(self, image_path, decoded):
+        """Show *decoded* as the source image loaded from *image_path*."""
+        self.pixmap = QPixmap.fromImage(decoded.image)
+        self.image_path = image_path
+        self.original_size = QSize(decoded.original_size)
+        key = self.loader.cache.current_key
+        if key is not None:
+            self.image_id = (key, decoded.image.width(), decoded.image.height())
+
+
+    def decode_bound(self):
+        """Return the size new images must cover, or ``None`` for full size."""
+        viewport_size = self.viewport().size()
+        if self.zoom_mode != self.ZOOM_FIT_TO_WINDOW or viewport_size.isEmpty():
+            return None
+        return viewport_size
+
+
     def show_file_name(self, file_name):
         self._file_name = file_name
         self._refresh_file_name_label()
@@ -79,14 +145,40 @@ class ImageView(QScrollArea):
         self.setVerticalScrollBarPolicy(policy)
 
 
+    def thumbnail(self, image_path):
+        """Return the ``thumbnail_source`` image of *image_path*, or ``None``."""
+        if self.thumbnail_source is None:
+            return None
+        decoded = self.thumbnail_source(image_path)
+        if decoded is None or decoded.image.isNull():
+            return None
+        return decoded
+
+
     def load_image(self, image_path):
         self.rotation_degrees = 0
+        self.previewing = False
+        self.loading_path = None
         if not image_path:
             self.pixmap = None
             self.surface.clear()
             return
 
-        self.pixmap = QPixmap(image_path)
+        bound = self.decode_bound()
+        if not self.loader.is_cached(image_path, bound):
+            thumbnail = self.thumbnail(image_path)
+            if thumbnail is not None:
+                self.loader.cache.set_current(image_key(image_path))
+                self.loader.load_in_background(image_path, bound)
+                self.loading_path = image_path
+                self.previewing = True
+                self.set_decoded_image(image_path, thumbnail)
+                self.reset_zoom()
+                self.surface.reset_selection()
+                return
+
+        decoded = self.loader.load(image_path, bound)
+        self.set_decoded_image(image_path, decoded)
         if self.pixmap.isNull():
             print("Failed to load image.")
             return
@@ -95,6 +187,63 @@ class ImageView(QScrollArea):
         self.surface.reset_selection()
 
 
+    def show_preview(self, image_path):
+        """Show *image_path* only if it is already decoded, at any resolution.
+
+        This is used while the user skims through files, so nothing is decoded
+        and queued decodes of other files are cancelled. Files that are not
+        cached show an empty surface until ``load_image`` is called.
+        """
+        self.rotation_degrees = 0
+        self.previewing = True
+        self.loading_path = None
+        self.loader.prefetch([], image_path)
+        decoded = self.loader.preview(image_path) if image_path else None
+        if (decoded is None or decoded.image.isNull()) and image_path:
+            decoded = self.thumbnail(image_path)
+        if decoded is None or decoded.image.isNull():
+            self.pixmap = None
+            self.surface.clear()
+            return
+
+        self.set_decoded_image(image_path, decoded)
+        self.reset_zoom()
+        self.surface.reset_selection()
+
+
+    @pyqtSlot(str)
+    def image_ready(self, image_path):
+        """Replace the thumbnail shown by ``load_image`` with the decoded file.
+
+        The zoom and rotation chosen meanwhile are kept, because the scale
+        factor is relative to the original size either image shares.
+        """
+        if image_path != self.loading_path:
+            return
+
+        self.loading_path = None
+        self.previewing = False
+        decoded = self.loader.load(image_path, self.decode_bound())
+        if decoded.image.isNull():
+            print("Failed to load image.")
+            return
+
+        self.set_decoded_image(image_path, decoded)
+        self.resize_image()
+
+
+    def prefetch(self, image_paths, current_path=None):
+        """Decode *image_paths* in the background so later loads are instant."""
+        self.loader.prefetch(image_paths, current_path, self.decode_bound())
+
+
+    def shutdown(self):
+        """Stop background work and pending renders before the view is destroyed."""
+        self.render_timer.stop()
+        self.refine_timer.stop()
+        self.loader.shutdown()
+
+
     def rotate_left(self):
         """Rotate the current view 90 degrees counter-clockwise."""
         if not self.pixmap:
@@ -115,20 +264,11 @@ class ImageView(QScrollArea):
         self.resize_image()
 
 
-    def oriented_pixmap(self):
-        """Return the source pixmap with the transient view rotation applied."""
-        if not self.pixmap or self.rotation_degrees == 0:
-            return self.pixmap
-
-        transform = QTransform().rotate(self.rotation_degrees)
-        return self.pixmap.transformed(transform, Qt.SmoothTransformation)
-
-
     # Events
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self._refresh_file_name_label()
-        self.resize_image()
+        self.schedule_render()
 
 
     def wheelEvent(self, event):
@@ -149,14 +289,40 @@ class ImageView(QScrollArea):
 
         self.zoom_changed = True
         self.scale_factor *= self.WHEEL_ZOOM_FACTOR ** wheel_steps
+        self.pending_anchor = (relative_x, relative_y, cursor_pos)
+        self.schedule_render()
+        event.accept()
+
+
+    # Render scheduling
+
+    def schedule_render(self):
+        """Render now, or once at the end of the current display frame."""
+        if self.render_timer.isActive():
+            return
+
+        elapsed = self.last_render.elapsed() if self.last_render.isValid() else None
+        if elapsed is None or elapsed >= self.FRAME_INTERVAL_MS:
+            self.render_scheduled()
+        else:
+            self.render_timer.start(self.FRAME_INTERVAL_MS - elapsed)
+
+
+    @pyqtSlot()
+    def render_scheduled(self):
+        """Apply pending zoom and size changes, then restore the wheel anchor."""
+        anchor = self.pending_anchor
         self.resize_image()
+        if anchor is None or not self.pixmap:
+            return
 
+        # Put the image point that was under the cursor back under it.
+        relative_x, relative_y, cursor_pos = anchor
         pixmap_rect = self.surface.pixmap_rect()
         anchor_x = pixmap_rect.left() + relative_x * pixmap_rect.width()
         anchor_y = pixmap_rect.top() + relative_y * pixmap_rect.height()
         self.horizontalScrollBar().setValue(round(anchor_x - cursor_pos.x()))
         self.verticalScrollBar().setValue(round(anchor_y - cursor_pos.y()))
-        event.accept()
 
 
     # Zoom methods
@@ -192,32 +358,152 @@ class ImageView(QScrollArea):
         self.resize_image()
 
 
-    def resize_image(self):
-        if not self.pixmap:
+    def oriented_size(self):
+        """Return the original image size with the view rotation applied."""
+        size = QSize(self.original_size)
+        if self.rotation_degrees in (90, 270):
+            size.transpose()
+        return size
+
+
+    def ensure_resolution(self, target_size):
+        """Decode a larger source image when *target_size* exceeds it."""
+        if (
+            self.previewing
+            or self.image_path is None
+            or self.pixmap.size() == self.original_size
+        ):
             return
 
-        oriented_pixmap = self.oriented_pixmap()
+        bound = QSize(target_size)
+        if self.rotation_degrees in (90, 270):
+            bound.transpose()
+        if (
+            bound.width() <= self.pixmap.width()
+            and bound.height() <= self.pixmap.height()
+        ):
+            return
+
+        decoded = self.loader.load(self.image_path, bound)
+        if not decoded.image.isNull():
+            self.set_decoded_image(self.image_path, decoded)
+
+
+    def use_tiled_rendering(self, target_size):
+        """Return whether *target_size* is too large for one scaled pixmap."""
+        viewport_size = self.viewport().size()
+        viewport_pixels = max(1, viewport_size.width() * viewport_size.height())
+        target_pixels = target_size.width() * target_size.height()
+        return target_pixels > self.TILED_RENDER_SCREENS * viewport_pixels
+
+
+    def scaled_pixmap_key(self, size, mode):
+        return self.image_id, (size.width(), size.height()), mode
+
+
+    def scale_source(self, size, mode):
+        """Scale the unrotated source pixmap to exactly *size*."""
+        return self.pixmap.scaled(size, Qt.IgnoreAspectRatio, mode)
+
+
+    def scaled_pixmap(self, size, mode=Qt.SmoothTransformation):
+        """Return the unrotated source scaled to *size*, using the cache.
+
+        The view rotation is applied by the surface while painting, so one
+        scaled pixmap serves every orientation.
+        """
+        key = self.scaled_pixmap_key(size, mode)
+        self.scaled_cache.set_current(key)
+        scaled_pixmap = self.scaled_cache.get(key)
+        if scaled_pixmap is None:
+            scaled_pixmap = self.scale_source(size, mode)
+            self.scaled_cache.put(key, scaled_pixmap, image_bytes(scaled_pixmap))
+        return scaled_pixmap
+
+
+    def display_pixmap(self, size, smooth):
+        """Return the scaled source pixmap to show now for *size*.
+
+        A smooth result is used when *smooth* is requested, progressive
+        rendering is off, or it is already cached. Otherwise a fast preview is
+        returned and the refine timer is restarted.
+        """
+        smooth_key = self.scaled_pixmap_key(size, Qt.SmoothTransformation)
+        if smooth or not self.progressive_rendering or smooth_key in self.scaled_cache:
+            return self.scaled_pixmap(size)
+
+        self.refine_timer.start()
+        return self.scaled_pixmap(size, Qt.FastTransformation)
+
+
+    @pyqtSlot()
+    def refine_image(self):
+        """Replace a fast preview with the smoothly scaled image."""
+        self.resize_image(smooth=True)
+
+
+    def resize_image(self, smooth=False):
+        # Any render satisfies a scheduled one; a pending wheel anchor only
+        # applies to the render it was scheduled for.
+        self.render_timer.stop()
+        self.pending_anchor = None
+        self.last_render.start()
+        if not self.pixmap or self.pixmap.isNull():
+            self.refine_timer.stop()
+            return
+
+        oriented_size = self.oriented_size()
         viewport_size = self.viewport().size()
         if self.zoom_mode == self.ZOOM_FIT_TO_WINDOW and not self.zoom_changed:
-            factor_h = float(viewport_size.height()) / oriented_pixmap.size().height()
-            factor_w = float(viewport_size.width()) / oriented_pixmap.size().width()
+            factor_h = float(viewport_size.height()) / oriented_size.height()
+            factor_w = float(viewport_size.width()) / oriented_size.width()
             self.scale_factor = min(factor_h, factor_w)
-            scaled_pixmap = oriented_pixmap.scaled(
-                viewport_size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
+            target_size = oriented_size.scaled(viewport_size, Qt.KeepAspectRatio)
         else:
-            scaled_size = oriented_pixmap.size() * self.scale_factor
-            scaled_pixmap = oriented_pixmap.scaled(
-                scaled_size, Qt.KeepAspectRatio, Qt.SmoothTransformation
+            target_size = oriented_size.scaled(
+                oriented_size * self.scale_factor, Qt.KeepAspectRatio
             )
 
-        self.surface.setPixmap(scaled_pixmap)
+        self.ensure_resolution(target_size)
+        upright_size = QSize(target_size)
+        if self.rotation_degrees in (90, 270):
+            upright_size.transpose()
+        magnified = (
+            upright_size.width() >= self.pixmap.width()
+            and upright_size.height() >= self.pixmap.height()
+        )
+        if magnified or self.use_tiled_rendering(target_size):
+            # Draw the source itself through the surface transform. Only a
+            # shrinking scale needs a filtered copy to look right.
+            smooth = (
+                smooth
+                or not self.progressive_rendering
+                or upright_size == self.pixmap.size()
+            )
+            if not smooth:
+                self.refine_timer.start()
+            if self.use_tiled_rendering(target_size):
+                self.surface.set_tiled_image(
+                    self.pixmap,
+                    self.image_id,
+                    self.rotation_degrees,
+                    target_size,
+                    smooth,
+                )
+            else:
+                self.surface.set_image(
+                    self.pixmap, target_size, self.rotation_degrees, smooth
+                )
+        else:
+            self.surface.set_image(
+                self.display_pixmap(upright_size, smooth),
+                target_size,
+                self.rotation_degrees,
+            )
         self.surface.adjustSize()
         self.surface.set_panning_enabled(
-            scaled_pixmap.width() > viewport_size.width()
-            or scaled_pixmap.height() > viewport_size.height()
+            target_size.width() > viewport_size.width()
+            or target_size.height() > viewport_size.height()
         )
 
 
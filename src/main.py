@@ -1,17 +1,37 @@
+import os
+import sqlite3
 import sys
 
+from PyQt5.QtCore import QSettings, QStandardPaths
 from PyQt5.QtWidgets import QApplication
 
 from main_window import ImageViewerMainWindow
+from review_store import ReviewStore
 
 __all__ = ["ImageViewerMainWindow", "main"]
 
+REVIEW_STORE_FILE_NAME = "review_states.sqlite3"
+
+
+def open_review_store():
+    """Open the per-user review-state database, or return ``None``."""
+    location = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
+    try:
+        return ReviewStore(os.path.join(location, REVIEW_STORE_FILE_NAME))
+    except (OSError, sqlite3.Error) as error:
+        print(f"Review states will not be saved: {error}")
+        return None
+
 
 def main():
     image_path = sys.argv[1] if len(sys.argv) > 1 else None
 
     app = QApplication(sys.argv)
-    window = ImageViewerMainWindow(image_path)
+    app.setOrganizationName("QViewer")
+    app.setApplicationName("QViewer")
+    window = ImageViewerMainWindow(
+        image_path, review_store=open_review_store(), settings=QSettings()
+    )
     window.show()
     return app.exec_()
 
@@ -1,9 +1,17 @@
 import os
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QEvent, QEventLoop, Qt, QTimer
 from PyQt5.QtGui import QKeySequence
-from PyQt5.QtWidgets import QAction, QFileDialog, QMainWindow, QMessageBox
+from PyQt5.QtWidgets import (
+    QAction,
+    QDockWidget,
+    QFileDialog,
+    QMainWindow,
+    QMessageBox,
+    QProgressDialog,
+)
 
+from bulk_discard import BulkDiscard, BulkRestore
 from file_mgr import (
     DISCARD_DIRECTORY_NAME,
     KEEP,
@@ -12,26 +20,65 @@ from file_mgr import (
     FileMgr,
 )
 from image_view import ImageView
+from thumbnail_strip import ThumbnailStrip
 
 
 class ImageViewerMainWindow(QMainWindow):
     """Coordinate QViewer's UI, file navigation, and application actions.
 
-    The main window connects ``FileMgr`` and ``ImageView``, builds menus and
-    keyboard shortcuts, loads the selected image, and manages transitions
-    between normal and full-screen viewing modes.
+    The main window connects ``FileMgr``, ``ImageView`` and the thumbnail
+    strip, builds menus and keyboard shortcuts, loads the selected image, and
+    manages transitions between normal and full-screen viewing modes.
     """
 
     MAX_REPORTED_DISCARD_FAILURES = 10
     MAX_DISCARD_ERROR_LENGTH = 160
-
-    def __init__(self, image_path=None):
+    PREFETCH_AHEAD = 2
+    PREFETCH_BEHIND = 1
+    NAVIGATION_SETTLE_MS = 120
+    QUARANTINE_ROOT_SETTING = "quarantine_root"
+    RENAME_WORKERS_SETTING = "rename_workers"
+    RENAME_WORKERS = 4
+
+    def __init__(
+        self,
+        image_path=None,
+        prefetch_ahead=None,
+        prefetch_behind=None,
+        review_store=None,
+        settings=None,
+    ):
         super().__init__()
 
         # Flags and variables
         self.fit_to_window = True
-        self.mgr = FileMgr()
+        self.thumbnails_visible = True
+        self.settings = settings
+        quarantine_root = ""
+        rename_workers = self.RENAME_WORKERS
+        if settings is not None:
+            quarantine_root = settings.value(self.QUARANTINE_ROOT_SETTING, "", str)
+            rename_workers = settings.value(
+                self.RENAME_WORKERS_SETTING, rename_workers, int
+            )
+        self.mgr = FileMgr(
+            review_store,
+            rename_workers=max(1, rename_workers),
+            quarantine_root=quarantine_root or None,
+        )
         self.maximized = False
+        self.key_repeating = False
+        self.prefetch_ahead = (
+            self.PREFETCH_AHEAD if prefetch_ahead is None else prefetch_ahead
+        )
+        self.prefetch_behind = (
+            self.PREFETCH_BEHIND if prefetch_behind is None else prefetch_behind
+        )
+
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(self.NAVIGATION_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.settle_navigation)
 
         self.init_ui()
         self.create_menu()
@@ -44,6 +91,17 @@ class ImageViewerMainWindow(QMainWindow):
         self.image_view = ImageView()
         self.setCentralWidget(self.image_view)
 
+        self.thumbnail_strip = ThumbnailStrip()
+        self.thumbnail_strip.file_selected_signal.connect(self.select_image)
+        self.image_view.thumbnail_source = self.thumbnail_strip.loader.placeholder
+        self.thumbnail_dock = QDockWidget("Thumbnails", self)
+        self.thumbnail_dock.setObjectName("thumbnail_dock")
+        self.thumbnail_dock.setAllowedAreas(
+            Qt.TopDockWidgetArea | Qt.BottomDockWidgetArea
+        )
+        self.thumbnail_dock.setWidget(self.thumbnail_strip)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.thumbnail_dock)
+
         self.resize(800, 600)
         self.setMinimumSize(640, 480)
 
@@ -139,6 +197,12 @@ class ImageViewerMainWindow(QMainWindow):
 
         self.update_zoom_menus()
 
+        self.thumbnail_action = self.thumbnail_dock.toggleViewAction()
+        self.thumbnail_action.setText("Thumbnail Strip")
+        self.thumbnail_action.setShortcut("T")
+        view_menu.addAction(self.thumbnail_action)
+        self.addAction(self.thumbnail_action)
+
         view_menu.addSeparator()
 
         zoom_in_action = QAction("Zoom In", self)
@@ -229,6 +293,24 @@ class ImageViewerMainWindow(QMainWindow):
         review_menu.addAction(self.keep_only_marked_action)
         self.addAction(self.keep_only_marked_action)
 
+        self.undo_discard_action = QAction("Undo Last Discard", self)
+        self.undo_discard_action.setShortcut(QKeySequence.Undo)
+        self.undo_discard_action.triggered.connect(self.undo_last_discard)
+        review_menu.addAction(self.undo_discard_action)
+        self.addAction(self.undo_discard_action)
+
+        review_menu.addSeparator()
+
+        choose_quarantine_action = QAction("Set Quarantine Folder...", self)
+        choose_quarantine_action.triggered.connect(self.choose_quarantine_root)
+        review_menu.addAction(choose_quarantine_action)
+
+        local_quarantine_action = QAction("Quarantine Inside Reviewed Folders", self)
+        local_quarantine_action.triggered.connect(
+            lambda: self.set_quarantine_root(None)
+        )
+        review_menu.addAction(local_quarantine_action)
+
     # File operations
 
     def open_file(self):
@@ -290,9 +372,61 @@ class ImageViewerMainWindow(QMainWindow):
         super().resizeEvent(event)
         self.refresh_current_file_display()
 
+    def event(self, event):
+        # Shortcut overrides and releases of unhandled keys propagate up from
+        # the focus widget, so this sees whether navigation is auto-repeating.
+        if event.type() == QEvent.ShortcutOverride:
+            self.key_repeating = event.isAutoRepeat()
+        elif event.type() == QEvent.KeyRelease and not event.isAutoRepeat():
+            self.key_repeating = False
+            if self.settle_timer.isActive():
+                self.settle_navigation()
+        return super().event(event)
+
+    def closeEvent(self, event):
+        self.settle_timer.stop()
+        self.thumbnail_strip.shutdown()
+        self.image_view.shutdown()
+        self.mgr.close()
+        super().closeEvent(event)
+
+    def refresh_thumbnail_strip(self):
+        self.thumbnail_strip.show_listing(
+            self.mgr.directory,
+            self.mgr.directory_files,
+            self.mgr.file_index,
+        )
+
     def load_image(self, image_path):
         self.refresh_current_file_display()
+        self.refresh_thumbnail_strip()
         self.image_view.load_image(image_path)
+        self.image_view.prefetch(
+            self.mgr.neighbour_files(self.prefetch_behind, self.prefetch_ahead),
+            image_path,
+        )
+
+    def show_navigated_image(self):
+        """Show the current file after a navigation step.
+
+        Auto-repeated steps only preview the file and restart the settle
+        timer, so skimming never waits for a decode.
+        """
+        image_path = self.mgr.current_file()
+        if not self.key_repeating:
+            self.settle_timer.stop()
+            self.load_image(image_path)
+            return
+
+        self.refresh_current_file_display()
+        self.refresh_thumbnail_strip()
+        self.image_view.show_preview(image_path)
+        self.settle_timer.start()
+
+    def settle_navigation(self):
+        """Decode the file the user stopped on while skimming."""
+        self.settle_timer.stop()
+        self.load_image(self.mgr.current_file())
 
     # Actions
 
@@ -322,35 +456,39 @@ class ImageViewerMainWindow(QMainWindow):
 
     def prev_image(self):
         if self.mgr.prev():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def next_image(self):
         if self.mgr.next():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def prev_keep_image(self):
         if self.mgr.prev_keep():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def next_keep_image(self):
         if self.mgr.next_keep():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def first_image(self):
         if self.mgr.first():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def last_image(self):
         if self.mgr.last():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
+
+    def select_image(self, index):
+        if self.mgr.select(index):
+            self.show_navigated_image()
 
     def prev_dir(self):
         if self.mgr.prev_dir():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def next_dir(self):
         if self.mgr.next_dir():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
 
     def toggle_keep(self):
         self.mgr.toggle_keep()
@@ -367,7 +505,7 @@ class ImageViewerMainWindow(QMainWindow):
         self.mgr.set_current_review_state(state)
 
         if self.mgr.next():
-            self.load_image(self.mgr.current_file())
+            self.show_navigated_image()
         else:
             self.refresh_current_file_display()
 
@@ -487,16 +625,70 @@ class ImageViewerMainWindow(QMainWindow):
         )
 
     def report_discard_success(self, operation_name, result):
-        """Report a completed bulk move in an information dialog."""
+        """Report a completed or cancelled bulk move in an information dialog."""
         moved_count = len(result.moved)
         moved_word = "file" if moved_count == 1 else "files"
+        if result.cancelled:
+            title = f"{operation_name} - Cancelled"
+            summary = f"Cancelled after moving {moved_count} {moved_word}."
+        else:
+            title = f"{operation_name} - Complete"
+            summary = f"Moved {moved_count} {moved_word}."
         QMessageBox.information(
             self,
-            f"{operation_name} - Complete",
-            f"Moved {moved_count} {moved_word}.\n\n"
-            f"Quarantine session:\n{result.destination}",
+            title,
+            f"{summary}\n\nQuarantine session:\n{result.destination}",
         )
 
+    def move_with_progress(self, operation_name, file_paths, operation=None):
+        """Move *file_paths* into quarantine on a worker thread and return the result.
+
+        A window-modal progress dialog is shown while the files are moved, and
+        its Cancel button skips the moves that have not started. The window's
+        actions are disabled until the result is applied. *operation* is the
+        worker to run, a ``BulkDiscard`` by default; a ``BulkRestore`` takes a
+        session directory instead of *file_paths*.
+        """
+        if operation is None:
+            operation = BulkDiscard(self.mgr, self)
+        # The range is set by the first progress report.
+        progress = QProgressDialog(
+            operation.progress_label(file_paths), "Cancel", 0, 0, self
+        )
+        progress.setWindowTitle(operation_name)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoReset(False)
+
+        def show_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        results = []
+        loop = QEventLoop()
+        operation.progress_signal.connect(show_progress)
+        operation.finished_signal.connect(results.append)
+        operation.finished_signal.connect(loop.quit)
+        progress.canceled.connect(operation.cancel)
+        actions = [
+            action for action in self.findChildren(QAction) if action.isEnabled()
+        ]
+        for action in actions:
+            action.setEnabled(False)
+        try:
+            if operation.start(file_paths):
+                progress.show()
+                loop.exec_()
+            operation.wait_for_done()
+        finally:
+            for action in actions:
+                action.setEnabled(True)
+
+        progress.close()
+        progress.deleteLater()
+        operation.deleteLater()
+        return results[0] if results else operation.result_class()
+
     def run_bulk_discard(
         self,
         operation_name,
@@ -511,7 +703,7 @@ class ImageViewerMainWindow(QMainWindow):
         counts = self.mgr.current_review_counts()
         directory = self.mgr.current_directory()
         quarantine = (
-            os.path.join(directory, DISCARD_DIRECTORY_NAME) + os.sep
+            self.mgr.discard_root() + os.sep
             if directory is not None
             else DISCARD_DIRECTORY_NAME + os.sep
         )
@@ -526,7 +718,7 @@ class ImageViewerMainWindow(QMainWindow):
         ):
             return None
 
-        result = self.mgr.move_to_discard_directory(candidates)
+        result = self.move_with_progress(operation_name, candidates)
         self.load_image(self.mgr.current_file())
         if result.failed:
             self.report_discard_failures(operation_name, result)
@@ -585,6 +777,56 @@ class ImageViewerMainWindow(QMainWindow):
             "There is nothing to discard.",
         )
 
+    def undo_last_discard(self):
+        """Move the files of the most recent discard back and show the first."""
+        session = self.mgr.last_discard_session
+        if session is None:
+            QMessageBox.information(
+                self, "Undo Last Discard", "There is no discard to undo."
+            )
+            return None
+
+        result = self.move_with_progress(
+            "Undo Last Discard", session, BulkRestore(self.mgr, self)
+        )
+        self.load_image(self.mgr.current_file())
+        if result.failed:
+            visible_failures = result.failed[: self.MAX_REPORTED_DISCARD_FAILURES]
+            details = [
+                f"{os.path.basename(source)}: {reason}"
+                for source, reason in visible_failures
+            ]
+            QMessageBox.warning(
+                self,
+                "Undo Last Discard - Restore Failures",
+                f"Restored {len(result.restored)} of "
+                f"{len(result.restored) + len(result.failed)} files.\n\n"
+                f"The following files are still in:\n{session}\n\n"
+                + "\n".join(details),
+            )
+        elif result.cancelled:
+            QMessageBox.information(
+                self,
+                "Undo Last Discard - Cancelled",
+                f"Cancelled after restoring {len(result.restored)} files.\n\n"
+                f"The other files are still in:\n{session}",
+            )
+        return result
+
+    def choose_quarantine_root(self):
+        """Ask for a central folder to hold the quarantine sessions."""
+        directory = QFileDialog.getExistingDirectory(
+            self, "Select Quarantine Folder", self.mgr.quarantine_root or ""
+        )
+        if directory:
+            self.set_quarantine_root(directory)
+
+    def set_quarantine_root(self, directory):
+        """Keep quarantine sessions in *directory*, or in each folder for ``None``."""
+        self.mgr.quarantine_root = directory or None
+        if self.settings is not None:
+            self.settings.setValue(self.QUARANTINE_ROOT_SETTING, directory or "")
+
     def toggle_full_screen(self):
         if self.isFullScreen():
             self.show_normal()
@@ -594,6 +836,8 @@ class ImageViewerMainWindow(QMainWindow):
 
     def show_full_screen(self):
         self.menuBar().setVisible(False)
+        self.thumbnails_visible = self.thumbnail_dock.isVisible()
+        self.thumbnail_dock.setVisible(False)
         self.image_view.set_scroll_bars_visible(False)
         self.showFullScreen()
         self.refresh_current_file_display()
@@ -605,6 +849,7 @@ class ImageViewerMainWindow(QMainWindow):
         else:
             self.showNormal()
         self.menuBar().setVisible(True)
+        self.thumbnail_dock.setVisible(self.thumbnails_visible)
         self.image_view.set_scroll_bars_visible(True)
         self.image_view.show_file_name(None)
 
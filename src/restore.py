@@ -0,0 +1,56 @@
+"""Move the files of QViewer quarantine sessions back to where they came from.
+
+Each session's journal lists the discarded files with their original paths
+and review states. The files are moved back, and their Keep and Reject marks
+are saved again, for example::
+
+    python src/restore.py ~/Pictures/2024/.qviewer-discarded/20240517-101500
+"""
+
+import argparse
+import sys
+
+from PyQt5.QtCore import QCoreApplication
+
+from file_mgr import FileMgr
+from main import open_review_store
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sessions", nargs="+", help="Quarantine session directory")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=FileMgr.RENAME_WORKERS,
+        help="Number of files to move at once",
+    )
+    parser.add_argument(
+        "--no-review-states",
+        action="store_true",
+        help="Do not save the restored Keep and Reject marks",
+    )
+    args = parser.parse_args(argv)
+
+    review_store = None
+    if not args.no_review_states:
+        QCoreApplication.setOrganizationName("QViewer")
+        QCoreApplication.setApplicationName("QViewer")
+        review_store = open_review_store()
+
+    mgr = FileMgr(review_store, rename_workers=args.workers)
+    status = 0
+    try:
+        for session in args.sessions:
+            result = mgr.restore_discard(session)
+            print(f"{session}: restored {len(result.restored)} files")
+            for source, reason in result.failed:
+                print(f"  {source}: {reason}", file=sys.stderr)
+                status = 1
+    finally:
+        mgr.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+import os
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+
+
+class DirectoryRecord:
+    """Review states of one directory listing, stored as one byte per file.
+
+    The sorted file names are packed into a single string with an offset
+    table, and ``states`` holds a code for each name in the same order. Code
+    0 means the file has no stored state.
+    """
+
+    SEPARATOR = "\0"
+
+    def __init__(self, names):
+        self.blob = self.SEPARATOR.join(names)
+        self.offsets = array("I")
+        offset = 0
+        for name in names:
+            self.offsets.append(offset)
+            offset += len(name) + 1
+        self.offsets.append(offset)
+        self.states = bytearray(len(names))
+        self.count = 0
+
+
+    def __len__(self):
+        return len(self.states)
+
+
+    def __getitem__(self, index):
+        return self.blob[self.offsets[index] : self.offsets[index + 1] - 1]
+
+
+    def index(self, name):
+        """Return the position of *name*, or ``None`` if it is not listed."""
+        index = bisect_left(self, name)
+        if index < len(self) and self[index] == name:
+            return index
+        return None
+
+
+    def set_code(self, index, code):
+        self.count += bool(code) - bool(self.states[index])
+        self.states[index] = code
+
+
+class ReviewStates(MutableMapping):
+    """Map canonical file paths to review states with little memory per file.
+
+    Files of directories registered with ``attach_listing`` are stored in a
+    ``DirectoryRecord`` per directory, so the directory path is kept once and
+    each file costs its name plus a few bytes, whatever the path length.
+    Paths outside a registered listing fall back to a plain dictionary. Only
+    the values given to the constructor can be stored; a missing key means
+    the file has no state.
+    """
+
+    def __init__(self, values):
+        self.values_by_code = (None,) + tuple(values)
+        self.codes = {
+            value: code for code, value in enumerate(self.values_by_code) if code
+        }
+        self.records = {}
+        self.fallback = {}
+
+
+    def locate(self, path):
+        """Return the record and position holding *path*, or ``(None, None)``."""
+        directory, name = os.path.split(path)
+        record = self.records.get(directory)
+        if record is None:
+            return None, None
+
+        index = record.index(name)
+        return (record, index) if index is not None else (None, None)
+
+
+    def __getitem__(self, path):
+        record, index = self.locate(path)
+        if record is None:
+            return self.fallback[path]
+
+        code = record.states[index]
+        if not code:
+            raise KeyError(path)
+        return self.values_by_code[code]
+
+
+    def __setitem__(self, path, value):
+        code = self.codes.get(value)
+        if code is None:
+            raise ValueError(f"Unsupported review state: {value}")
+
+        record, index = self.locate(path)
+        if record is None:
+            self.fallback[path] = value
+        else:
+            record.set_code(index, code)
+
+
+    def __delitem__(self, path):
+        record, index = self.locate(path)
+        if record is None:
+            del self.fallback[path]
+        elif record.states[index]:
+            record.set_code(index, 0)
+        else:
+            raise KeyError(path)
+
+
+    def __iter__(self):
+        for directory, record in self.records.items():
+            for index, code in enumerate(record.states):
+                if code:
+                    yield os.path.join(directory, record[index])
+        yield from self.fallback
+
+
+    def __len__(self):
+        return len(self.fallback) + sum(
+            record.count for record in self.records.values()
+        )
+
+
+    def copy(self):
+        return dict(self.items())
+
+
+    def attach_listing(self, directory, names):
+        """Store states for the sorted *names* of *directory* compactly.
+
+        States already stored for the directory, in a previous record or in
+        the fallback dictionary, are carried over. Names that disappeared
+        from the listing keep their states in the fallback dictionary.
+        """
+        carried = []
+        previous = self.records.pop(directory, None)
+        if previous is not None and previous.count:
+            carried.extend(
+                (previous[index], code)
+                for index, code in enumerate(previous.states)
+                if code
+            )
+        fallback_paths = [
+            path for path in self.fallback if os.path.dirname(path) == directory
+        ]
+        for path in fallback_paths:
+            value = self.fallback.pop(path)
+            carried.append((os.path.basename(path), self.codes[value]))
+
+        record = DirectoryRecord(names)
+        for name, code in carried:
+            index = record.index(name)
+            if index is None:
+                self.fallback[os.path.join(directory, name)] = self.values_by_code[code]
+            else:
+                record.set_code(index, code)
+        self.records[directory] = record
+
+
+    def listing_values(self, directory):
+        """Return the stored value or ``None`` for each name of a listing."""
+        record = self.records.get(directory)
+        if record is None:
+            return []
+        return [self.values_by_code[code] for code in record.states]
@@ -0,0 +1,190 @@
+import os
+import sqlite3
+import threading
+import time
+
+
+class ReviewStore:
+    """Keep review states in an SQLite database between sessions.
+
+    States are stored per canonical directory and file name, and ``load``
+    reads those of one directory when it is opened. ``save`` only records the
+    change in memory; a background thread commits the pending changes in one
+    transaction at most ``WRITE_DELAY_SECONDS`` later, and retries a batch
+    that fails with a growing delay.
+    """
+
+    WRITE_DELAY_SECONDS = 0.5
+    RETRY_DELAY_SECONDS = 1
+    MAX_RETRY_DELAY_SECONDS = 60
+    CLOSE_ATTEMPTS = 3
+
+    def __init__(self, path, write_delay=None):
+        self.path = os.fspath(path)
+        self.write_delay = (
+            self.WRITE_DELAY_SECONDS if write_delay is None else write_delay
+        )
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = self.connect()
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS review_states ("
+                "directory TEXT NOT NULL, name TEXT NOT NULL, state TEXT NOT NULL, "
+                "PRIMARY KEY (directory, name)) WITHOUT ROWID"
+            )
+
+        # Changes waiting for the writer, and the batch it is writing. Both
+        # map (directory, name) to a state, or to None for a removed state.
+        self.pending = {}
+        self.writing = {}
+        self.flush_requested = False
+        self.closed = False
+        self.condition = threading.Condition()
+        self.writer = threading.Thread(
+            target=self.write_pending, name="ReviewStore", daemon=True
+        )
+        self.writer.start()
+
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        return connection
+
+
+    def load(self, directory):
+        """Return the saved state of each file name in *directory*."""
+        # Copy the unwritten changes before reading the database. A batch
+        # committed in between is then read twice, but never missed.
+        with self.condition:
+            changes = [
+                (name, state)
+                for batch in (self.writing, self.pending)
+                for (changed_directory, name), state in batch.items()
+                if changed_directory == directory
+            ]
+
+        states = dict(
+            self.connection.execute(
+                "SELECT name, state FROM review_states WHERE directory = ?",
+                (directory,),
+            )
+        )
+        for name, state in changes:
+            if state is None:
+                states.pop(name, None)
+            else:
+                states[name] = state
+        return states
+
+
+    def save(self, path, state):
+        """Schedule saving *state* for *path*, or removing it when ``None``."""
+        directory, name = os.path.split(path)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Review store is closed")
+            self.pending[(directory, name)] = state
+            self.condition.notify_all()
+
+
+    def flush(self):
+        """Wait until every saved change has been written."""
+        with self.condition:
+            self.flush_requested = True
+            self.condition.notify_all()
+            while self.pending or self.writing:
+                self.condition.wait()
+            self.flush_requested = False
+
+
+    def close(self):
+        """Write the pending changes and stop the writer thread."""
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify_all()
+        self.writer.join()
+        self.connection.close()
+
+
+    def write_pending(self):
+        """Write batches of pending changes until the store is closed."""
+        connection = self.connect()
+        failures = 0
+        try:
+            while True:
+                with self.condition:
+                    while not self.pending and not self.closed:
+                        self.condition.wait()
+                    if not self.pending:
+                        return
+
+                    # Collect further changes until the first one has waited
+                    # for the write delay, unless a flush needs them now.
+                    # After a failed write, wait for the retry delay instead;
+                    # only closing the store cuts that short.
+                    if failures:
+                        delay = min(
+                            self.RETRY_DELAY_SECONDS * 2 ** (failures - 1),
+                            self.MAX_RETRY_DELAY_SECONDS,
+                        )
+                    else:
+                        delay = self.write_delay
+                    deadline = time.monotonic() + delay
+                    while not self.closed and (failures or not self.flush_requested):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    self.writing, self.pending = self.pending, {}
+
+                written = self.write_batch(connection, self.writing)
+                with self.condition:
+                    if written:
+                        failures = 0
+                    else:
+                        # Keep the batch, under the changes saved since it
+                        # was taken, which are newer.
+                        failures += 1
+                        self.writing.update(self.pending)
+                        self.pending = self.writing
+                    self.writing = {}
+                    self.condition.notify_all()
+                    if self.closed and failures >= self.CLOSE_ATTEMPTS:
+                        print(f"Review states not saved: {len(self.pending)}")
+                        return
+        finally:
+            connection.close()
+
+
+    def write_batch(self, connection, batch):
+        """Commit *batch* and return whether it was written."""
+        saved = [
+            (directory, name, state)
+            for (directory, name), state in batch.items()
+            if state is not None
+        ]
+        removed = [
+            (directory, name)
+            for (directory, name), state in batch.items()
+            if state is None
+        ]
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO review_states VALUES (?, ?, ?)", saved
+                )
+                connection.executemany(
+                    "DELETE FROM review_states WHERE directory = ? AND name = ?",
+                    removed,
+                )
+        except sqlite3.Error as error:
+            print(f"Failed to save review states: {error}")
+            return False
+        return True
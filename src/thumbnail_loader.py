@@ -0,0 +1,111 @@
+from PyQt5.QtCore import QSize, Qt, pyqtSignal
+
+from image_cache import ImageCache, image_bytes
+from image_loader import (
+    DecodePool,
+    DecodeTask,
+    DecodedImage,
+    image_key,
+    read_image,
+)
+
+
+def read_thumbnail(image_path, size):
+    """Decode *image_path* scaled to fit a *size* by *size* square.
+
+    The returned ``DecodedImage`` keeps the file's original size, so it can
+    stand in for the full image. Its image is null on failure.
+    """
+    bound = QSize(size, size)
+    decoded = read_image(image_path, bound)
+    image = decoded.image
+    if image.width() > size or image.height() > size:
+        image = image.scaled(bound, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    return DecodedImage(image, decoded.original_size)
+
+
+class ThumbnailTask(DecodeTask):
+    """Create one thumbnail on a worker thread and report it to its loader."""
+
+    def decode(self):
+        return read_thumbnail(self.image_path, self.loader.size)
+
+
+class ThumbnailLoader(DecodePool):
+    """Create thumbnails on a private thread pool, in the order they are wanted.
+
+    Finished thumbnails are kept in a memory-bounded ``ImageCache`` keyed by
+    path, each with the ``(realpath, mtime, size)`` key of the file it was
+    made from. ``thumbnail`` returns whatever is cached for the thumbnail
+    strip, while ``placeholder`` only returns a thumbnail of the file's
+    current version, for ``ImageView`` to show while the full image decodes.
+    """
+
+    THREADS = 2
+    SIZE = 96
+    CACHE_LIMIT_MB = 64
+
+    thumbnail_ready_signal = pyqtSignal(str, name="thumbnail_ready")
+
+    def __init__(self, parent=None, size=None, cache_limit_mb=None):
+        super().__init__(self.THREADS, parent)
+
+        self.size = self.SIZE if size is None else size
+        self.cache = ImageCache(
+            self.CACHE_LIMIT_MB if cache_limit_mb is None else cache_limit_mb
+        )
+        # The file key of each path that could not be decoded.
+        self.failed = {}
+
+
+    def thumbnail(self, image_path):
+        """Return the cached thumbnail image of *image_path*, or ``None``."""
+        entry = self.cache.get(image_path)
+        return entry[1].image if entry is not None else None
+
+
+    def placeholder(self, image_path):
+        """Return a ``DecodedImage`` thumbnail of *image_path* as it is now.
+
+        ``None`` is returned when no thumbnail is cached or the file changed
+        after its thumbnail was made.
+        """
+        entry = self.cache.get(image_path)
+        if entry is None or entry[0] is None or entry[0] != image_key(image_path):
+            return None
+        return entry[1]
+
+
+    def request(self, image_paths):
+        """Create thumbnails of *image_paths* in the background, first first.
+
+        Queued thumbnails of other files are cancelled. Cached thumbnails and
+        files that could not be decoded are requested again only once the
+        file has changed.
+        """
+        self.cancel_unwanted(set(image_paths))
+        for priority, path in enumerate(reversed(image_paths)):
+            if path in self.pending or self.is_current(path):
+                continue
+            self.start(ThumbnailTask(self, path), priority)
+
+
+    def is_current(self, image_path):
+        """Return whether the cached thumbnail or failure is of the file as it is."""
+        entry = self.cache.get(image_path)
+        if entry is not None:
+            return entry[0] == image_key(image_path)
+        if image_path in self.failed:
+            return self.failed[image_path] == image_key(image_path)
+        return False
+
+
+    def decoded(self, task):
+        image = task.decoded.image
+        if image.isNull():
+            self.failed[task.image_path] = task.key
+            return
+
+        self.failed.pop(task.image_path, None)
+        self.cache.put(task.image_path, (task.key, task.decoded), image_bytes(image))
+        self.thumbnail_ready_signal.emit(task.image_path)
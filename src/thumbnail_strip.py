@@ -0,0 +1,214 @@
+import os
+
+from PyQt5.QtCore import (
+    QAbstractListModel,
+    QModelIndex,
+    QPoint,
+    QRect,
+    QSize,
+    Qt,
+    QTimer,
+    pyqtSignal,
+    pyqtSlot,
+)
+from PyQt5.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from thumbnail_loader import ThumbnailLoader
+
+
+class ThumbnailModel(QAbstractListModel):
+    """List the images of one directory for the thumbnail strip.
+
+    The rows are the names of a ``FileMgr`` listing. Views only ask for the
+    data of the rows they paint, so a row costs nothing until it is shown.
+    """
+
+    def __init__(self, loader, slot_size, parent=None):
+        super().__init__(parent)
+
+        self.loader = loader
+        self.slot_size = slot_size
+        self.directory = None
+        self.names = []
+
+
+    def set_listing(self, directory, names):
+        """Show the image *names* from *directory*."""
+        self.beginResetModel()
+        self.directory = directory
+        self.names = names
+        self.endResetModel()
+
+
+    def path(self, row):
+        return os.path.join(self.directory, self.names[row])
+
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DecorationRole:
+            return self.loader.thumbnail(self.path(index.row()))
+        if role == Qt.ToolTipRole:
+            return self.names[index.row()]
+        if role == Qt.SizeHintRole:
+            return self.slot_size
+        return None
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paint a thumbnail centred in its slot over the selection highlight."""
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        image = index.data(Qt.DecorationRole)
+        if image is None:
+            return
+        target = QRect(QPoint(0, 0), image.size())
+        target.moveCenter(option.rect.center())
+        painter.drawImage(target, image)
+
+
+    def sizeHint(self, option, index):
+        return index.data(Qt.SizeHintRole)
+
+
+class ThumbnailStrip(QListView):
+    """Show the images of the current directory as a horizontal filmstrip.
+
+    Every slot has the same size, so only the visible slots are painted.
+    Thumbnails are requested for the current image first, then for the slots
+    nearest to it, and a hidden strip requests nothing. Clicking a thumbnail
+    emits ``file_selected`` with its row.
+    """
+
+    SLOT_PADDING = 8
+    REQUEST_MARGIN = 1
+    REQUEST_DELAY_MS = 16
+
+    file_selected_signal = pyqtSignal(int, name="file_selected")
+
+    def __init__(self, parent=None, thumbnail_size=None):
+        super().__init__(parent)
+
+        self.loader = ThumbnailLoader(self, thumbnail_size)
+        slot = self.loader.size + self.SLOT_PADDING
+        self.thumbnail_model = ThumbnailModel(self.loader, QSize(slot, slot), self)
+        self.current_row = None
+
+        self.setModel(self.thumbnail_model)
+        self.setItemDelegate(ThumbnailDelegate(self))
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(False)
+        self.setUniformItemSizes(True)
+        self.setHorizontalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        # Navigation keys belong to the main window's shortcuts.
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setFixedHeight(
+            slot
+            + self.horizontalScrollBar().sizeHint().height()
+            + 2 * self.frameWidth()
+        )
+
+        self.request_timer = QTimer(self)
+        self.request_timer.setSingleShot(True)
+        self.request_timer.setInterval(self.REQUEST_DELAY_MS)
+        self.request_timer.timeout.connect(self.request_thumbnails)
+        self.loader.thumbnail_ready_signal.connect(self.thumbnail_ready)
+        self.horizontalScrollBar().valueChanged.connect(self.schedule_requests)
+        self.clicked.connect(self.thumbnail_clicked)
+
+
+    def show_listing(self, directory, names, current_row):
+        """Show a ``FileMgr`` listing and centre the slot of *current_row*.
+
+        The model is only reset when *names* is a different listing, so
+        navigating within a directory just moves the selection.
+        """
+        model = self.thumbnail_model
+        if names is not model.names or directory != model.directory:
+            model.set_listing(directory, names)
+
+        self.current_row = current_row
+        if current_row is None:
+            self.clearSelection()
+        else:
+            index = model.index(current_row)
+            self.setCurrentIndex(index)
+            self.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        self.schedule_requests()
+
+
+    def visible_rows(self):
+        """Return the range of rows whose slots are in the viewport."""
+        count = self.thumbnail_model.rowCount()
+        if not count:
+            return range(0)
+
+        middle = self.viewport().height() // 2
+        first = self.indexAt(QPoint(0, middle))
+        last = self.indexAt(QPoint(self.viewport().width() - 1, middle))
+        first_row = first.row() if first.isValid() else 0
+        last_row = last.row() if last.isValid() else count - 1
+        return range(first_row, last_row + 1)
+
+
+    def schedule_requests(self):
+        if not self.request_timer.isActive():
+            self.request_timer.start()
+
+
+    @pyqtSlot()
+    def request_thumbnails(self):
+        """Ask for the thumbnails around the viewport, nearest first."""
+        rows = self.visible_rows()
+        if not self.isVisible() or not rows:
+            return
+
+        margin = len(rows) * self.REQUEST_MARGIN
+        nearby = range(
+            max(0, rows.start - margin),
+            min(self.thumbnail_model.rowCount(), rows.stop + margin),
+        )
+        center = rows.start if self.current_row is None else self.current_row
+        order = sorted(nearby, key=lambda row: (row not in rows, abs(row - center)))
+        if self.current_row is not None and self.current_row not in nearby:
+            order.insert(0, self.current_row)
+        self.loader.request([self.thumbnail_model.path(row) for row in order])
+
+
+    def shutdown(self):
+        """Stop requesting thumbnails and wait for running ones to finish."""
+        self.request_timer.stop()
+        self.loader.shutdown()
+
+
+    @pyqtSlot(str)
+    def thumbnail_ready(self, image_path):
+        # Updates are coalesced, so a burst of thumbnails paints once.
+        self.viewport().update()
+
+
+    @pyqtSlot(QModelIndex)
+    def thumbnail_clicked(self, index):
+        self.file_selected_signal.emit(index.row())
+
+
+    # Events
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_requests()
+
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.schedule_requests()
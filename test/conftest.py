@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import QApplication
 from main import ImageViewerMainWindow
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def app():
     return QApplication.instance() or QApplication([])
 
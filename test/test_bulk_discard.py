@@ -0,0 +1,171 @@
+import os
+import threading
+
+import pytest
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtTest import QSignalSpy
+from PyQt5.QtWidgets import QAction, QMessageBox, QProgressDialog
+
+from bulk_discard import BulkDiscard
+from file_mgr import REJECT, FileMgr
+
+
+@pytest.fixture
+def images(tmpdir):
+    paths = [tmpdir.join(name) for name in ("a.jpg", "b.jpg", "c.jpg")]
+    for path in paths:
+        path.write("")
+    return paths
+
+
+@pytest.fixture
+def mgr(images):
+    file_mgr = FileMgr()
+    file_mgr.load_file(str(images[0]))
+    return file_mgr
+
+
+def test_bulk_discard_moves_files_on_worker_thread(app, mgr, images, monkeypatch):
+    threads = []
+    real_execute = mgr.execute_discard
+
+    def recording_execute(*args):
+        threads.append(threading.current_thread())
+        return real_execute(*args)
+
+    monkeypatch.setattr(mgr, "execute_discard", recording_execute)
+    discard = BulkDiscard(mgr)
+    finished = QSignalSpy(discard.finished_signal)
+
+    assert discard.start([str(images[0]), str(images[1])])
+    assert finished.wait(5000)
+    discard.wait_for_done()
+
+    result = finished[0][0]
+    assert threads and threads[0] is not threading.main_thread()
+    assert result.moved == [os.path.realpath(str(image)) for image in images[:2]]
+    assert mgr.directory_files == ["c.jpg"]
+    assert mgr.current_file() == images[2]
+
+
+def test_bulk_discard_reports_progress(app, mgr, images):
+    discard = BulkDiscard(mgr)
+    progress = QSignalSpy(discard.progress_signal)
+    finished = QSignalSpy(discard.finished_signal)
+
+    discard.start([str(image) for image in images])
+    assert finished.wait(5000)
+    discard.wait_for_done()
+
+    assert [tuple(args) for args in progress] == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_cancelled_bulk_discard_keeps_unattempted_files(app, mgr, images):
+    discard = BulkDiscard(mgr)
+    discard.progress_signal.connect(discard.cancel, Qt.DirectConnection)
+    finished = QSignalSpy(discard.finished_signal)
+
+    discard.start([str(image) for image in images])
+    assert finished.wait(5000)
+    discard.wait_for_done()
+
+    result = finished[0][0]
+    assert result.cancelled
+    assert result.moved == [os.path.realpath(str(images[0]))]
+    assert images[1].exists() and images[2].exists()
+    assert mgr.directory_files == ["b.jpg", "c.jpg"]
+
+
+def test_unexpected_worker_error_fails_remaining_files(app, mgr, images, monkeypatch):
+    def fail(*args):
+        raise ValueError("unexpected")
+
+    monkeypatch.setattr(mgr, "execute_discard", fail)
+    discard = BulkDiscard(mgr)
+    finished = QSignalSpy(discard.finished)
+
+    assert discard.start([str(image) for image in images])
+    assert finished.wait(5000)
+    discard.wait_for_done()
+
+    result = finished[0][0]
+    assert result.moved == []
+    assert result.failed == [(str(image), "unexpected") for image in images]
+    assert all(image.exists() for image in images)
+
+
+def test_bulk_discard_without_work_does_not_start(app, tmpdir):
+    discard = BulkDiscard(FileMgr())
+
+    assert not discard.start([str(tmpdir.join("a.jpg"))])
+
+
+def cancel_after_first_move(start):
+    def cancelling_start(discard, file_paths):
+        discard.progress_signal.connect(discard.cancel, Qt.DirectConnection)
+        return start(discard, file_paths)
+
+    return cancelling_start
+
+
+def test_cancelled_window_discard_reports_moved_files(window, images, monkeypatch):
+    # Serial renames, so that no other move is under way when it cancels.
+    window.mgr.rename_workers = 1
+    for image in images:
+        window.mgr.load_file(str(image))
+        window.mgr.set_current_review_state(REJECT)
+    monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: True)
+    monkeypatch.setattr(
+        BulkDiscard, "start", cancel_after_first_move(BulkDiscard.start)
+    )
+    information = []
+    monkeypatch.setattr(
+        QMessageBox, "information", lambda *args: information.append(args)
+    )
+
+    result = window.discard_rejected()
+
+    assert result.cancelled
+    assert len(result.moved) == 1
+    assert information[0][1] == "Discard Rejected - Cancelled"
+    assert "Cancelled after moving 1 file." in information[0][2]
+    assert window.mgr.directory_files == ["b.jpg", "c.jpg"]
+
+
+def test_window_blocks_input_while_discarding(window, images, monkeypatch):
+    window.mgr.load_file(str(images[2]))
+    window.mgr.set_current_review_state(REJECT)
+    window.mgr.load_file(str(images[0]))
+    monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: True)
+    monkeypatch.setattr(QMessageBox, "information", lambda *args: None)
+    moving = threading.Event()
+    checked = threading.Event()
+    real_execute = window.mgr.execute_discard
+
+    def execute_after_check(*args):
+        moving.set()
+        assert checked.wait(5)
+        return real_execute(*args)
+
+    monkeypatch.setattr(window.mgr, "execute_discard", execute_after_check)
+    during = {}
+
+    def inspect_window_while_moving():
+        assert moving.wait(5)
+        during["dialog"] = window.findChild(QProgressDialog).isVisible()
+        during["enabled"] = [
+            action.text()
+            for action in window.findChildren(QAction)
+            if action.isEnabled()
+        ]
+        checked.set()
+
+    QTimer.singleShot(0, inspect_window_while_moving)
+    window.discard_rejected()
+
+    # Disabled actions ignore their shortcuts, and the shown window-modal
+    # dialog takes the mouse input.
+    assert during == {"dialog": True, "enabled": []}
+    assert window.mgr.directory_files == ["a.jpg", "b.jpg"]
+    assert window.mgr.current_file() == str(images[0])
+    assert all(action.isEnabled() for action in window.findChildren(QAction))
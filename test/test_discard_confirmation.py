@@ -2,11 +2,12 @@ import os
 from unittest.mock import Mock
 
 import pytest
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QSettings, Qt
 from PyQt5.QtTest import QTest
-from PyQt5.QtWidgets import QMessageBox
+from PyQt5.QtWidgets import QFileDialog, QMessageBox
 
 from file_mgr import DISCARD_DIRECTORY_NAME, DiscardResult, KEEP, REJECT
+from main import ImageViewerMainWindow
 
 
 @pytest.fixture(autouse=True)
@@ -35,7 +36,7 @@ def test_discard_rejected_cancel_does_not_move_or_create_directory(
     window, paths = reviewed_window
     monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: False)
     move = []
-    monkeypatch.setattr(window.mgr, "move_to_discard_directory", move.append)
+    monkeypatch.setattr(window.mgr, "prepare_discard", move.append)
 
     result = window.discard_rejected()
 
@@ -239,8 +240,8 @@ def test_bulk_discard_reports_move_failures(reviewed_window, monkeypatch):
     monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: True)
     monkeypatch.setattr(
         window.mgr,
-        "move_to_discard_directory",
-        lambda candidates: DiscardResult(failed=[failure]),
+        "execute_discard",
+        lambda plan, *args: DiscardResult(failed=[failure]),
     )
     warnings = []
     monkeypatch.setattr(QMessageBox, "warning", lambda *args: warnings.append(args))
@@ -268,7 +269,7 @@ def test_partial_discard_reports_successful_moves_and_refreshes_display(
     window.mgr.load_file(str(paths[1]))
     monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: True)
     monkeypatch.setattr(window.mgr, "current_rejected_files", lambda: [moved, failed])
-    monkeypatch.setattr(window.mgr, "move_to_discard_directory", lambda _: result)
+    monkeypatch.setattr(window.mgr, "execute_discard", lambda plan, *args: result)
     load_image = Mock(wraps=window.load_image)
     monkeypatch.setattr(window, "load_image", load_image)
     warnings = []
@@ -317,3 +318,84 @@ def test_zero_candidates_reports_nothing_without_confirmation(
     assert confirmations == []
     assert information and information[0][2] == "There is nothing to discard."
     assert not tmpdir.join(DISCARD_DIRECTORY_NAME).exists()
+
+
+@pytest.fixture
+def quarantine_root(reviewed_window, tmpdir, monkeypatch):
+    """Give the window its own settings file and choose a quarantine folder."""
+    window, _ = reviewed_window
+    window.settings = QSettings(str(tmpdir.join("settings.ini")), QSettings.IniFormat)
+    root = str(tmpdir.mkdir("quarantine"))
+    monkeypatch.setattr(QFileDialog, "getExistingDirectory", lambda *args: root)
+    window.choose_quarantine_root()
+    return root
+
+
+def test_chosen_quarantine_folder_is_saved(app, reviewed_window, quarantine_root):
+    window, _ = reviewed_window
+
+    assert window.settings.value(window.QUARANTINE_ROOT_SETTING) == quarantine_root
+
+
+def test_discard_confirmation_names_quarantine_folder(
+    app, reviewed_window, quarantine_root, monkeypatch
+):
+    window, _ = reviewed_window
+    messages = []
+    monkeypatch.setattr(
+        window, "confirm_bulk_discard", lambda *args: messages.append(args) or True
+    )
+
+    window.discard_rejected()
+
+    assert messages[0][-1] == quarantine_root + os.sep
+
+
+def test_discard_creates_session_in_quarantine_folder(
+    app, reviewed_window, quarantine_root, monkeypatch
+):
+    window, _ = reviewed_window
+    monkeypatch.setattr(window, "confirm_bulk_discard", lambda *args: True)
+
+    result = window.discard_rejected()
+
+    assert os.path.dirname(result.destination) == quarantine_root
+
+
+def test_new_window_uses_saved_quarantine_folder(app, reviewed_window, quarantine_root):
+    window, _ = reviewed_window
+
+    restored = ImageViewerMainWindow(settings=window.settings)
+
+    assert restored.mgr.quarantine_root == quarantine_root
+    restored.close()
+
+
+def test_resetting_quarantine_folder_clears_setting(
+    app, reviewed_window, quarantine_root
+):
+    window, _ = reviewed_window
+
+    window.set_quarantine_root(None)
+
+    assert window.settings.value(window.QUARANTINE_ROOT_SETTING) == ""
+    assert window.mgr.quarantine_root is None
+
+
+def test_rename_workers_are_read_from_settings(app, tmpdir):
+    settings = QSettings(str(tmpdir.join("settings.ini")), QSettings.IniFormat)
+    settings.setValue(ImageViewerMainWindow.RENAME_WORKERS_SETTING, 8)
+
+    window = ImageViewerMainWindow(settings=settings)
+
+    assert window.mgr.rename_workers == 8
+    window.close()
+
+
+def test_window_renames_in_parallel_by_default(app, tmpdir):
+    settings = QSettings(str(tmpdir.join("settings.ini")), QSettings.IniFormat)
+
+    window = ImageViewerMainWindow(settings=settings)
+
+    assert window.mgr.rename_workers == ImageViewerMainWindow.RENAME_WORKERS > 1
+    window.close()
@@ -6,6 +6,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtTest import QTest
 from PyQt5.QtWidgets import QMessageBox
 
+from discard_journal import JOURNAL_FILE_NAME
 from file_mgr import DISCARD_DIRECTORY_NAME, KEEP, REJECT, UNDECIDED
 
 
@@ -74,8 +75,11 @@ def assert_quarantine_contains_only(result, expected_paths):
     destination = Path(result.destination)
     assert destination.parent.name == DISCARD_DIRECTORY_NAME
 
-    quarantined_names = sorted(path.name for path in destination.iterdir())
+    quarantined_names = sorted(
+        path.name for path in destination.iterdir() if path.name != JOURNAL_FILE_NAME
+    )
     assert quarantined_names == sorted(path.name for path in expected_paths)
+    assert (destination / JOURNAL_FILE_NAME).is_file()
     for source in expected_paths:
         quarantined = destination / source.name
         expected_contents = f"{source.stem.split('-', 1)[1].lower()}-image".encode()
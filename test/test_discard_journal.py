@@ -0,0 +1,259 @@
+import json
+import os
+import threading
+
+import pytest
+from PyQt5.QtWidgets import QMessageBox
+
+import file_mgr
+import restore
+from discard_journal import JOURNAL_FILE_NAME, DiscardJournal
+from file_mgr import KEEP, REJECT, UNDECIDED, FileMgr
+
+
+def read_journal(session):
+    with open(os.path.join(session, JOURNAL_FILE_NAME), encoding="utf-8") as journal:
+        return [json.loads(line) for line in journal]
+
+
+@pytest.fixture
+def photos(tmpdir):
+    for index, name in enumerate(("a.jpg", "b.jpg", "c.jpg", "d.jpg")):
+        tmpdir.join(name).write("x" * index)
+    return tmpdir
+
+
+@pytest.fixture
+def mgr(photos):
+    file_mgr = FileMgr()
+    file_mgr.load_directory(photos)
+    file_mgr.set_current_review_state(REJECT)
+    file_mgr.next()
+    file_mgr.set_current_review_state(KEEP)
+    return file_mgr
+
+
+def forbid_rescan(mgr, monkeypatch):
+    def fail(directory):
+        raise AssertionError(f"Unexpected rescan of {directory}")
+
+    monkeypatch.setattr(mgr, "scan_dir", fail)
+
+
+def test_discard_journal_records_moves(mgr, photos):
+    sources = [photos.join("b.jpg"), photos.join("c.jpg")]
+
+    result = mgr.move_to_discard_directory(sources)
+
+    records = read_journal(result.destination)
+    assert [record["op"] for record in records] == ["move", "move"]
+    assert [record["source"] for record in records] == result.moved
+    assert records[0]["destination"] == os.path.join(result.destination, "b.jpg")
+    assert [record["size"] for record in records] == [1, 2]
+    assert records[1]["mtime_ns"] == os.stat(records[1]["destination"]).st_mtime_ns
+    assert [record["state"] for record in records] == [KEEP, UNDECIDED]
+    assert mgr.last_discard_session == result.destination
+
+
+def test_discard_journal_is_synced_before_files_move(mgr, photos, monkeypatch):
+    journalled = []
+    real_move = file_mgr.move_file
+
+    def move_after_reading_journal(source, destination):
+        journalled.append(
+            [record["source"] for record in read_journal(os.path.dirname(destination))]
+        )
+        real_move(source, destination)
+
+    monkeypatch.setattr(file_mgr, "move_file", move_after_reading_journal)
+
+    result = mgr.move_to_discard_directory([photos.join("b.jpg"), photos.join("c.jpg")])
+
+    assert journalled == [result.moved, result.moved]
+
+
+def test_failed_moves_are_withdrawn_from_journal(mgr, photos, monkeypatch):
+    real_move = file_mgr.move_file
+
+    def fail_on_c(source, destination):
+        if source.endswith("c.jpg"):
+            raise OSError("simulated failure")
+        real_move(source, destination)
+
+    monkeypatch.setattr(file_mgr, "move_file", fail_on_c)
+
+    result = mgr.move_to_discard_directory([photos.join("b.jpg"), photos.join("c.jpg")])
+
+    pending = DiscardJournal(result.destination).pending_moves()
+    assert [record["source"] for record in pending] == result.moved
+
+
+def test_nothing_moves_when_journal_cannot_be_written(mgr, photos, monkeypatch):
+    monkeypatch.setattr(
+        DiscardJournal, "flush", lambda self, sync=False: OSError("disk full")
+    )
+
+    result = mgr.move_to_discard_directory([photos.join("b.jpg")])
+
+    assert result.moved == []
+    assert result.failed == [(os.path.realpath(photos.join("b.jpg")), "disk full")]
+    assert photos.join("b.jpg").exists()
+
+
+def test_journal_ignores_restored_files_and_torn_lines(tmpdir):
+    journal = DiscardJournal(str(tmpdir))
+    stat = os.stat(str(tmpdir))
+    journal.record_move("/photos/a.jpg", str(tmpdir.join("a.jpg")), stat, KEEP)
+    journal.record_move("/photos/b.jpg", str(tmpdir.join("b.jpg")), stat, REJECT)
+    journal.record_restore("/photos/a.jpg")
+    journal.close()
+    tmpdir.join(JOURNAL_FILE_NAME).write('{"op": "mo', mode="a")
+
+    records = journal.pending_moves()
+
+    assert [record["source"] for record in records] == ["/photos/b.jpg"]
+
+
+def test_restore_puts_files_and_states_back_without_rescan(mgr, photos, monkeypatch):
+    result = mgr.move_to_discard_directory(
+        [photos.join("a.jpg"), photos.join("b.jpg")]
+    )
+    forbid_rescan(mgr, monkeypatch)
+
+    restored = mgr.restore_discard(result.destination)
+
+    assert restored.restored == result.moved
+    assert restored.failed == []
+    assert mgr.directory_files == ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+    assert mgr.directory_states == [REJECT, KEEP, UNDECIDED, UNDECIDED]
+    assert mgr.current_file() == photos.join("a.jpg")
+    assert photos.join("b.jpg").read() == "x"
+    assert not os.path.exists(result.destination)
+    assert mgr.last_discard_session is None
+
+
+def test_restore_settles_files_journalled_but_never_moved(mgr, photos):
+    result = mgr.move_to_discard_directory([photos.join("b.jpg")])
+    # A crash after journalling c.jpg, before it was moved.
+    journal = DiscardJournal(result.destination)
+    source = os.path.realpath(photos.join("c.jpg"))
+    journal.record_move(
+        source, os.path.join(result.destination, "c.jpg"), os.stat(source), UNDECIDED
+    )
+    journal.close()
+
+    restored = mgr.restore_discard(result.destination)
+
+    assert restored.restored == result.moved
+    assert restored.failed == []
+    assert photos.join("c.jpg").read() == "xx"
+    assert not os.path.exists(result.destination)
+
+
+def test_cancelled_restore_leaves_remaining_files_in_session(mgr, photos):
+    discarded = mgr.move_to_discard_directory(
+        [photos.join("a.jpg"), photos.join("b.jpg")]
+    )
+    plan = mgr.prepare_restore(discarded.destination)
+    progress = []
+
+    result = mgr.execute_restore(
+        plan, lambda *args: progress.append(args), lambda: bool(progress)
+    )
+    mgr.finish_restore(plan, result)
+
+    assert result.cancelled
+    assert not result.complete
+    assert result.restored == discarded.moved[:1]
+    assert [record["source"] for record in DiscardJournal(
+        discarded.destination
+    ).pending_moves()] == discarded.moved[1:]
+    assert mgr.directory_files == ["a.jpg", "c.jpg", "d.jpg"]
+    assert mgr.last_discard_session == discarded.destination
+
+
+def test_restore_keeps_files_whose_original_path_is_taken(mgr, photos):
+    result = mgr.move_to_discard_directory(
+        [photos.join("a.jpg"), photos.join("b.jpg")]
+    )
+    photos.join("a.jpg").write("new")
+
+    restored = mgr.restore_discard(result.destination)
+
+    assert restored.restored == [os.path.realpath(photos.join("b.jpg"))]
+    assert restored.failed == [
+        (os.path.realpath(photos.join("a.jpg")), "Original path already exists")
+    ]
+    assert photos.join("a.jpg").read() == "new"
+    assert os.path.isfile(os.path.join(result.destination, "a.jpg"))
+    assert [record["source"] for record in DiscardJournal(
+        result.destination
+    ).pending_moves()] == [os.path.realpath(photos.join("a.jpg"))]
+
+
+def test_restore_of_other_directory_leaves_listing_alone(mgr, photos, tmpdir):
+    result = mgr.move_to_discard_directory([photos.join("a.jpg")])
+    other = tmpdir.mkdir("other")
+    other.join("z.jpg").write("")
+    mgr.load_directory(other)
+
+    restored = mgr.restore_discard(result.destination)
+
+    assert restored.restored == [os.path.realpath(photos.join("a.jpg"))]
+    assert mgr.directory_files == ["z.jpg"]
+    assert mgr.get_review_state(str(photos.join("a.jpg"))) == REJECT
+
+
+def test_undo_last_discard_restores_current_image(window, photos, monkeypatch):
+    window.mgr.load_file(str(photos.join("b.jpg")))
+    monkeypatch.setattr(window, "confirm_current_file_action", lambda *args: True)
+    window.discard_current()
+
+    result = window.undo_last_discard()
+
+    assert result.restored == [os.path.realpath(photos.join("b.jpg"))]
+    assert window.mgr.current_file() == photos.join("b.jpg")
+    assert window.windowTitle().startswith(str(photos.join("b.jpg")))
+
+
+def test_undo_restores_on_worker_thread(window, photos, monkeypatch):
+    window.mgr.load_file(str(photos.join("b.jpg")))
+    monkeypatch.setattr(window, "confirm_current_file_action", lambda *args: True)
+    window.discard_current()
+    threads = []
+    real_execute = window.mgr.execute_restore
+
+    def record_thread(*args):
+        threads.append(threading.current_thread())
+        return real_execute(*args)
+
+    monkeypatch.setattr(window.mgr, "execute_restore", record_thread)
+
+    result = window.undo_last_discard()
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert result.restored == [os.path.realpath(photos.join("b.jpg"))]
+    assert window.mgr.last_discard_session is None
+
+
+def test_undo_without_discard_reports_nothing_to_undo(window, monkeypatch):
+    information = []
+    monkeypatch.setattr(
+        QMessageBox, "information", lambda *args: information.append(args)
+    )
+
+    assert window.undo_last_discard() is None
+    assert information[0][2] == "There is no discard to undo."
+
+
+def test_command_line_restore_replays_sessions(mgr, photos, capsys):
+    first = mgr.move_to_discard_directory([photos.join("a.jpg")])
+    second = mgr.move_to_discard_directory([photos.join("c.jpg")])
+
+    status = restore.main(
+        ["--no-review-states", first.destination, second.destination]
+    )
+
+    assert status == 0
+    assert photos.join("a.jpg").isfile() and photos.join("c.jpg").isfile()
+    assert "restored 1 files" in capsys.readouterr().out
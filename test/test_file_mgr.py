@@ -1,5 +1,9 @@
+import errno
 import os
+import threading
+import time
 from datetime import datetime
+from unittest.mock import Mock
 
 import pytest
 import file_mgr
@@ -125,6 +129,36 @@ def test_directory_manages_only_supported_direct_child_images(mgr, tmpdir):
     assert mgr.current_file_position() == (1, 3)
 
 
+def test_listing_does_not_stat_each_entry(mgr, testdir, monkeypatch):
+    def fail(path):
+        raise AssertionError(f"Unexpected per-entry check of {path}")
+
+    monkeypatch.setattr(file_mgr.os.path, "isdir", fail)
+    monkeypatch.setattr(file_mgr.os.path, "isfile", fail)
+
+    files, subdirs = mgr.list_dir(str(testdir))
+
+    assert files == ["test1.jpg", "test2.jpg", "test3.jpg"]
+    assert subdirs == ["Sub1", "Sub2Empty", "Sub3"]
+
+
+def test_file_stat_reports_size_and_mtime_of_listed_images(mgr, tmpdir):
+    image = tmpdir.join("photo.jpg")
+    image.write("12345")
+
+    mgr.load_directory(tmpdir)
+    stat = mgr.file_stat("photo.jpg")
+
+    assert stat.st_size == 5
+    assert stat.st_mtime_ns == os.stat(str(image)).st_mtime_ns
+
+
+def test_file_stat_is_none_for_unlisted_name(mgr, testdir):
+    mgr.load_directory(testdir)
+
+    assert mgr.file_stat("missing.jpg") is None
+
+
 @pytest.mark.parametrize(
     "name",
     ("photo.jpg", "photo.JPG", "photo.jpeg", "photo.JPEG", "photo.png", "photo.PNG"),
@@ -241,6 +275,67 @@ def test_keep_navigation_fails_on_empty_dir(mgr, testdir, direction):
     assert mgr.current_file() is None
 
 
+@pytest.fixture
+def reviewed_dir(mgr, tmpdir):
+    states = (KEEP, REJECT, UNDECIDED, REJECT, KEEP, UNDECIDED)
+    for index, state in enumerate(states):
+        tmpdir.join(f"{index}.jpg").write("")
+        mgr.load_file(tmpdir.join(f"{index}.jpg"))
+        mgr.set_current_review_state(state)
+    yield tmpdir
+
+
+@pytest.mark.parametrize(
+    ("start", "method_name", "state", "expected"),
+    (
+        ("0.jpg", "next_with_state", REJECT, "1.jpg"),
+        ("1.jpg", "next_with_state", REJECT, "3.jpg"),
+        ("5.jpg", "prev_with_state", REJECT, "3.jpg"),
+        ("0.jpg", "next_with_state", UNDECIDED, "2.jpg"),
+        ("5.jpg", "prev_with_state", UNDECIDED, "2.jpg"),
+        ("5.jpg", "prev_with_state", KEEP, "4.jpg"),
+    ),
+)
+def test_state_navigation_selects_nearest_file_with_state(
+    mgr, reviewed_dir, start, method_name, state, expected
+):
+    mgr.load_file(reviewed_dir.join(start))
+
+    assert getattr(mgr, method_name)(state)
+    assert mgr.current_file() == reviewed_dir.join(expected)
+
+
+def test_state_navigation_does_not_look_up_each_file(mgr, reviewed_dir, monkeypatch):
+    mgr.load_file(reviewed_dir.join("0.jpg"))
+
+    def fail(fname):
+        raise AssertionError(f"Unexpected state lookup for {fname}")
+
+    monkeypatch.setattr(mgr, "get_review_state", fail)
+
+    assert mgr.next_keep()
+    assert not mgr.next_keep()
+    assert mgr.prev_with_state(REJECT)
+    assert mgr.current_file() == reviewed_dir.join("3.jpg")
+
+
+def test_state_navigation_follows_state_changes(mgr, reviewed_dir):
+    mgr.load_file(reviewed_dir.join("3.jpg"))
+    mgr.set_current_review_state(KEEP)
+    mgr.first()
+
+    assert mgr.next_keep()
+    assert mgr.current_file() == reviewed_dir.join("3.jpg")
+
+
+def test_state_navigation_follows_removed_files(mgr, reviewed_dir):
+    mgr.load_file(reviewed_dir.join("0.jpg"))
+    mgr.move_to_discard_directory([reviewed_dir.join("1.jpg")])
+
+    assert mgr.next_with_state(REJECT)
+    assert mgr.current_file() == reviewed_dir.join("3.jpg")
+
+
 def test_first(mgr, testdir):
     mgr.load_file(testdir.join("test2.jpg"))
     assert mgr.first()
@@ -315,6 +410,33 @@ def test_prev_dir2(mgr, testdir):
     assert mgr.current_file() == testdir.join("Sub1").join("test4.jpg")
 
 
+def test_directory_navigation_reuses_cached_parent_listing(mgr, testdir, monkeypatch):
+    mgr.load_directory(testdir.join("Sub1"))
+    mgr.next_dir()
+    listed = []
+    real_scan_dir = mgr.scan_dir
+    monkeypatch.setattr(
+        mgr, "scan_dir", lambda path: listed.append(path) or real_scan_dir(path)
+    )
+
+    assert mgr.next_dir() == True
+    assert mgr.prev_dir() == True
+
+    assert str(testdir) not in listed
+    assert mgr.current_directory() == testdir.join("Sub2Empty")
+
+
+def test_directory_navigation_sees_new_sibling_after_parent_changes(mgr, testdir):
+    mgr.load_directory(testdir.join("Sub3"))
+    mgr.prev_dir()
+    mgr.next_dir()
+    testdir.mkdir("Sub4")
+
+    assert mgr.next_dir() == True
+
+    assert mgr.current_directory() == testdir.join("Sub4")
+
+
 @pytest.mark.parametrize("direction", ("prev_dir", "next_dir"))
 def test_directory_navigation_without_loaded_path_is_safe(mgr, direction):
     assert not getattr(mgr, direction)()
@@ -377,6 +499,79 @@ def test_review_state_is_keyed_by_full_path(mgr, tmpdir):
     assert mgr.get_review_state(second) == REJECT
 
 
+def test_review_state_lookups_do_not_resolve_each_file(mgr, testdir, monkeypatch):
+    mgr.load_file(testdir.join("test2.jpg"))
+
+    def fail(path):
+        raise AssertionError(f"Unexpected resolution of {path}")
+
+    monkeypatch.setattr(file_mgr.os.path, "realpath", fail)
+
+    mgr.set_current_review_state(REJECT)
+    assert mgr.get_current_review_state() == REJECT
+    assert mgr.get_review_state(str(testdir.join("test1.jpg"))) == UNDECIDED
+    assert mgr.current_rejected_files() == [mgr.current_file()]
+    assert mgr.current_review_counts() == {UNDECIDED: 2, KEEP: 0, REJECT: 1}
+
+
+def test_current_directory_lookups_do_not_search_records(mgr, testdir, monkeypatch):
+    mgr.load_file(testdir.join("test2.jpg"))
+    mgr.set_current_review_state(KEEP)
+
+    def fail(path):
+        raise AssertionError(f"Unexpected search for {path}")
+
+    monkeypatch.setattr(mgr.review_states, "locate", fail)
+
+    assert mgr.get_current_review_state() == KEEP
+    assert mgr.get_review_state(testdir.join("test1.jpg")) == UNDECIDED
+
+
+def test_symlinked_image_is_reviewed_as_the_link(mgr, tmpdir):
+    target = tmpdir.join("target.jpg")
+    target.write("")
+    link = tmpdir.join("link.jpg")
+    link.mksymlinkto(target)
+    mgr.load_directory(tmpdir)
+
+    mgr.set_current_review_state(KEEP)
+
+    assert mgr.current_file() == link
+    assert mgr.get_review_state(link) == KEEP
+    assert mgr.get_review_state(target) == UNDECIDED
+
+
+def test_opening_symlinked_image_stays_in_link_directory(mgr, tmpdir):
+    target_dir = tmpdir.mkdir("b")
+    target = target_dir.join("target.jpg")
+    target.write("")
+    link_dir = tmpdir.mkdir("a")
+    link = link_dir.join("link.jpg")
+    link.mksymlinkto(target)
+    mgr.load_file(link)
+    mgr.set_current_review_state(KEEP)
+
+    mgr.load_file(link)
+
+    assert mgr.directory == str(link_dir)
+    assert mgr.current_file() == link
+    assert mgr.get_current_review_state() == KEEP
+
+
+def test_discarding_symlinked_image_moves_the_link(mgr, tmpdir):
+    target = tmpdir.join("target.jpg")
+    target.write("")
+    link = tmpdir.join("link.jpg")
+    link.mksymlinkto(target)
+    mgr.load_directory(tmpdir)
+
+    result = mgr.move_to_discard_directory([link])
+
+    assert result.moved == [str(link)]
+    assert target.isfile()
+    assert mgr.directory_files == ["target.jpg"]
+
+
 def test_navigation_does_not_transfer_review_state(mgr, testdir):
     mgr.load_file(testdir.join("test1.jpg"))
     mgr.set_current_review_state(KEEP)
@@ -466,6 +661,42 @@ def test_current_review_queries_are_empty_for_empty_directory(mgr, tmpdir):
     assert mgr.current_review_counts() == {UNDECIDED: 0, KEEP: 0, REJECT: 0}
 
 
+def forbid_recount(mgr, monkeypatch):
+    def fail():
+        raise AssertionError("Unexpected recount of the directory")
+
+    monkeypatch.setattr(mgr, "read_review_states", fail)
+
+
+def test_review_counts_follow_state_changes_without_recount(mgr, testdir, monkeypatch):
+    mgr.load_directory(testdir)
+    forbid_recount(mgr, monkeypatch)
+
+    mgr.set_current_review_state(KEEP)
+    mgr.next()
+    mgr.set_current_review_state(REJECT)
+    mgr.set_current_review_state(KEEP)
+    mgr.next()
+    mgr.toggle_reject()
+
+    assert mgr.current_review_counts() == {UNDECIDED: 0, KEEP: 2, REJECT: 1}
+
+
+def test_review_counts_drop_discarded_and_deleted_files(mgr, tmpdir, monkeypatch):
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_directory(tmpdir)
+    mgr.set_current_review_state(REJECT)
+    mgr.next()
+    mgr.set_current_review_state(KEEP)
+    forbid_recount(mgr, monkeypatch)
+
+    mgr.move_to_discard_directory([tmpdir.join("a.jpg")])
+    mgr.delete_current_file()
+
+    assert mgr.current_review_counts() == {UNDECIDED: 2, KEEP: 0, REJECT: 0}
+
+
 def test_current_review_queries_exclude_unsupported_files(mgr, tmpdir):
     supported = tmpdir.join("photo.jpg")
     unsupported = tmpdir.join("notes.txt")
@@ -493,6 +724,46 @@ def test_create_discard_directory_creates_timestamped_session(mgr, tmpdir, monke
     assert tmpdir.join("photo.jpg").isfile()
 
 
+def test_central_quarantine_root_names_sessions_after_folder(tmpdir, monkeypatch):
+    photos = tmpdir.mkdir("Holiday")
+    photos.join("photo.jpg").write("")
+    root = tmpdir.join("quarantine")
+    mgr = FileMgr(quarantine_root=str(root))
+    mgr.load_directory(photos)
+    FixedDatetime.value = datetime(2026, 7, 19, 14, 5, 9)
+    monkeypatch.setattr(file_mgr, "datetime", FixedDatetime)
+
+    result = mgr.move_to_discard_directory([photos.join("photo.jpg")])
+
+    expected = root.join("Holiday-20260719-140509")
+    assert result.destination == str(expected)
+    assert expected.join("photo.jpg").isfile()
+    assert not photos.join(DISCARD_DIRECTORY_NAME).exists()
+    assert mgr.directory_files == []
+
+
+def test_discard_to_other_device_copies_and_removes_sources(tmpdir, monkeypatch):
+    photos = tmpdir.mkdir("photos")
+    for name in ("a.jpg", "b.jpg"):
+        photos.join(name).write(name)
+    mgr = FileMgr(quarantine_root=str(tmpdir.join("quarantine")))
+    mgr.load_directory(photos)
+
+    def exdev_rename(source, destination):
+        raise OSError(errno.EXDEV, "Invalid cross-device link", source)
+
+    monkeypatch.setattr(file_mgr.os, "rename", exdev_rename)
+
+    result = mgr.move_to_discard_directory([photos.join("a.jpg"), photos.join("b.jpg")])
+
+    assert result.failed == []
+    assert len(result.moved) == 2
+    destination = tmpdir.join("quarantine").listdir()[0]
+    assert destination.join("a.jpg").read() == "a.jpg"
+    assert destination.join("b.jpg").read() == "b.jpg"
+    assert photos.listdir() == []
+
+
 def test_create_discard_directory_uses_suffix_on_timestamp_collision(
     mgr, tmpdir, monkeypatch
 ):
@@ -618,6 +889,164 @@ def test_move_to_discard_continues_after_individual_rename_failure(
     assert mgr.directory_files == ["fail.jpg"]
 
 
+def test_executed_discard_leaves_manager_unchanged_until_finished(mgr, tmpdir):
+    for name in ("a.jpg", "b.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("a.jpg"))
+    plan = mgr.prepare_discard([tmpdir.join("a.jpg")])
+
+    result = mgr.execute_discard(plan)
+
+    assert not tmpdir.join("a.jpg").exists()
+    assert mgr.directory_files == ["a.jpg", "b.jpg"]
+    assert mgr.finish_discard(plan, result) is result
+    assert mgr.directory_files == ["b.jpg"]
+    assert mgr.current_file() == tmpdir.join("b.jpg")
+
+
+def test_finished_discard_keeps_listing_of_directory_opened_meanwhile(mgr, tmpdir):
+    first = tmpdir.mkdir("first")
+    second = tmpdir.mkdir("second")
+    for name in ("a.jpg", "b.jpg"):
+        first.join(name).write("")
+    for name in ("c.jpg", "d.jpg", "e.jpg"):
+        second.join(name).write("")
+    mgr.load_file(first.join("b.jpg"))
+    plan = mgr.prepare_discard([first.join("a.jpg")])
+    result = mgr.execute_discard(plan)
+    mgr.load_file(second.join("e.jpg"))
+
+    mgr.finish_discard(plan, result)
+
+    assert mgr.directory_files == ["c.jpg", "d.jpg", "e.jpg"]
+    assert mgr.current_file() == second.join("e.jpg")
+
+
+def test_executed_discard_uses_planned_quarantine_session(mgr, tmpdir):
+    photos = tmpdir.mkdir("photos")
+    photos.join("a.jpg").write("")
+    mgr.load_directory(photos)
+    plan = mgr.prepare_discard([photos.join("a.jpg")])
+    mgr.quarantine_root = str(tmpdir.join("quarantine"))
+    mgr.reset_current_dir()
+
+    result = mgr.execute_discard(plan)
+
+    assert result.moved == [str(photos.join("a.jpg"))]
+    assert os.path.dirname(result.destination) == photos.join(DISCARD_DIRECTORY_NAME)
+    assert not tmpdir.join("quarantine").exists()
+
+
+def test_cancelled_discard_skips_remaining_moves(mgr, tmpdir):
+    images = [tmpdir.join(name) for name in ("a.jpg", "b.jpg", "c.jpg")]
+    for image in images:
+        image.write("")
+    mgr.load_directory(tmpdir)
+    plan = mgr.prepare_discard(images)
+    progress = []
+
+    result = mgr.execute_discard(
+        plan, lambda *args: progress.append(args), lambda: bool(progress)
+    )
+    mgr.finish_discard(plan, result)
+
+    assert result.cancelled
+    assert result.moved == [os.path.realpath(images[0])]
+    assert result.failed == []
+    assert progress == [(1, 3)]
+    assert mgr.directory_files == ["b.jpg", "c.jpg"]
+
+
+def test_move_to_discard_validates_without_per_file_stat(mgr, tmpdir, monkeypatch):
+    images = [tmpdir.join(f"{index}.jpg") for index in range(20)]
+    for image in images:
+        image.write("")
+    mgr.load_directory(tmpdir)
+    checks = {}
+    for name in ("isfile", "isdir", "exists", "realpath"):
+        checks[name] = Mock(wraps=getattr(os.path, name))
+        monkeypatch.setattr(file_mgr.os.path, name, checks[name])
+
+    result = mgr.move_to_discard_directory(images)
+
+    # Only creating the quarantine session may check paths, once per level.
+    assert len(result.moved) == len(images)
+    calls = {name: check.call_count for name, check in checks.items()}
+    assert calls["isfile"] == calls["isdir"] == 0
+    assert calls["exists"] + calls["realpath"] <= 3
+
+
+def test_move_to_discard_reports_subdirectory_of_current_directory(mgr, tmpdir):
+    tmpdir.join("a.jpg").write("")
+    subdirectory = tmpdir.mkdir("folder.jpg")
+    mgr.load_directory(tmpdir)
+
+    result = mgr.move_to_discard_directory([subdirectory])
+
+    assert result.failed == [
+        (os.path.realpath(subdirectory), "Path is a directory, not an image file")
+    ]
+    assert not tmpdir.join(DISCARD_DIRECTORY_NAME).exists()
+
+
+def test_parallel_renames_keep_plan_order(tmpdir, monkeypatch):
+    images = [tmpdir.join(f"{index}.jpg") for index in range(8)]
+    for image in images:
+        image.write("")
+    mgr = FileMgr(rename_workers=4)
+    mgr.load_directory(tmpdir)
+    real_rename = os.rename
+    lock = threading.Lock()
+    running = []
+    overlap = []
+
+    def slow_rename(source, destination):
+        with lock:
+            running.append(source)
+            overlap.append(len(running))
+        # Later files finish first, so completion order differs from plan order.
+        time.sleep(0.01 * (len(images) - int(os.path.basename(source)[0])))
+        with lock:
+            running.remove(source)
+        if source.endswith(("2.jpg", "5.jpg")):
+            raise OSError("simulated move failure")
+        real_rename(source, destination)
+
+    monkeypatch.setattr(file_mgr.os, "rename", slow_rename)
+    rescans = Mock(wraps=mgr.rescan_directory)
+    monkeypatch.setattr(mgr, "rescan_directory", rescans)
+
+    result = mgr.move_to_discard_directory(images)
+
+    assert max(overlap) > 1
+    assert result.moved == [
+        os.path.realpath(images[index]) for index in (0, 1, 3, 4, 6, 7)
+    ]
+    assert result.failed == [
+        (os.path.realpath(images[index]), "simulated move failure")
+        for index in (2, 5)
+    ]
+    assert mgr.directory_files == ["2.jpg", "5.jpg"]
+    rescans.assert_not_called()
+
+
+def test_cancelled_parallel_renames_skip_unstarted_files(tmpdir):
+    images = [tmpdir.join(f"{index}.jpg") for index in range(6)]
+    for image in images:
+        image.write("")
+    mgr = FileMgr(rename_workers=2)
+    mgr.load_directory(tmpdir)
+    plan = mgr.prepare_discard(images)
+
+    result = mgr.execute_discard(plan, cancelled=lambda: True)
+    mgr.finish_discard(plan, result)
+
+    assert result.cancelled
+    assert result.moved == result.failed == []
+    assert all(image.exists() for image in images)
+    assert len(mgr.directory_files) == len(images)
+
+
 def test_move_to_discard_preserves_surviving_current_image(mgr, tmpdir):
     for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
         tmpdir.join(name).write("")
@@ -715,7 +1144,9 @@ def test_move_to_discard_never_overwrites_existing_destination(
     session = tmpdir.mkdir(DISCARD_DIRECTORY_NAME).mkdir("existing-session")
     destination = session.join("photo.jpg")
     destination.write("existing")
-    monkeypatch.setattr(mgr, "create_discard_directory", lambda targets: str(session))
+    monkeypatch.setattr(
+        mgr, "create_discard_directory", lambda targets, *args: str(session)
+    )
 
     result = mgr.move_to_discard_directory([source])
 
@@ -724,3 +1155,123 @@ def test_move_to_discard_never_overwrites_existing_destination(
     assert "already exists" in result.failed[0][1].lower()
     assert source.read() == "source"
     assert destination.read() == "existing"
+
+
+def forbid_rescan(mgr, monkeypatch):
+    def fail(directory):
+        raise AssertionError(f"Unexpected rescan of {directory}")
+
+    monkeypatch.setattr(mgr, "scan_dir", fail)
+
+
+def change_outside_manager(mgr, directory):
+    # Make the change visible even on filesystems with coarse timestamps.
+    os.utime(str(directory), ns=(mgr.directory_mtime, mgr.directory_mtime + 10**9))
+
+
+def test_move_to_discard_updates_listing_without_rescanning(mgr, tmpdir, monkeypatch):
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("c.jpg"))
+    forbid_rescan(mgr, monkeypatch)
+
+    mgr.move_to_discard_directory([tmpdir.join("a.jpg"), tmpdir.join("d.jpg")])
+
+    assert mgr.directory_files == ["b.jpg", "c.jpg"]
+    assert mgr.current_file() == tmpdir.join("c.jpg")
+    assert sorted(mgr.directory_entries) == ["b.jpg", "c.jpg"]
+
+
+def test_delete_current_file_updates_listing_without_rescanning(
+    mgr, tmpdir, monkeypatch
+):
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("b.jpg"))
+    forbid_rescan(mgr, monkeypatch)
+
+    mgr.delete_current_file()
+
+    assert mgr.directory_files == ["a.jpg", "c.jpg"]
+    assert mgr.current_file() == tmpdir.join("c.jpg")
+
+
+def test_move_to_discard_rescans_after_outside_change(mgr, tmpdir):
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("b.jpg"))
+    tmpdir.join("z.jpg").write("")
+    change_outside_manager(mgr, tmpdir)
+
+    mgr.move_to_discard_directory([tmpdir.join("a.jpg")])
+
+    assert mgr.directory_files == ["b.jpg", "c.jpg", "z.jpg"]
+    assert mgr.current_file_position() == (1, 3)
+
+
+def test_delete_current_file_rescans_after_outside_change(mgr, tmpdir):
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("a.jpg"))
+    tmpdir.join("c.jpg").remove()
+    change_outside_manager(mgr, tmpdir)
+
+    mgr.delete_current_file()
+
+    assert mgr.directory_files == ["b.jpg"]
+    assert mgr.current_file() == tmpdir.join("b.jpg")
+
+
+def assert_positions_match_listing(mgr):
+    assert mgr.directory_positions == {
+        name: index for index, name in enumerate(mgr.directory_files)
+    }
+
+
+def test_file_positions_match_listing_after_load(mgr, testdir):
+    mgr.load_file(testdir.join("test3.jpg"))
+
+    assert_positions_match_listing(mgr)
+    assert mgr.file_position("test3.jpg") == 2
+    assert mgr.file_position("missing.jpg") is None
+
+
+def test_file_positions_stay_valid_after_discard_and_delete(mgr, tmpdir):
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg", "e.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("d.jpg"))
+
+    mgr.move_to_discard_directory([tmpdir.join("b.jpg")])
+    mgr.delete_current_file()
+
+    assert_positions_match_listing(mgr)
+    assert mgr.current_file() == tmpdir.join("e.jpg")
+    assert mgr.file_position("e.jpg") == 2
+
+
+def test_neighbour_files_alternate_ahead_and_behind_nearest_first(mgr, tmpdir):
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg", "e.jpg"):
+        tmpdir.join(name).write("")
+    mgr.load_file(tmpdir.join("c.jpg"))
+
+    neighbours = mgr.neighbour_files(behind=1, ahead=2)
+
+    assert neighbours == [
+        os.path.join(mgr.current_directory(), name)
+        for name in ("d.jpg", "b.jpg", "e.jpg")
+    ]
+
+
+def test_neighbour_files_stop_at_directory_edges(mgr, testdir):
+    mgr.load_file(testdir.join("test1.jpg"))
+
+    assert mgr.neighbour_files(behind=3, ahead=3) == [
+        os.path.join(mgr.current_directory(), name)
+        for name in ("test2.jpg", "test3.jpg")
+    ]
+
+
+def test_neighbour_files_are_empty_without_selected_file(mgr, testdir):
+    mgr.load_directory(testdir.join("Sub2Empty"))
+
+    assert mgr.neighbour_files(behind=1, ahead=1) == []
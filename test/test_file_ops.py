@@ -0,0 +1,128 @@
+import errno
+import os
+
+import pytest
+
+import file_ops
+from file_ops import copy_across_devices, move_file
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every rename fail as it does between two filesystems."""
+
+    def exdev_rename(source, destination):
+        raise OSError(errno.EXDEV, "Invalid cross-device link", source)
+
+    monkeypatch.setattr(file_ops.os, "rename", exdev_rename)
+
+
+@pytest.fixture
+def source(tmpdir):
+    path = tmpdir.join("source.jpg")
+    path.write_binary(bytes(range(256)) * 1024)
+    os.utime(str(path), (1_000_000_000, 1_000_000_000))
+    return path
+
+
+def test_same_device_move_renames(source, tmpdir, monkeypatch):
+    destination = tmpdir.join("moved.jpg")
+    monkeypatch.setattr(
+        file_ops,
+        "copy_across_devices",
+        lambda *args: pytest.fail("Unexpected copy"),
+    )
+
+    move_file(str(source), str(destination))
+
+    assert not source.exists()
+    assert destination.read_binary() == bytes(range(256)) * 1024
+
+
+def test_cross_device_move_copies_and_removes_source(source, tmpdir, cross_device):
+    destination = tmpdir.join("moved.jpg")
+
+    move_file(str(source), str(destination))
+
+    assert not source.exists()
+    assert destination.read_binary() == bytes(range(256)) * 1024
+    assert destination.mtime() == 1_000_000_000
+
+
+def test_cross_device_move_recreates_symbolic_link(tmpdir, cross_device):
+    target = tmpdir.join("target.jpg")
+    target.write("image")
+    link = tmpdir.join("link.jpg")
+    link.mksymlinkto(target)
+    destination = tmpdir.join("moved.jpg")
+
+    move_file(str(link), str(destination))
+
+    assert not link.check(link=True)
+    assert destination.readlink() == str(target)
+    assert target.read() == "image"
+
+
+def test_failed_copy_keeps_source_and_removes_partial_copy(
+    source, tmpdir, cross_device, monkeypatch
+):
+    destination = tmpdir.join("moved.jpg")
+
+    def failing_copy(source_file, destination_file, size):
+        destination_file.write(b"partial")
+        raise OSError(errno.EIO, "simulated copy failure")
+
+    monkeypatch.setattr(file_ops, "copy_contents", failing_copy)
+
+    with pytest.raises(OSError, match="simulated copy failure"):
+        move_file(str(source), str(destination))
+
+    assert source.exists()
+    assert not destination.exists()
+
+
+def test_short_copy_is_detected_before_source_is_removed(
+    source, tmpdir, cross_device, monkeypatch
+):
+    destination = tmpdir.join("moved.jpg")
+    monkeypatch.setattr(
+        file_ops,
+        "copy_contents",
+        lambda source_file, destination_file, size: destination_file.write(b"x"),
+    )
+
+    with pytest.raises(OSError, match="Copied 1 of"):
+        move_file(str(source), str(destination))
+
+    assert source.exists()
+    assert not destination.exists()
+
+
+def test_copy_falls_back_when_kernel_copies_are_unsupported(
+    source, tmpdir, monkeypatch
+):
+    destination = tmpdir.join("copy.jpg")
+    attempts = []
+
+    def unsupported(*args):
+        attempts.append(args)
+        raise OSError(errno.EXDEV, "unsupported")
+
+    monkeypatch.setattr(file_ops, "fcntl", None)
+    monkeypatch.setattr(file_ops.os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(file_ops.os, "sendfile", unsupported, raising=False)
+
+    copy_across_devices(str(source), str(destination))
+
+    assert len(attempts) == 2
+    assert destination.read_binary() == source.read_binary()
+
+
+def test_copy_does_not_overwrite_existing_destination(source, tmpdir):
+    destination = tmpdir.join("copy.jpg")
+    destination.write("existing")
+
+    with pytest.raises(FileExistsError):
+        copy_across_devices(str(source), str(destination))
+
+    assert destination.read() == "existing"
@@ -0,0 +1,84 @@
+import os
+
+from PyQt5.QtGui import QImage
+
+from image_cache import ImageCache, file_cache_key, image_bytes
+
+MB = 1024 * 1024
+
+
+def test_image_bytes_uses_width_height_and_bytes_per_pixel(app):
+    image = QImage(30, 10, QImage.Format_RGB32)
+
+    assert image_bytes(image) == 30 * 10 * 4
+
+
+def test_image_bytes_of_null_image_is_zero(app):
+    assert image_bytes(QImage()) == 0
+
+
+def test_file_cache_key_uses_realpath_mtime_and_size(tmpdir):
+    path = tmpdir.join("photo.jpg")
+    path.write("12345")
+    os.utime(path, ns=(1_000_000_000, 2_000_000_000))
+
+    assert file_cache_key(str(path)) == (os.path.realpath(path), 2_000_000_000, 5)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = ImageCache(limit_mb=2)
+    cache.put("a", "A", MB)
+    cache.put("b", "B", MB)
+    cache.get("a")
+
+    cache.put("c", "C", MB)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert cache.bytes_used == 2 * MB
+
+
+def test_current_entry_is_evicted_last():
+    cache = ImageCache(limit_mb=2)
+    cache.put("current", "A", MB)
+    cache.set_current("current")
+    cache.put("b", "B", MB)
+
+    cache.put("c", "C", MB)
+    cache.put("d", "D", MB)
+
+    assert "current" in cache
+    assert "d" in cache
+    assert cache.bytes_used == 2 * MB
+
+
+def test_entry_larger_than_limit_is_not_stored():
+    cache = ImageCache(limit_mb=1)
+
+    stored = cache.put("big", "B", 2 * MB)
+
+    assert not stored
+    assert len(cache) == 0
+    assert cache.bytes_used == 0
+
+
+def test_lowering_limit_evicts_entries():
+    cache = ImageCache(limit_mb=3)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper(), MB)
+
+    cache.set_limit_mb(1)
+
+    assert list(cache.entries) == ["c"]
+    assert cache.bytes_used == MB
+
+
+def test_replacing_entry_updates_used_bytes():
+    cache = ImageCache(limit_mb=4)
+    cache.put("a", "A", MB)
+
+    cache.put("a", "A2", 2 * MB)
+
+    assert cache.get("a") == "A2"
+    assert cache.bytes_used == 2 * MB
@@ -0,0 +1,197 @@
+import pytest
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+
+from image_loader import ImageLoader
+
+
+def create_image(path, width=40, height=20, color=Qt.red):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path))
+
+
+@pytest.fixture
+def images(tmpdir):
+    paths = [str(tmpdir.join(name)) for name in ("a.png", "b.png", "c.png")]
+    for path in paths:
+        create_image(path)
+    return paths
+
+
+@pytest.fixture
+def loader(app):
+    image_loader = ImageLoader()
+    yield image_loader
+    image_loader.shutdown()
+
+
+def finish_prefetch(loader, app):
+    loader.wait_for_done()
+    app.processEvents()
+
+
+def test_prefetch_decodes_images_into_cache(loader, app, images):
+    loader.prefetch(images[1:])
+    finish_prefetch(loader, app)
+
+    assert [loader.is_cached(path) for path in images] == [False, True, True]
+    assert loader.pending == {}
+
+
+def test_load_of_prefetched_image_counts_hit(loader, app, images):
+    loader.prefetch([images[1]])
+    finish_prefetch(loader, app)
+
+    image = loader.load(images[1]).image
+
+    assert image.width() == 40
+    assert loader.stats() == {"hits": 1, "misses": 0}
+
+
+def test_load_of_unknown_image_decodes_synchronously_and_counts_miss(loader, images):
+    image = loader.load(images[0]).image
+
+    assert image.size().width() == 40
+    assert loader.stats() == {"hits": 0, "misses": 1}
+
+
+def test_prefetch_result_is_dropped_when_no_longer_wanted(loader, app, images):
+    loader.prefetch([images[1]])
+    loader.wait_for_done()
+    loader.prefetch([images[2]])
+    finish_prefetch(loader, app)
+
+    assert not loader.is_cached(images[1])
+    assert loader.is_cached(images[2])
+
+
+def test_modified_file_is_decoded_again(loader, images):
+    loader.load(images[0])
+    create_image(images[0], width=80)
+
+    image = loader.load(images[0]).image
+
+    assert image.width() == 80
+    assert loader.stats() == {"hits": 0, "misses": 2}
+
+
+def test_cache_limit_is_configurable_in_megabytes(app, images):
+    one_image_mb = 40 * 20 * 4 / (1024 * 1024)
+    loader = ImageLoader(cache_limit_mb=one_image_mb * 2)
+
+    for path in images:
+        loader.load(path)
+
+    assert loader.cache.bytes_used == 40 * 20 * 4 * 2
+    assert [loader.is_cached(path) for path in images] == [False, True, True]
+
+
+def test_failed_decode_is_not_cached(loader, tmpdir):
+    broken = tmpdir.join("broken.jpg")
+    broken.write("")
+
+    image = loader.load(str(broken)).image
+
+    assert image.isNull()
+    assert len(loader.cache) == 0
+
+
+def test_next_image_uses_prefetched_neighbour(window, app, images):
+    window.prepare_for_file(images[0])
+    window.image_view.loader.wait_for_done()
+    app.processEvents()
+    initial_hits = window.image_view.loader.hits
+
+    window.next_image()
+
+    assert window.image_view.loader.hits == initial_hits + 1
+    assert window.image_view.pixmap.width() == 40
+
+
+def test_prefetch_window_size_is_configurable(window, app, images):
+    window.prefetch_ahead = 1
+    window.prefetch_behind = 0
+
+    window.prepare_for_file(images[0])
+    window.image_view.loader.wait_for_done()
+    app.processEvents()
+
+    loader = window.image_view.loader
+    assert [loader.is_cached(path) for path in images] == [True, True, False]
+
+
+@pytest.fixture
+def large_jpeg(tmpdir):
+    path = str(tmpdir.join("large.jpg"))
+    create_image(path, width=1600, height=1200)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("bound", "expected_size"),
+    (
+        (QSize(200, 200), QSize(200, 150)),
+        (QSize(300, 300), QSize(400, 300)),
+        (QSize(700, 700), QSize(800, 600)),
+        (QSize(1000, 1000), QSize(1600, 1200)),
+        (None, QSize(1600, 1200)),
+    ),
+)
+def test_jpeg_is_decoded_at_smallest_reduction_covering_bound(
+    loader, large_jpeg, bound, expected_size
+):
+    decoded = loader.load(large_jpeg, bound)
+
+    assert decoded.image.size() == expected_size
+    assert decoded.original_size == QSize(1600, 1200)
+
+
+def test_png_is_never_decoded_reduced(loader, tmpdir):
+    path = str(tmpdir.join("large.png"))
+    create_image(path, width=1600, height=1200)
+
+    decoded = loader.load(path, QSize(200, 200))
+
+    assert decoded.image.size() == QSize(1600, 1200)
+
+
+def test_reduced_cache_entry_is_reused_while_it_covers_bound(loader, large_jpeg):
+    loader.load(large_jpeg, QSize(700, 700))
+
+    decoded = loader.load(large_jpeg, QSize(500, 500))
+
+    assert decoded.image.size() == QSize(800, 600)
+    assert loader.stats() == {"hits": 1, "misses": 1}
+
+
+def test_larger_bound_than_reduced_cache_entry_decodes_again(loader, large_jpeg):
+    loader.load(large_jpeg, QSize(300, 300))
+
+    decoded = loader.load(large_jpeg)
+
+    assert decoded.image.size() == QSize(1600, 1200)
+    assert loader.stats() == {"hits": 0, "misses": 2}
+
+
+def test_fit_to_window_shows_reduced_jpeg(window, app, large_jpeg):
+    window.prepare_for_file(large_jpeg)
+    app.processEvents()
+
+    view = window.image_view
+    assert view.pixmap.width() < 1600
+    assert view.original_size == QSize(1600, 1200)
+    assert view.surface.display_size == QSize(1600, 1200).scaled(
+        view.viewport().size(), Qt.KeepAspectRatio
+    )
+
+
+def test_zoom_past_reduced_resolution_decodes_full_image(window, app, large_jpeg):
+    window.prepare_for_file(large_jpeg)
+    app.processEvents()
+    view = window.image_view
+
+    view.set_original_size()
+
+    assert view.pixmap.size() == QSize(1600, 1200)
+    assert view.surface.display_size == QSize(1600, 1200)
@@ -0,0 +1,105 @@
+from unittest.mock import Mock
+
+import pytest
+from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtGui import QImage, QKeyEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+
+def create_image(path, width=40, height=20, color=Qt.red):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path))
+
+
+def send_key_event(window, event_type, auto_repeat):
+    event = QKeyEvent(event_type, Qt.Key_Right, Qt.NoModifier, "", auto_repeat)
+    QApplication.sendEvent(window.image_view, event)
+
+
+@pytest.fixture
+def images(tmpdir):
+    paths = [str(tmpdir.join(f"{index}.png")) for index in range(5)]
+    for path in paths:
+        create_image(path)
+    return paths
+
+
+@pytest.fixture
+def counted_loads(window, images, monkeypatch):
+    window.prepare_for_file(images[0])
+    loader = window.image_view.loader
+    loader.wait_for_done()
+    loader.cache.clear()
+    load = Mock(wraps=loader.load)
+    monkeypatch.setattr(loader, "load", load)
+    return load
+
+
+def skim_forward(window, steps):
+    for _ in range(steps):
+        send_key_event(window, QEvent.ShortcutOverride, auto_repeat=True)
+        window.next_image()
+
+
+def test_auto_repeated_navigation_does_not_decode(window, app, images, counted_loads):
+    skim_forward(window, 3)
+
+    counted_loads.assert_not_called()
+    assert window.mgr.current_file() == images[3]
+    assert window.windowTitle().startswith(images[3])
+    assert window.image_view.pixmap is None
+    assert window.settle_timer.isActive()
+
+
+def test_key_release_decodes_settled_image_once(window, app, images, counted_loads):
+    skim_forward(window, 3)
+
+    send_key_event(window, QEvent.KeyRelease, auto_repeat=False)
+
+    counted_loads.assert_called_once()
+    assert counted_loads.call_args[0][0] == images[3]
+    assert window.image_view.pixmap is not None
+    assert not window.settle_timer.isActive()
+
+
+def test_settle_timeout_decodes_settled_image(window, app, images, counted_loads):
+    skim_forward(window, 2)
+
+    QTest.qWait(window.NAVIGATION_SETTLE_MS * 3)
+
+    counted_loads.assert_called_once()
+    assert counted_loads.call_args[0][0] == images[2]
+
+
+def test_skimming_previews_cached_images(window, app, images, counted_loads):
+    loader = window.image_view.loader
+    loader.prefetch(images[1:])
+    loader.wait_for_done()
+    app.processEvents()
+
+    skim_forward(window, 2)
+
+    counted_loads.assert_not_called()
+    assert window.image_view.pixmap is not None
+    assert window.image_view.image_path == images[2]
+
+
+def test_skimming_drops_decodes_for_passed_images(window, app, images, counted_loads):
+    skim_forward(window, 3)
+
+    loader = window.image_view.loader
+    assert loader.wanted_paths == {images[3]}
+    assert set(loader.pending) <= {images[1], images[2], images[3]}
+    loader.wait_for_done()
+    app.processEvents()
+    assert not any(loader.is_cached(path) for path in images[1:3])
+
+
+def test_single_key_press_loads_immediately(window, app, images, counted_loads):
+    send_key_event(window, QEvent.ShortcutOverride, auto_repeat=False)
+    window.next_image()
+
+    counted_loads.assert_called_once()
+    assert not window.settle_timer.isActive()
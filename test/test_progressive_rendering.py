@@ -0,0 +1,80 @@
+import pytest
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtTest import QTest
+
+
+@pytest.fixture
+def view(window, app):
+    image_view = window.image_view
+    image_view.pixmap = QPixmap(1600, 1200)
+    image_view.pixmap.fill(Qt.white)
+    return image_view
+
+
+def displayed_key(view):
+    return view.surface.source.cacheKey()
+
+
+def cached_key(view, mode):
+    target_size = view.surface.display_size
+    key = view.scaled_pixmap_key(target_size, mode)
+    return view.scaled_cache.get(key).cacheKey()
+
+
+def test_new_size_is_first_shown_with_fast_transformation(view):
+    view.reset_zoom()
+
+    assert displayed_key(view) == cached_key(view, Qt.FastTransformation)
+    assert view.refine_timer.isActive()
+
+
+def test_idle_refine_replaces_preview_with_smooth_pixmap(view, app):
+    view.reset_zoom()
+
+    QTest.qWait(view.REFINE_DELAY_MS * 2)
+
+    assert displayed_key(view) == cached_key(view, Qt.SmoothTransformation)
+    assert not view.refine_timer.isActive()
+
+
+def test_repeated_zoom_restarts_refine_delay(view, app):
+    view.reset_zoom()
+    QTest.qWait(view.REFINE_DELAY_MS // 2)
+
+    view.zoom_in()
+
+    assert view.refine_timer.isActive()
+    assert view.refine_timer.remainingTime() > view.REFINE_DELAY_MS // 2
+    assert displayed_key(view) == cached_key(view, Qt.FastTransformation)
+
+
+def test_previously_refined_size_is_shown_smooth_immediately(view, app):
+    view.reset_zoom()
+    view.refine_image()
+    view.zoom_in()
+
+    view.zoom_out()
+
+    assert displayed_key(view) == cached_key(view, Qt.SmoothTransformation)
+
+
+def test_disabled_progressive_rendering_scales_smoothly_at_once(view):
+    view.progressive_rendering = False
+
+    view.reset_zoom()
+
+    assert displayed_key(view) == cached_key(view, Qt.SmoothTransformation)
+    assert not view.refine_timer.isActive()
+
+
+def test_tiled_preview_is_refined_with_smooth_tiles(view, app):
+    view.zoom_changed = True
+    view.scale_factor = 10.0
+    view.resize_image()
+    assert view.surface.is_tiled()
+    assert not view.surface.smooth
+
+    view.refine_image()
+
+    assert view.surface.smooth
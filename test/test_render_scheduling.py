@@ -0,0 +1,121 @@
+from unittest.mock import Mock
+
+import pytest
+from PyQt5.QtCore import QPoint, QPointF, Qt
+from PyQt5.QtGui import QPixmap, QWheelEvent
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+
+@pytest.fixture
+def view(window, app):
+    image_view = window.image_view
+    image_view.pixmap = QPixmap(1600, 1200)
+    image_view.pixmap.fill(Qt.white)
+    image_view.zoom_changed = True
+    image_view.scale_factor = 0.8
+    image_view.resize_image()
+    app.processEvents()
+    return image_view
+
+
+@pytest.fixture
+def counted_render(view, monkeypatch):
+    resize_image = Mock(wraps=view.resize_image)
+    monkeypatch.setattr(view, "resize_image", resize_image)
+    return resize_image
+
+
+def send_wheel_event(view, position, angle_delta=120):
+    event = QWheelEvent(
+        QPointF(position),
+        QPointF(view.viewport().mapToGlobal(position)),
+        QPoint(),
+        QPoint(0, angle_delta),
+        Qt.NoButton,
+        Qt.NoModifier,
+        Qt.NoScrollPhase,
+        False,
+    )
+    QApplication.sendEvent(view.viewport(), event)
+
+
+def wait_for_frame(view):
+    QTest.qWait(view.FRAME_INTERVAL_MS * 3)
+
+
+def image_position_at_cursor(view, cursor_position):
+    surface_position = view.surface.mapFrom(view.viewport(), cursor_position)
+    pixmap_rect = view.surface.pixmap_rect()
+    return QPointF(
+        float(surface_position.x() - pixmap_rect.left()) / pixmap_rect.width(),
+        float(surface_position.y() - pixmap_rect.top()) / pixmap_rect.height(),
+    )
+
+
+def test_wheel_burst_renders_at_most_once_per_frame(view, counted_render):
+    cursor_position = view.viewport().rect().center()
+    view.resize_image()
+    counted_render.reset_mock()
+
+    for _ in range(5):
+        send_wheel_event(view, cursor_position)
+    wait_for_frame(view)
+
+    assert counted_render.call_count == 1
+    assert view.scale_factor == pytest.approx(0.8 * view.WHEEL_ZOOM_FACTOR ** 5)
+
+
+def test_first_wheel_event_after_idle_frame_renders_immediately(
+    view, counted_render
+):
+    wait_for_frame(view)
+    counted_render.reset_mock()
+
+    send_wheel_event(view, view.viewport().rect().center())
+
+    counted_render.assert_called_once()
+
+
+def test_coalesced_wheel_zoom_keeps_image_position_under_cursor(view, app):
+    cursor_position = QPoint(
+        view.viewport().width() * 3 // 4, view.viewport().height() * 3 // 4
+    )
+    initial_image_position = image_position_at_cursor(view, cursor_position)
+
+    for _ in range(3):
+        send_wheel_event(view, cursor_position)
+    wait_for_frame(view)
+
+    zoomed_image_position = image_position_at_cursor(view, cursor_position)
+    pixmap_size = view.surface.pixmap_rect().size()
+    assert zoomed_image_position.x() == pytest.approx(
+        initial_image_position.x(), abs=2.0 / pixmap_size.width()
+    )
+    assert zoomed_image_position.y() == pytest.approx(
+        initial_image_position.y(), abs=2.0 / pixmap_size.height()
+    )
+
+
+def test_resize_storm_is_coalesced(window, view, app, counted_render):
+    view.resize_image()
+    counted_render.reset_mock()
+
+    for width in range(810, 900, 10):
+        window.resize(width, 600)
+        app.processEvents()
+    wait_for_frame(view)
+
+    assert 1 <= counted_render.call_count <= 2
+    assert view.surface.width() >= view.viewport().width()
+
+
+def test_direct_render_cancels_pending_wheel_anchor(view):
+    view.resize_image()
+    send_wheel_event(view, view.viewport().rect().center())
+    assert view.render_timer.isActive()
+
+    view.set_fit_to_window()
+
+    assert not view.render_timer.isActive()
+    assert view.pending_anchor is None
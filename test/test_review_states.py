@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from review_states import DirectoryRecord, ReviewStates
+
+KEEP = "keep"
+REJECT = "reject"
+DIRECTORY = os.path.join(os.sep, "photos", "2024-05-17")
+
+
+def path(name, directory=DIRECTORY):
+    return os.path.join(directory, name)
+
+
+@pytest.fixture
+def states():
+    review_states = ReviewStates((KEEP, REJECT))
+    review_states.attach_listing(DIRECTORY, ["a.jpg", "b.jpg", "c.jpg"])
+    yield review_states
+
+
+def test_directory_record_finds_names_by_position():
+    record = DirectoryRecord(["a.jpg", "b.jpg", "long name.jpeg"])
+
+    assert [record[index] for index in range(len(record))] == [
+        "a.jpg",
+        "b.jpg",
+        "long name.jpeg",
+    ]
+    assert record.index("long name.jpeg") == 2
+    assert record.index("missing.jpg") is None
+
+
+def test_listed_files_are_stored_in_directory_record(states):
+    states[path("b.jpg")] = KEEP
+
+    assert states[path("b.jpg")] == KEEP
+    assert states.records[DIRECTORY].states == bytearray((0, 1, 0))
+    assert states.fallback == {}
+
+
+def test_unlisted_files_are_stored_in_fallback(states):
+    other = path("a.jpg", os.path.join(os.sep, "elsewhere"))
+
+    states[other] = REJECT
+    states[path("new.jpg")] = KEEP
+
+    assert states.fallback == {other: REJECT, path("new.jpg"): KEEP}
+
+
+def test_review_states_behave_like_a_dictionary(states):
+    states[path("a.jpg")] = KEEP
+    states[path("c.jpg")] = REJECT
+    states[path("a.jpg", os.sep)] = KEEP
+
+    del states[path("c.jpg")]
+
+    assert len(states) == 2
+    assert states == {path("a.jpg"): KEEP, path("a.jpg", os.sep): KEEP}
+    assert states.get(path("c.jpg")) is None
+    assert states.pop(path("b.jpg"), None) is None
+
+
+def test_missing_listed_file_raises_key_error(states):
+    with pytest.raises(KeyError):
+        del states[path("a.jpg")]
+
+
+def test_only_constructor_values_can_be_stored(states):
+    with pytest.raises(ValueError):
+        states[path("a.jpg")] = "undecided"
+
+
+def test_attaching_listing_moves_fallback_states_into_record():
+    review_states = ReviewStates((KEEP, REJECT))
+    review_states[path("b.jpg")] = REJECT
+
+    review_states.attach_listing(DIRECTORY, ["a.jpg", "b.jpg"])
+
+    assert review_states.fallback == {}
+    assert review_states.records[DIRECTORY].states == bytearray((0, 2))
+
+
+def test_reattaching_changed_listing_keeps_states(states):
+    states[path("a.jpg")] = KEEP
+    states[path("c.jpg")] = REJECT
+
+    states.attach_listing(DIRECTORY, ["0.jpg", "c.jpg"])
+
+    assert states.records[DIRECTORY].states == bytearray((0, 2))
+    assert states.fallback == {path("a.jpg"): KEEP}
+    assert states == {path("a.jpg"): KEEP, path("c.jpg"): REJECT}
+
+
+def test_listing_values_follow_listing_order(states):
+    states[path("c.jpg")] = REJECT
+
+    assert states.listing_values(DIRECTORY) == [None, None, REJECT]
@@ -0,0 +1,197 @@
+import os
+import sqlite3
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from file_mgr import KEEP, REJECT, UNDECIDED, FileMgr
+from main import ImageViewerMainWindow
+from review_store import ReviewStore
+
+
+def stored_rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute(
+            "SELECT directory, name, state FROM review_states ORDER BY name"
+        ).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.fixture
+def store_path(tmpdir):
+    return str(tmpdir.join("state", "review_states.sqlite3"))
+
+
+@pytest.fixture
+def store(store_path):
+    review_store = ReviewStore(store_path, write_delay=60)
+    yield review_store
+    review_store.close()
+
+
+@pytest.fixture
+def photos(tmpdir):
+    directory = tmpdir.mkdir("photos")
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        directory.join(name).write("")
+    return os.path.realpath(str(directory))
+
+
+def test_store_uses_write_ahead_log(store, store_path):
+    connection = sqlite3.connect(store_path)
+
+    journal_mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+    connection.close()
+    assert journal_mode == "wal"
+
+
+def test_save_does_not_write_before_write_delay(store, store_path, photos):
+    store.save(os.path.join(photos, "a.jpg"), KEEP)
+
+    assert stored_rows(store_path) == []
+    assert store.pending == {(photos, "a.jpg"): KEEP}
+
+
+def test_flush_writes_pending_changes_in_one_batch(store, store_path, photos):
+    store.save(os.path.join(photos, "a.jpg"), KEEP)
+    store.save(os.path.join(photos, "b.jpg"), REJECT)
+    store.save(os.path.join(photos, "a.jpg"), None)
+
+    store.flush()
+
+    assert stored_rows(store_path) == [(photos, "b.jpg", REJECT)]
+    assert store.load(photos) == {"b.jpg": REJECT}
+
+
+def test_changes_are_written_after_write_delay(store_path, photos):
+    store = ReviewStore(store_path, write_delay=0.05)
+    store.save(os.path.join(photos, "a.jpg"), KEEP)
+
+    deadline = time.monotonic() + 5
+    while not stored_rows(store_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    rows = stored_rows(store_path)
+    store.close()
+    assert rows == [(photos, "a.jpg", KEEP)]
+
+
+def test_close_writes_pending_changes(store_path, photos):
+    store = ReviewStore(store_path, write_delay=60)
+    store.save(os.path.join(photos, "a.jpg"), REJECT)
+
+    store.close()
+
+    assert stored_rows(store_path) == [(photos, "a.jpg", REJECT)]
+    with pytest.raises(RuntimeError):
+        store.save(os.path.join(photos, "b.jpg"), KEEP)
+
+
+def test_failed_batch_is_retried_under_newer_changes(store_path, photos, monkeypatch):
+    monkeypatch.setattr(ReviewStore, "RETRY_DELAY_SECONDS", 0.01)
+    store = ReviewStore(store_path, write_delay=60)
+    write_batch = store.write_batch
+    attempts = []
+
+    def fail_once(connection, batch):
+        attempts.append(dict(batch))
+        if len(attempts) > 1:
+            return write_batch(connection, batch)
+        # A change saved while the failing batch is being written.
+        store.save(os.path.join(photos, "a.jpg"), REJECT)
+        return False
+
+    monkeypatch.setattr(store, "write_batch", fail_once)
+    store.save(os.path.join(photos, "a.jpg"), KEEP)
+    store.save(os.path.join(photos, "b.jpg"), KEEP)
+
+    store.flush()
+
+    store.close()
+    assert len(attempts) == 2
+    assert stored_rows(store_path) == [
+        (photos, "a.jpg", REJECT),
+        (photos, "b.jpg", KEEP),
+    ]
+
+
+def test_close_gives_up_on_failing_database(store_path, photos, monkeypatch):
+    monkeypatch.setattr(ReviewStore, "RETRY_DELAY_SECONDS", 0.01)
+    store = ReviewStore(store_path, write_delay=60)
+    write_batch = Mock(return_value=False)
+    monkeypatch.setattr(store, "write_batch", write_batch)
+    store.save(os.path.join(photos, "a.jpg"), KEEP)
+
+    store.close()
+
+    assert write_batch.call_count == ReviewStore.CLOSE_ATTEMPTS
+    assert store.pending == {(photos, "a.jpg"): KEEP}
+
+
+def test_review_states_survive_new_session(store_path, photos):
+    first = FileMgr(ReviewStore(store_path, write_delay=60))
+    first.load_directory(photos)
+    first.toggle_keep()
+    first.next()
+    first.toggle_reject()
+    first.close()
+
+    second = FileMgr(ReviewStore(store_path))
+    second.load_directory(photos)
+
+    assert second.directory_states == [KEEP, REJECT, UNDECIDED]
+    assert second.current_review_counts() == {UNDECIDED: 1, KEEP: 1, REJECT: 1}
+    second.close()
+
+
+def test_directory_states_are_loaded_once(store, photos, monkeypatch):
+    mgr = FileMgr(store)
+    load = Mock(wraps=store.load)
+    monkeypatch.setattr(store, "load", load)
+
+    mgr.load_directory(photos)
+    mgr.load_file(os.path.join(photos, "b.jpg"))
+
+    load.assert_called_once_with(photos)
+
+
+def test_review_changes_do_not_wait_for_disk(store, store_path, photos):
+    mgr = FileMgr(store)
+    mgr.load_directory(photos)
+
+    mgr.toggle_keep()
+
+    assert stored_rows(store_path) == []
+    store.flush()
+    assert stored_rows(store_path) == [(photos, "a.jpg", KEEP)]
+
+
+def test_removed_files_forget_stored_states(store, store_path, photos):
+    mgr = FileMgr(store)
+    mgr.load_directory(photos)
+    mgr.toggle_reject()
+    mgr.next()
+    mgr.toggle_keep()
+    store.flush()
+
+    mgr.move_to_discard_directory([os.path.join(photos, "a.jpg")])
+    mgr.delete_current_file()
+    store.flush()
+
+    assert stored_rows(store_path) == []
+
+
+def test_closing_window_writes_review_states(app, store_path, photos):
+    window = ImageViewerMainWindow(
+        review_store=ReviewStore(store_path, write_delay=60)
+    )
+    window.mgr.load_directory(photos)
+    window.mgr.toggle_keep()
+
+    window.close()
+
+    assert stored_rows(store_path) == [(photos, "a.jpg", KEEP)]
@@ -1,4 +1,4 @@
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QPointF, Qt
 from PyQt5.QtGui import QImage
 from PyQt5.QtTest import QTest
 
@@ -19,16 +19,20 @@ def test_rotation_shortcuts_turn_view_left_and_right(window, app, tmpdir):
     QTest.keyClick(window, Qt.Key_L)
     app.processEvents()
 
+    surface = window.image_view.surface
     assert window.image_view.rotation_degrees == 270
-    assert window.image_view.oriented_pixmap().size().width() == 20
-    assert window.image_view.oriented_pixmap().size().height() == 40
+    assert surface.display_size.height() > surface.display_size.width()
+    # A left turn brings the top-left source corner to the bottom left.
+    assert surface.display_transform.map(QPointF(0, 0)) == QPointF(
+        0, surface.display_size.height()
+    )
 
     QTest.keyClick(window, Qt.Key_R)
     app.processEvents()
 
     assert window.image_view.rotation_degrees == 0
-    assert window.image_view.oriented_pixmap().size().width() == 40
-    assert window.image_view.oriented_pixmap().size().height() == 20
+    assert surface.display_size.width() > surface.display_size.height()
+    assert surface.display_transform.map(QPointF(0, 0)) == QPointF(0, 0)
 
 
 def test_rotation_shortcuts_work_in_full_screen(window, app, tmpdir):
@@ -0,0 +1,221 @@
+from unittest.mock import Mock
+
+import pytest
+from PyQt5.QtCore import QPoint, QPointF, QSize, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPixmap
+
+
+def create_image(path, width=400, height=200, color=Qt.red):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path))
+
+
+@pytest.fixture
+def counted_view(window, monkeypatch):
+    view = window.image_view
+    scale_source = Mock(wraps=view.scale_source)
+    monkeypatch.setattr(view, "scale_source", scale_source)
+    return view, scale_source
+
+
+def test_repeated_resize_reuses_scaled_pixmap(window, app, tmpdir, counted_view):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    app.processEvents()
+    displayed = view.surface.source.cacheKey()
+    scale_source.reset_mock()
+
+    view.resize_image()
+    view.set_fit_to_window()
+
+    scale_source.assert_not_called()
+    assert view.surface.source.cacheKey() == displayed
+
+
+def test_returning_to_image_reuses_scaled_pixmap(window, app, tmpdir, counted_view):
+    view, scale_source = counted_view
+    first = tmpdir.join("a.png")
+    second = tmpdir.join("b.png")
+    create_image(first)
+    create_image(second, color=Qt.blue)
+    window.prepare_for_file(str(first))
+    window.next_image()
+    app.processEvents()
+    scale_source.reset_mock()
+
+    window.prev_image()
+
+    scale_source.assert_not_called()
+
+
+def test_zoom_round_trip_reuses_scaled_pixmap(window, app, tmpdir, counted_view):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view.set_original_size()
+    view.zoom_in()
+    view.zoom_out()
+    scale_source.reset_mock()
+
+    view.zoom_in()
+
+    scale_source.assert_not_called()
+
+
+def test_rotated_view_displays_turned_size(window, app, tmpdir):
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view = window.image_view
+    view.set_original_size()
+
+    view.rotate_right()
+
+    assert view.surface.display_size.width() == 200
+    assert view.surface.display_size.height() == 400
+
+
+def test_assigned_pixmap_is_not_served_from_previous_image_cache(window, app, tmpdir):
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view = window.image_view
+    view.set_original_size()
+    replacement = view.pixmap.copy()
+    replacement.fill(Qt.green)
+
+    view.pixmap = replacement
+    view.resize_image()
+
+    assert view.surface.grab(view.surface.pixmap_rect()).toImage().pixelColor(0, 0) == Qt.green
+
+
+def test_leaving_full_screen_reuses_windowed_scaled_pixmap(
+    window, app, tmpdir, counted_view
+):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    app.processEvents()
+    window.show_full_screen()
+    app.processEvents()
+    scale_source.reset_mock()
+
+    window.show_normal()
+    app.processEvents()
+
+    scale_source.assert_not_called()
+
+
+def test_rotated_view_scales_unrotated_source_to_display_size(
+    window, app, tmpdir, counted_view
+):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view.progressive_rendering = False
+    view.set_original_size()
+    view.rotate_right()
+    scale_source.reset_mock()
+
+    view.zoom_out()
+
+    scale_source.assert_called_once()
+    assert scale_source.call_args[0][0].width() == 320
+    assert scale_source.call_args[0][0].height() == 160
+    assert view.surface.display_size.width() == 160
+    assert view.surface.display_size.height() == 320
+
+
+def test_magnified_view_paints_source_without_scaled_copy(
+    window, app, tmpdir, counted_view
+):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view.set_original_size()
+    view.rotate_right()
+    scale_source.reset_mock()
+
+    view.zoom_in()
+
+    scale_source.assert_not_called()
+    assert view.surface.source is view.pixmap
+    assert view.surface.display_size.width() == 250
+    assert view.surface.display_size.height() == 500
+
+
+def test_rotating_reuses_unrotated_scaled_pixmap(window, app, tmpdir, counted_view):
+    view, scale_source = counted_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path)
+    window.prepare_for_file(str(image_path))
+    view.set_original_size()
+    scale_source.reset_mock()
+
+    view.rotate_right()
+    view.rotate_right()
+
+    scale_source.assert_not_called()
+
+
+def test_rotated_view_turns_image_content(window, app):
+    view = window.image_view
+    view.pixmap = QPixmap(40, 20)
+    view.pixmap.fill(Qt.white)
+    painter = QPainter(view.pixmap)
+    painter.fillRect(0, 0, 10, 10, Qt.red)
+    painter.end()
+    view.progressive_rendering = False
+    view.set_original_size()
+
+    view.rotate_right()
+
+    image = view.surface.grab(view.surface.pixmap_rect()).toImage()
+    assert image.pixelColor(QPoint(image.width() - 1, 0)) == QColor(Qt.red)
+    assert image.pixelColor(QPoint(0, 0)) == QColor(Qt.white)
+
+
+def test_magnified_rotated_view_turns_image_content(window, app):
+    view = window.image_view
+    view.pixmap = QPixmap(40, 20)
+    view.pixmap.fill(Qt.white)
+    painter = QPainter(view.pixmap)
+    painter.fillRect(0, 0, 10, 10, Qt.red)
+    painter.end()
+    view.progressive_rendering = False
+    view.set_original_size()
+    view.rotate_right()
+
+    view.zoom_in()
+
+    image = view.surface.grab(view.surface.pixmap_rect()).toImage()
+    assert image.size() == QSize(25, 50)
+    assert image.pixelColor(QPoint(image.width() - 1, 0)) == QColor(Qt.red)
+    assert image.pixelColor(QPoint(0, image.height() - 1)) == QColor(Qt.white)
+
+
+def test_rotation_changes_transform_not_source(window, app, tmpdir):
+    view = window.image_view
+    image_path = tmpdir.join("image.png")
+    create_image(image_path, width=40, height=20)
+    window.prepare_for_file(str(image_path))
+    app.processEvents()
+    source = view.surface.source.cacheKey()
+
+    view.rotate_left()
+
+    assert view.surface.source.cacheKey() == source
+    assert view.surface.display_size.height() > view.surface.display_size.width()
+    view.rotate_left()
+    assert view.surface.source.cacheKey() == source
+    assert view.surface.display_transform.map(QPointF(0, 0)) == QPointF(
+        view.surface.display_size.width(), view.surface.display_size.height()
+    )
@@ -0,0 +1,173 @@
+import os
+
+import pytest
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage
+
+from image_view import ImageView
+from thumbnail_loader import ThumbnailLoader, read_thumbnail
+from thumbnail_strip import ThumbnailStrip
+
+
+def create_image(path, width=400, height=200, color=Qt.red):
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(color)
+    assert image.save(str(path))
+
+
+@pytest.fixture
+def images(tmpdir):
+    paths = [str(tmpdir.join(f"{index}.png")) for index in range(4)]
+    for path in paths:
+        create_image(path)
+    return paths
+
+
+@pytest.fixture
+def thumbnails(app):
+    loader = ThumbnailLoader(size=32)
+    yield loader
+    loader.shutdown()
+
+
+def finish_thumbnails(loader, app):
+    loader.wait_for_done()
+    app.processEvents()
+
+
+def test_thumbnail_fits_size_and_keeps_original_size(images):
+    decoded = read_thumbnail(images[0], 32)
+
+    assert (decoded.image.width(), decoded.image.height()) == (32, 16)
+    assert (decoded.original_size.width(), decoded.original_size.height()) == (
+        400,
+        200,
+    )
+
+
+def test_placeholder_ignores_thumbnail_of_changed_file(thumbnails, app, images):
+    thumbnails.request(images[:2])
+    finish_thumbnails(thumbnails, app)
+    create_image(images[1], 80, 40)
+    os.utime(images[1], ns=(0, 0))
+
+    assert thumbnails.placeholder(images[0]) is not None
+    assert thumbnails.placeholder(images[1]) is None
+    assert thumbnails.thumbnail(images[1]).width() == 32
+
+
+def test_undecodable_files_are_not_requested_again(thumbnails, app, tmpdir):
+    broken = tmpdir.join("broken.png")
+    broken.write("not an image")
+    thumbnails.request([str(broken)])
+    finish_thumbnails(thumbnails, app)
+
+    thumbnails.request([str(broken)])
+
+    assert thumbnails.pending == {}
+    assert thumbnails.thumbnail(str(broken)) is None
+
+
+def test_changed_file_gets_new_thumbnail(thumbnails, app, images):
+    thumbnails.request(images[:1])
+    finish_thumbnails(thumbnails, app)
+    create_image(images[0], 40, 80)
+    os.utime(images[0], ns=(0, 0))
+
+    thumbnails.request(images[:1])
+    finish_thumbnails(thumbnails, app)
+
+    assert thumbnails.thumbnail(images[0]).size() == QSize(16, 32)
+    assert thumbnails.placeholder(images[0]).original_size == QSize(40, 80)
+
+
+def test_undecodable_file_is_retried_once_changed(thumbnails, app, tmpdir):
+    broken = str(tmpdir.join("broken.png"))
+    with open(broken, "w") as partial:
+        partial.write("not an image yet")
+    thumbnails.request([broken])
+    finish_thumbnails(thumbnails, app)
+    create_image(broken)
+    os.utime(broken, ns=(0, 0))
+
+    thumbnails.request([broken])
+    finish_thumbnails(thumbnails, app)
+
+    assert thumbnails.thumbnail(broken) is not None
+    assert broken not in thumbnails.failed
+
+
+def test_strip_requests_current_and_visible_slots_of_large_folder(app, tmpdir):
+    strip = ThumbnailStrip(thumbnail_size=32)
+    strip.resize(400, strip.height())
+    strip.show()
+    names = [f"{index:05}.jpg" for index in range(20000)]
+    positions = {name: index for index, name in enumerate(names)}
+    requests = []
+    strip.loader.request = requests.append
+
+    strip.show_listing(str(tmpdir), names, 10000)
+    strip.request_thumbnails()
+
+    rows = strip.visible_rows()
+    assert 10000 in rows and len(rows) < 20
+    requested = [positions[os.path.basename(path)] for path in requests[-1]]
+    assert requested[0] == 10000
+    assert set(requested[: len(rows)]) == set(rows)
+    assert len(requested) <= 3 * len(rows)
+    strip.shutdown()
+
+
+def test_load_image_shows_thumbnail_until_decoded(thumbnails, app, images):
+    view = ImageView()
+    view.set_original_size()
+    view.thumbnail_source = thumbnails.placeholder
+    thumbnails.request([images[0]])
+    finish_thumbnails(thumbnails, app)
+
+    view.load_image(images[0])
+
+    assert view.pixmap.width() == 32
+    assert view.previewing
+    assert view.scale_factor == 1.0
+
+    view.loader.wait_for_done()
+    app.processEvents()
+
+    assert view.pixmap.width() == 400
+    assert not view.previewing
+    assert view.surface.pixmap_rect().width() == 400
+    view.shutdown()
+
+
+def test_load_image_without_thumbnail_decodes_at_once(thumbnails, app, images):
+    view = ImageView()
+    view.thumbnail_source = thumbnails.placeholder
+
+    view.load_image(images[0])
+
+    assert not view.previewing
+    assert view.loader.stats() == {"hits": 0, "misses": 1}
+    view.shutdown()
+
+
+def test_clicking_thumbnail_selects_image(window, app, images):
+    window.prepare_for_file(images[0])
+
+    window.thumbnail_strip.file_selected_signal.emit(2)
+
+    assert window.mgr.current_file() == images[2]
+    assert window.thumbnail_strip.currentIndex().row() == 2
+
+
+def test_full_screen_hides_thumbnail_strip(window, app, images):
+    window.prepare_for_file(images[0])
+    assert window.thumbnail_dock.isVisible()
+
+    window.toggle_full_screen()
+
+    assert not window.thumbnail_dock.isVisible()
+
+    window.toggle_full_screen()
+
+    assert window.thumbnail_dock.isVisible()
@@ -0,0 +1,78 @@
+import pytest
+from PyQt5.QtCore import QPoint, QSize, Qt
+from PyQt5.QtGui import QColor, QPainter, QPixmap
+
+
+@pytest.fixture
+def deep_zoom_view(window, app):
+    view = window.image_view
+    pixmap = QPixmap(1600, 1200)
+    pixmap.fill(Qt.white)
+    painter = QPainter(pixmap)
+    painter.fillRect(800, 0, 800, 1200, Qt.red)
+    painter.end()
+    view.pixmap = pixmap
+    view.set_original_size()
+    view.zoom_changed = True
+    view.scale_factor = 10.0
+    view.resize_image()
+    app.processEvents()
+    return view
+
+
+def test_deep_zoom_does_not_allocate_full_scaled_pixmap(deep_zoom_view):
+    surface = deep_zoom_view.surface
+
+    assert surface.is_tiled()
+    assert surface.source.size() == QSize(1600, 1200)
+    assert surface.sizeHint() == QSize(16000, 12000)
+    assert surface.pixmap_rect().size() == QSize(16000, 12000)
+
+
+def test_painting_viewport_renders_only_visible_tiles(deep_zoom_view, app):
+    surface = deep_zoom_view.surface
+    viewport_size = deep_zoom_view.viewport().size()
+
+    deep_zoom_view.viewport().grab()
+
+    tile_size = surface.TILE_SIZE
+    max_visible_tiles = (viewport_size.width() // tile_size + 2) * (
+        viewport_size.height() // tile_size + 2
+    )
+    assert 0 < len(surface.tile_cache) <= max_visible_tiles
+    assert surface.tile_cache.bytes_used <= surface.tile_cache.limit_bytes
+
+
+def test_tiles_show_the_scrolled_part_of_the_image(deep_zoom_view, app):
+    horizontal_scroll_bar = deep_zoom_view.horizontalScrollBar()
+    horizontal_scroll_bar.setValue(horizontal_scroll_bar.maximum())
+    app.processEvents()
+
+    image = deep_zoom_view.viewport().grab().toImage()
+
+    assert image.pixelColor(QPoint(10, 10)) == QColor(Qt.red)
+
+
+def test_repainting_reuses_cached_tiles(deep_zoom_view, app, monkeypatch):
+    surface = deep_zoom_view.surface
+    deep_zoom_view.viewport().grab()
+    cached_tiles = len(surface.tile_cache)
+    monkeypatch.setattr(QPixmap, "fill", lambda *args: pytest.fail("tile rendered"))
+
+    deep_zoom_view.viewport().grab()
+
+    assert len(surface.tile_cache) == cached_tiles
+
+
+def test_zooming_back_out_leaves_tiled_mode(deep_zoom_view, app):
+    deep_zoom_view.set_fit_to_window()
+
+    assert not deep_zoom_view.surface.is_tiled()
+    assert deep_zoom_view.surface.display_size.height() <= deep_zoom_view.viewport().height()
+
+
+def test_rotated_deep_zoom_uses_rotated_display_size(deep_zoom_view, app):
+    deep_zoom_view.rotate_right()
+
+    assert deep_zoom_view.surface.is_tiled()
+    assert deep_zoom_view.surface.sizeHint() == QSize(12000, 16000)
@@ -111,7 +111,7 @@ def test_fitted_image_uses_full_viewport_height(window, app):
     view.set_fit_to_window()
     app.processEvents()
 
-    assert view.surface.pixmap().height() == view.viewport().height()
+    assert view.surface.display_size.height() == view.viewport().height()
 
 
 def test_lasso_zoom_fills_full_screen_viewport(window, app):
@@ -193,14 +193,14 @@ def test_mouse_wheel_zoom_keeps_image_position_under_cursor(
     initial_image_position = image_position_at_cursor(view, cursor_position)
 
     send_wheel_event(view, cursor_position, angle_delta)
-    app.processEvents()
+    QTest.qWait(view.FRAME_INTERVAL_MS * 3)
 
     zoomed_image_position = image_position_at_cursor(view, cursor_position)
     assert zoomed_image_position.x() == pytest.approx(
-        initial_image_position.x(), abs=2.0 / view.surface.pixmap().width()
+        initial_image_position.x(), abs=2.0 / view.surface.display_size.width()
     )
     assert zoomed_image_position.y() == pytest.approx(
-        initial_image_position.y(), abs=2.0 / view.surface.pixmap().height()
+        initial_image_position.y(), abs=2.0 / view.surface.display_size.height()
     )
 
 